@@ -0,0 +1,116 @@
+# backend/benchmarks/bench_memory.py
+"""Benchmark de memoria de la representación interna de las noticias.
+
+Compara los modelos Pydantic NewsResult validados (como se creaban antes de NewsRecord,
+uno por noticia) con los registros compactos NewsRecord: bytes retenidos por ítem (tracemalloc, sin
+contar título/snippet/enlace, que ambas formas comparten) e ítems/seg al crearlos,
+al analizarlos y, para los registros, al convertirlos a NewsResult en la respuesta.
+
+Uso (desde backend/):
+    python benchmarks/bench_memory.py --sizes 1000 10000 50000 --output memory.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fixtures import make_items  # noqa: E402
+from run_benchmarks import best_of  # noqa: E402
+
+
+def legacy_rows_to_results(main, rows):
+    """Creación de modelos previa a NewsRecord (referencia): NewsResult(...) valida cada campo"""
+    return [
+        main.NewsResult(
+            title=title, link=link, snippet=snippet, source=source, date=date,
+            year=published.year, sentiment=sentiment, country=country, keywords=keywords,
+            published_date=published.isoformat()
+        )
+        for title, link, snippet, source, date, published, sentiment, country, keywords in rows
+    ]
+
+
+def retained_bytes(build) -> int:
+    """Bytes que siguen asignados mientras se conserva el resultado de build()"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(main, sizes, repeat: int):
+    analyzer = main.get_news_analyzer()
+    terms = [main.SearchTerm(value='solar energy')]
+
+    report = {}
+    for size in sizes:
+        rows = analyzer._analyze_rows(make_items(size), terms)
+        models = legacy_rows_to_results(main, rows)
+        records = analyzer._rows_to_records(rows)
+        count = len(rows)
+
+        variants = {
+            'news_result': (lambda: legacy_rows_to_results(main, rows), models),
+            'news_record': (lambda: analyzer._rows_to_records(rows), records),
+        }
+        report[str(size)] = {}
+        for name, (build, built) in variants.items():
+            build_seconds = best_of(build, repeat)
+            analyze_seconds = best_of(lambda: analyzer.analyze_hype_cycle(built), repeat)
+            report[str(size)][name] = {
+                'items': count,
+                'bytes_per_item': retained_bytes(build) / count,
+                'build_items_per_sec': count / build_seconds,
+                'analyze_items_per_sec': count / analyze_seconds,
+            }
+        # Conversión en el límite de la API (solo la paga la respuesta)
+        to_api_seconds = best_of(lambda: main.to_news_results(records), repeat)
+        report[str(size)]['news_record']['to_api_items_per_sec'] = count / to_api_seconds
+    return report
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args()
+
+    os.environ.setdefault("SERP_CACHE_PATH", "")
+    os.environ.setdefault("HYPECYCLE_TOPICS_DB", ":memory:")
+    os.environ.setdefault("HYPECYCLE_EXECUTOR", "inline")
+    os.environ.setdefault("HYPECYCLE_LOG_LEVEL", "WARNING")
+    with contextlib.redirect_stdout(sys.stderr):
+        import main
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'sizes': run(main, args.sizes, args.repeat),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main_cli()
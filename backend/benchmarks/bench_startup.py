@@ -0,0 +1,111 @@
+# backend/benchmarks/bench_startup.py
+"""Benchmark de arranque en frío del backend.
+
+Mide, en procesos nuevos, el tiempo de `import main` y el tiempo desde lanzar uvicorn
+hasta la primera respuesta 200 de /api/health. --app-dir permite medir otra copia del
+backend (p. ej. un checkout anterior) para comparar.
+
+Uso (desde backend/):
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+
+def isolated_env() -> dict:
+    """Sin caché en disco ni bases persistentes, para no medir el estado de ejecuciones previas"""
+    env = dict(os.environ)
+    env.update({
+        "SERP_CACHE_PATH": "",
+        "HYPECYCLE_TOPICS_DB": ":memory:",
+    })
+    return env
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(app_dir: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=app_dir, env=isolated_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_response(app_dir: str, timeout: float = 60.0) -> float:
+    """Segundos desde lanzar uvicorn hasta el primer 200 de /api/health"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir, env=isolated_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError(f"/api/health no respondió en {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(values) -> dict:
+    return {
+        'runs': len(values),
+        'min': min(values),
+        'median': statistics.median(values),
+        'max': max(values)
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--app-dir', default=BACKEND_DIR, help='directorio que contiene main.py')
+    parser.add_argument('--output', help='archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args()
+
+    # Una ejecución previa deja los .pyc compilados y la caché del sistema de archivos caliente
+    measure_import(args.app_dir)
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'app_dir': os.path.abspath(args.app_dir),
+        'import_seconds': summarize([measure_import(args.app_dir) for _ in range(args.runs)]),
+        'first_health_200_seconds': summarize([measure_first_response(args.app_dir) for _ in range(args.runs)]),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,142 @@
+# backend/benchmarks/fake_serpapi.py
+"""Sustituto local de SERPAPI para pruebas de carga y benchmarks.
+
+Sin --volume cada página vuelve llena (universo ilimitado). Con --volume cada tema
+tiene ese total de resultados repartidos por año según --distribution, y los rangos
+y páginas vuelven cortos al agotarse, como en SERPAPI. --error-rate y --throttle-rate
+responden una fracción de las llamadas con 500 y con 429 (+ Retry-After).
+
+Uso (desde backend/):
+    python benchmarks/fake_serpapi.py --port 8765 --latency 0.3
+    python benchmarks/fake_serpapi.py --volume 1500 --distribution hype --error-rate 0.05
+    SERP_API_BASE_URL=http://127.0.0.1:8765/search SERP_API_KEY=fake uvicorn main:app
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from fixtures import DISTRIBUTIONS, load_recorded_pages, ranged_page, synthetic_page, year_counts  # noqa: E402
+
+
+def create_app(
+    latency: float = 0.0,
+    latency_jitter: float = 0.0,
+    page_size: int = 100,
+    fixtures_path: Optional[str] = None,
+    seed: int = 0,
+    volume: Optional[int] = None,
+    distribution: str = 'hype',
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    retry_after: float = 1.0,
+) -> FastAPI:
+    """App que responde /search con páginas grabadas o sintéticas tras una latencia configurable"""
+    app = FastAPI()
+    recorded = load_recorded_pages(fixtures_path) if fixtures_path else {}
+    counts = year_counts(volume, distribution) if volume is not None else None
+    rng = random.Random(seed)
+    app.state.calls = 0
+    app.state.errors = 0
+    app.state.throttled = 0
+
+    @app.get("/search")
+    async def search(request: Request):
+        app.state.calls += 1
+        params = request.query_params
+        query = params.get("q", "")
+        start = int(params.get("start", 0))
+        num = min(int(params.get("num", page_size)), page_size)
+
+        delay = latency + (rng.uniform(-latency_jitter, latency_jitter) if latency_jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        failure = rng.random()
+        if failure < throttle_rate:
+            app.state.throttled += 1
+            return JSONResponse({"error": "Rate limit exceeded"}, status_code=429, headers={"Retry-After": str(retry_after)})
+        if failure < throttle_rate + error_rate:
+            app.state.errors += 1
+            return JSONResponse({"error": "Internal server error"}, status_code=500)
+
+        if query in recorded:
+            news_results = recorded[query][start:start + num]
+        elif counts is not None:
+            news_results = ranged_page(query, counts, start=start, num=num, seed=seed)
+        else:
+            news_results = synthetic_page(query, start=start, num=num, seed=seed)
+        return {"search_parameters": dict(params), "news_results": news_results}
+
+    @app.get("/stats")
+    async def stats():
+        return {"calls": app.state.calls, "errors": app.state.errors, "throttled": app.state.throttled}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BackgroundServer:
+    """Ejecuta el sustituto en un hilo con su propio event loop"""
+
+    def __init__(self, app: FastAPI, port: Optional[int] = None):
+        self.port = port or _free_port()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/search"
+
+    def __enter__(self) -> "BackgroundServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3, help="segundos por llamada")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--fixtures", help="JSON {query: news_results} con respuestas grabadas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--volume", type=int, help="resultados por tema (por defecto páginas siempre llenas)")
+    parser.add_argument("--distribution", default="hype",
+                        help=f"reparto por año: {', '.join(DISTRIBUTIONS)} o pesos \"2016:1,2017:5\"")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fracción de llamadas que responden 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fracción de llamadas que responden 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After de los 429 (s)")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(
+            args.latency, args.jitter, args.page_size, args.fixtures, args.seed,
+            volume=args.volume, distribution=args.distribution,
+            error_rate=args.error_rate, throttle_rate=args.throttle_rate, retry_after=args.retry_after
+        ),
+        host="127.0.0.1",
+        port=args.port
+    )
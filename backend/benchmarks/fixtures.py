@@ -0,0 +1,142 @@
+# backend/benchmarks/fixtures.py
+"""Datos sintéticos con la forma de las respuestas de SERPAPI para benchmarks."""
+import json
+import math
+import random
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+SNIPPET_WORDS = [
+    'innovative', 'growth', 'decline', 'risk', 'solar', 'energy', 'market', 'executive',
+    'germany', 'united states', 'china', 'indian', 'battery', 'storage', 'adoption',
+    'investors', 'breakthrough', 'challenge', 'companies', 'startup', 'regulation',
+    'reported', 'analysts', 'production', 'capacity', 'duke', 'wind', 'grid'
+]
+SOURCES = ['Reuters', 'AP', 'Bloomberg', 'TechCrunch', 'The Verge', 'Financial Times']
+RELATIVE_DATES = ['2 days ago', '3 weeks ago', '5 hours ago', '1 month ago']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def make_item(rng: random.Random, index: int, year: int, topic: str = 'solar energy') -> Dict[str, Any]:
+    """Un resultado de news_results con título, enlace, snippet, fuente y fecha"""
+    words = [rng.choice(SNIPPET_WORDS) for _ in range(rng.randint(14, 30))]
+    if year >= datetime.now().year and rng.random() < 0.5:
+        date = rng.choice(RELATIVE_DATES)
+    elif rng.random() < 0.3:
+        date = f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{year}, {rng.randint(1, 12):02d}:00 AM, +0000 UTC"
+    elif rng.random() < 0.5:
+        date = f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {year}"
+    else:
+        date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    return {
+        'position': index + 1,
+        'title': f"{topic.title()}: {' '.join(words[:6])} {index}",
+        'link': f"https://news.example.com/{topic.replace(' ', '-')}/{year}/{index}",
+        'snippet': f"{topic} " + ' '.join(words),
+        'source': rng.choice(SOURCES),
+        'date': date
+    }
+
+
+def make_items(count: int, seed: int = 7, duplicate_ratio: float = 0.1,
+               start_year: int = 2014, end_year: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Genera count resultados; una fracción repite título o enlace de otro resultado"""
+    rng = random.Random(seed)
+    end_year = end_year or datetime.now().year
+    items = []
+    for i in range(count):
+        if items and rng.random() < duplicate_ratio:
+            duplicate = dict(rng.choice(items))
+            duplicate['link'] = f"{duplicate['link']}?syndicated={i}"
+            items.append(duplicate)
+        else:
+            items.append(make_item(rng, i, rng.randint(start_year, end_year)))
+    return items
+
+
+def query_years(query: str) -> tuple:
+    """Rango de años de una consulta con filtros after:/before:"""
+    current_year = datetime.now().year
+    after = re.search(r'after:(\d{4})', query)
+    before = re.search(r'before:(\d{4})', query)
+    start = int(after.group(1)) if after else current_year - 12
+    end = int(before.group(1)) if before else current_year
+    return start, max(start, end)
+
+
+def query_topic(query: str) -> str:
+    """Consulta sin los filtros de fecha"""
+    return re.sub(r'\s*(?:after|before):\S+', '', query).strip() or 'technology'
+
+
+def synthetic_page(query: str, start: int = 0, num: int = 100, seed: int = 0) -> List[Dict[str, Any]]:
+    """Página determinista de resultados para una consulta, repartidos en su rango de años"""
+    rng = random.Random(f"{seed}:{query}:{start}")
+    start_year, end_year = query_years(query)
+    topic = query_topic(query)
+    return [
+        make_item(rng, start + i, rng.randint(start_year, end_year), topic)
+        for i in range(num)
+    ]
+
+
+DISTRIBUTIONS = ('uniform', 'hype', 'growth', 'decline')
+
+
+def _distribution_weight(distribution: str, t: float) -> float:
+    """Peso relativo de un año en la posición t (0 = primer año, 1 = último)"""
+    if distribution == 'uniform':
+        return 1.0
+    if distribution == 'growth':
+        return math.exp(3 * t)
+    if distribution == 'decline':
+        return math.exp(-3 * t)
+    if distribution == 'hype':
+        # Pico de expectativas, valle de desilusión y meseta de productividad
+        return 0.05 + math.exp(-((t - 0.3) / 0.12) ** 2) + 0.35 / (1 + math.exp(-15 * (t - 0.75)))
+    raise ValueError(f"Distribución desconocida: {distribution} (opciones: {', '.join(DISTRIBUTIONS)})")
+
+
+def year_counts(volume: int, distribution: str = 'hype', start_year: Optional[int] = None,
+                end_year: Optional[int] = None) -> Dict[int, int]:
+    """Reparte volume resultados entre los años según la distribución.
+
+    distribution es uno de DISTRIBUTIONS (sobre start_year..end_year, por defecto los
+    últimos 13 años) o pesos explícitos por año "2016:1,2017:5,2018:2".
+    """
+    if ':' in distribution:
+        weights = {int(year): float(weight) for year, weight in (part.split(':') for part in distribution.split(','))}
+    else:
+        end_year = end_year or datetime.now().year
+        start_year = start_year or end_year - 12
+        span = max(1, end_year - start_year)
+        weights = {
+            year: _distribution_weight(distribution, (year - start_year) / span)
+            for year in range(start_year, end_year + 1)
+        }
+    total = sum(weights.values()) or 1.0
+    return {year: round(volume * weight / total) for year, weight in weights.items()}
+
+
+def ranged_page(query: str, counts: Dict[int, int], start: int = 0, num: int = 100, seed: int = 0) -> List[Dict[str, Any]]:
+    """Página de una consulta sobre un universo finito de counts[año] resultados por año.
+
+    Un mismo resultado (tema, año, índice) aparece igual en todos los rangos que lo
+    cubren, y la última página de un rango vuelve corta como en SERPAPI.
+    """
+    start_year, end_year = query_years(query)
+    topic = query_topic(query)
+    entries = [(year, i) for year in range(start_year, end_year + 1) for i in range(counts.get(year, 0))]
+    # Orden de "relevancia" estable por consulta
+    random.Random(f"{seed}:{query}").shuffle(entries)
+    return [
+        make_item(random.Random(f"{seed}:{topic}:{year}:{i}"), i, year, topic)
+        for year, i in entries[start:start + num]
+    ]
+
+
+def load_recorded_pages(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Carga páginas grabadas: {query: news_results}"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
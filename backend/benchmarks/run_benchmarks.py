@@ -0,0 +1,312 @@
+# backend/benchmarks/run_benchmarks.py
+"""Benchmarks de las rutas críticas del backend con un SERPAPI local.
+
+Micro-benchmarks de procesamiento, deduplicación y análisis a varios tamaños,
+y latencia/throughput de /api/hypecycle/analyze a varios niveles de concurrencia.
+El resultado se emite en JSON para comparar ejecuciones.
+
+Uso (desde backend/):
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 --concurrency 1 4 16 --output bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fake_serpapi import BackgroundServer, create_app  # noqa: E402
+from fixtures import make_items  # noqa: E402
+from sentiment import SENTIMENT_ENGINES, create_sentiment_engine  # noqa: E402
+
+
+def configure_environment(serp_url: str, max_concurrency: int) -> None:
+    """Aísla el backend: sin caché, sin límite de tasa y con bases de datos en memoria"""
+    os.environ.update({
+        "SERP_API_KEY": "benchmark",
+        "SERP_API_BASE_URL": serp_url,
+        "SERP_CACHE_PATH": "",
+        "SERP_CACHE_SIZE": "0",
+        "SERP_RATE_LIMIT_PER_SEC": "0",
+        "SERP_MAX_CONCURRENCY": str(max_concurrency),
+        "SERP_POOL_SIZE": str(max_concurrency),
+        "HYPECYCLE_TOPICS_DB": ":memory:",
+    })
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def legacy_extract_year(date_str: str) -> int:
+    """Conversión de fechas previa a DateNormalizer, como referencia de comparación"""
+    try:
+        if not date_str:
+            return datetime.now().year
+        for fmt in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%b %d, %Y', '%Y']:
+            try:
+                return datetime.strptime(date_str.split('T')[0], fmt).year
+            except ValueError:
+                continue
+        match = re.search(r'20\d{2}|19\d{2}', date_str)
+        if match:
+            year = int(match.group())
+            if 1970 <= year <= datetime.now().year:
+                return year
+        return datetime.now().year
+    except Exception:
+        return datetime.now().year
+
+
+# Referencia previa al pipeline por lotes (user-004): país, sentimiento y keywords por ítem
+LEGACY_COUNTRIES = {
+    'USA': ['united states', 'usa', 'u.s.', 'america'],
+    'UK': ['united kingdom', 'uk', 'britain', 'england'],
+    'China': ['china', 'chinese'], 'Japan': ['japan', 'japanese'],
+    'Germany': ['germany', 'german'], 'France': ['france', 'french'],
+    'Spain': ['spain', 'spanish'], 'Italy': ['italy', 'italian'],
+    'India': ['india', 'indian'], 'Brazil': ['brazil', 'brazilian'],
+    'Canada': ['canada', 'canadian'], 'Australia': ['australia', 'australian'],
+    'South Korea': ['south korea', 'korea'], 'Russia': ['russia', 'russian'],
+    'Netherlands': ['netherlands', 'dutch'], 'Sweden': ['sweden', 'swedish'],
+    'Switzerland': ['switzerland', 'swiss'], 'Singapore': ['singapore'],
+    'Israel': ['israel', 'israeli'], 'Norway': ['norway', 'norwegian'],
+    'Denmark': ['denmark', 'danish'], 'Finland': ['finland', 'finnish'],
+    'Belgium': ['belgium', 'belgian'], 'Austria': ['austria', 'austrian'],
+    'Ireland': ['ireland', 'irish'], 'Portugal': ['portugal', 'portuguese'],
+    'Greece': ['greece', 'greek'], 'Poland': ['poland', 'polish'],
+    'Turkey': ['turkey', 'turkish'], 'Mexico': ['mexico', 'mexican'],
+    'Argentina': ['argentina'], 'Chile': ['chile'], 'Colombia': ['colombia'],
+    'Egypt': ['egypt'], 'Nigeria': ['nigeria'], 'South Africa': ['south africa']
+}
+LEGACY_POSITIVE_WORDS = [
+    'breakthrough', 'innovative', 'revolutionary', 'success', 'leading',
+    'advanced', 'improved', 'better', 'growth', 'increase', 'promising',
+    'potential', 'opportunity', 'advantage', 'benefit', 'progress',
+    'development', 'achievement', 'excellent', 'outstanding', 'superior'
+]
+LEGACY_NEGATIVE_WORDS = [
+    'decline', 'failure', 'problem', 'issue', 'challenge', 'difficult',
+    'decrease', 'drop', 'fall', 'crisis', 'concern', 'risk', 'threat',
+    'limitation', 'obstacle', 'setback', 'disappointment', 'weak',
+    'poor', 'negative', 'loss', 'reduce', 'cut', 'eliminate'
+]
+
+
+def legacy_process_news_item(main, item, search_terms, common_words):
+    """_process_news_item previo al pipeline por lotes, como referencia de comparación"""
+    text = f"{item.get('title', '')} {item.get('snippet', '')}"
+    text_lower = text.lower()
+
+    country = None
+    for name, patterns in LEGACY_COUNTRIES.items():
+        if any(pattern in text_lower for pattern in patterns):
+            country = name
+            break
+
+    positive_count = sum(1 for word in LEGACY_POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in LEGACY_NEGATIVE_WORDS if word in text_lower)
+    total_words = len(text.split())
+    sentiment = 0.0
+    if total_words:
+        sentiment = max(-1.0, min(1.0, (positive_count - negative_count) / max(total_words / 10, 1)))
+
+    search_words = set()
+    for term in search_terms:
+        search_words.update(re.sub(r'[^\w\s]', ' ', term.value.lower()).split())
+    words = re.sub(r'[^\w\s]', ' ', text_lower).split()
+    keywords = [
+        word for word in words
+        if (
+            word not in common_words
+            and word not in search_words
+            and len(word) > 3
+            and word.isalpha()
+            and not word.isdigit()
+            and not re.match(r'.*\d+.*', word)
+            and not re.match(r'20\d{2}', word)
+        )
+    ]
+
+    return main.NewsResult(
+        title=str(item.get('title', '')),
+        link=str(item.get('link', '')),
+        snippet=str(item.get('snippet', '')),
+        source=str(item.get('source', '')),
+        date=str(item.get('date', '')),
+        year=legacy_extract_year(item.get('date', '')),
+        sentiment=sentiment,
+        country=country,
+        keywords=keywords[:5]
+    )
+
+
+def run_micro(main, sizes, repeat: int):
+    analyzer = main.get_news_analyzer()
+    result_analyzer = analyzer.result_analyzer
+    terms = [main.SearchTerm(value='solar energy')]
+    question_ids = [
+        question['id']
+        for module in main.INNOVATION_TEST_MODULES.values()
+        for question in module['questions']
+    ]
+
+    report = {}
+    for size in sizes:
+        items = make_items(size)
+        valid_items = [item for item in items if analyzer._is_valid_result(item)]
+        processed = analyzer._process_news_batch(items, terms)
+        texts = [f"{item['title']} {item['snippet']}" for item in items]
+        dates = [item['date'] for item in items]
+        rng = random.Random(size)
+        answers = [
+            main.InnovationAnswer(question_id=question_ids[i % len(question_ids)], score=rng.randint(1, 4))
+            for i in range(size)
+        ]
+
+        cases = {
+            'process_legacy_per_item': lambda: [
+                legacy_process_news_item(main, item, terms, result_analyzer.common_words) for item in valid_items
+            ],
+            '_process_news_item': lambda: [analyzer._process_news_item(item, terms) for item in valid_items],
+            '_process_news_batch': lambda: analyzer._process_news_batch(items, terms),
+            '_remove_duplicates': lambda: analyzer._remove_duplicates(processed),
+            'analyze_hype_cycle': lambda: analyzer.analyze_hype_cycle(processed),
+            'extract_keywords': lambda: [result_analyzer.extract_keywords(text, terms) for text in texts],
+            'dates_legacy': lambda: [legacy_extract_year(date) for date in dates],
+            # En frío: normalizador nuevo, sin fechas memorizadas
+            'dates_normalizer_cold': lambda: [
+                clock.parse(date) for clock in [main.DateNormalizer().clock()] for date in dates
+            ],
+            'dates_normalizer': lambda: [clock.parse(date) for clock in [analyzer.date_normalizer.clock()] for date in dates],
+            'analyze_innovation_test': lambda: main.analyze_innovation_test(answers, 'Benchmark'),
+        }
+        # Motores de sentimiento en frío (sin memo) y con el memo ya poblado
+        for engine_name in SENTIMENT_ENGINES:
+            warm_engine = create_sentiment_engine(engine_name)
+            warm_engine.score_batch(texts)
+            cases[f'sentiment_{engine_name}'] = lambda name=engine_name: create_sentiment_engine(name).score_batch(texts)
+            cases[f'sentiment_{engine_name}_memo'] = lambda engine=warm_engine: engine.score_batch(texts)
+
+        report[str(size)] = {}
+        for name, fn in cases.items():
+            seconds = best_of(fn, repeat)
+            report[str(size)][name] = {
+                'seconds': seconds,
+                'items_per_sec': size / seconds if seconds else None
+            }
+        # Mejora del pipeline por lotes frente al procesamiento por ítem previo
+        batch_seconds = report[str(size)]['_process_news_batch']['seconds']
+        legacy_seconds = report[str(size)]['process_legacy_per_item']['seconds']
+        report[str(size)]['batch_speedup_vs_legacy'] = legacy_seconds / batch_seconds if batch_seconds else None
+    return report
+
+
+async def run_end_to_end(main, concurrency_levels, requests_per_level: int):
+    import httpx
+
+    report = {}
+    async with httpx.AsyncClient(app=main.app, base_url="http://benchmark", timeout=120) as client:
+        for concurrency in concurrency_levels:
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies = []
+            statuses = {}
+
+            async def one(index: int):
+                # Consultas distintas para no medir la caché ni el single-flight
+                payload = {"search_terms": [{"value": f"technology {concurrency}-{index}"}]}
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post("/api/hypecycle/analyze", json=payload)
+                    latencies.append(time.perf_counter() - started)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            total = max(requests_per_level, concurrency)
+            started = time.perf_counter()
+            await asyncio.gather(*[one(i) for i in range(total)])
+            elapsed = time.perf_counter() - started
+
+            report[str(concurrency)] = {
+                'requests': total,
+                'statuses': {str(code): count for code, count in statuses.items()},
+                'throughput_rps': total / elapsed,
+                'latency_p50': percentile(latencies, 0.50),
+                'latency_p95': percentile(latencies, 0.95),
+                'latency_p99': percentile(latencies, 0.99),
+                'latency_max': max(latencies)
+            }
+    return report
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=16, help='solicitudes por nivel de concurrencia')
+    parser.add_argument('--latency', type=float, default=0.3, help='latencia simulada de SERPAPI (s)')
+    parser.add_argument('--jitter', type=float, default=0.05)
+    parser.add_argument('--fixtures', help='JSON {query: news_results} con respuestas grabadas')
+    parser.add_argument('--volume', type=int, help='resultados por tema en SERPAPI simulado (por defecto ilimitados)')
+    parser.add_argument('--distribution', default='hype', help='reparto por año de --volume')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fracción de llamadas que responden 500')
+    parser.add_argument('--serp-max-concurrency', type=int, default=32)
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--skip-e2e', action='store_true')
+    parser.add_argument('--output', help='archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args()
+
+    fake_app = create_app(
+        latency=args.latency, latency_jitter=args.jitter, fixtures_path=args.fixtures,
+        volume=args.volume, distribution=args.distribution, error_rate=args.error_rate
+    )
+    with BackgroundServer(fake_app) as server:
+        configure_environment(server.url, args.serp_max_concurrency)
+        report = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'config': vars(args),
+        }
+
+        # La salida de diagnóstico del backend va a stderr para que stdout sea JSON válido
+        with contextlib.redirect_stdout(sys.stderr):
+            import main
+
+            if not args.skip_micro:
+                report['micro'] = run_micro(main, args.sizes, args.repeat)
+            if not args.skip_e2e:
+                report['end_to_end'] = asyncio.run(run_end_to_end(main, args.concurrency, args.requests))
+                report['end_to_end']['upstream_calls'] = fake_app.state.calls
+                report['end_to_end']['upstream_errors'] = fake_app.state.errors
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,19 @@
+# backend/conftest.py
+import pytest
+
+# test_main.py es una app mínima para probar el frontend, no un módulo de pruebas
+collect_ignore = ["test_main.py"]
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """NewsAnalyzer aislado: sin caché en disco, análisis en línea y sin esperas entre consultas"""
+    monkeypatch.setenv("SERP_CACHE_PATH", "")
+    monkeypatch.setenv("SERP_CACHE_SIZE", "0")
+    monkeypatch.setenv("SERP_RATE_LIMIT_PER_SEC", "0")
+    monkeypatch.setenv("HYPECYCLE_EXECUTOR", "inline")
+    import main
+    news_analyzer = main.NewsAnalyzer()
+    news_analyzer.serp_client.backoff_base = 0.001
+    monkeypatch.setattr(main, "_news_analyzer", news_analyzer)
+    return news_analyzer
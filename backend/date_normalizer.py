@@ -0,0 +1,142 @@
+# backend/date_normalizer.py
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Formatos que devuelve SERPAPI, del más frecuente al menos frecuente
+_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:T|\s|$)')
+_US_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})\b')
+_MONTH_DAY_YEAR = re.compile(r'([a-z]{3})[a-z]*\.?\s+(\d{1,2}),\s*(\d{4})$', re.IGNORECASE)
+_YEAR_ONLY = re.compile(r'(\d{4})$')
+_RELATIVE = re.compile(r'(\d+|an?|one)\s+(second|minute|min|hour|day|week|month|year)s?\s+ago$', re.IGNORECASE)
+_ANY_YEAR = re.compile(r'20\d{2}|19\d{2}')
+
+MIN_VALID_YEAR = 1970
+
+# Centinela del memo: None es un valor memorizado válido (texto sin fecha absoluta)
+_MISSING = object()
+
+# Unidades relativas con duración fija; meses y años se restan en el calendario
+_RELATIVE_UNITS = {
+    'second': 'seconds', 'minute': 'minutes', 'min': 'minutes',
+    'hour': 'hours', 'day': 'days', 'week': 'weeks'
+}
+
+
+def _shift_months(day: date, months: int) -> date:
+    """Resta meses a una fecha acotando el día al mes destino (31 de marzo - 1 mes = 28/29 de febrero)"""
+    year, month_index = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month = month_index + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class DateClock:
+    """Reloj fijo de una solicitud: las fechas relativas se resuelven todas contra el mismo instante"""
+
+    def __init__(self, normalizer: "DateNormalizer", now: datetime):
+        self.normalizer = normalizer
+        self.now = now
+        self.today = now.date()
+        self._memo: Dict[str, date] = {}
+
+    def parse(self, date_str: str) -> date:
+        """Fecha completa de una fecha de SERPAPI; la fecha del reloj si no se reconoce"""
+        parsed = self._memo.get(date_str)
+        if parsed is None:
+            parsed = self.normalizer.parse(date_str, self)
+            self._memo[date_str] = parsed
+        return parsed
+
+    def year(self, date_str: str) -> int:
+        return self.parse(date_str).year
+
+
+class DateNormalizer:
+    """Convierte las fechas de SERPAPI (absolutas y relativas) en fechas completas.
+
+    Las fechas absolutas no dependen del reloj y se memorizan por texto; las relativas
+    ("3 days ago") se memorizan solo dentro de un DateClock.
+    """
+
+    def __init__(self, max_entries: int = 8192):
+        self.max_entries = max_entries
+        self._absolute: Dict[str, Optional[date]] = {}
+
+    def clock(self, now: Optional[datetime] = None) -> DateClock:
+        return DateClock(self, now or datetime.now())
+
+    def parse(self, date_str: str, clock: DateClock) -> date:
+        if not date_str or not isinstance(date_str, str):
+            return clock.today
+
+        # Una sola consulta: entre un "in" y la lectura otro hilo del executor puede vaciar el memo
+        absolute = self._absolute.get(date_str, _MISSING)
+        if absolute is _MISSING:
+            absolute = self._parse_absolute(date_str)
+            if len(self._absolute) >= self.max_entries:
+                self._absolute.clear()
+            self._absolute[date_str] = absolute
+
+        if absolute is not None:
+            return absolute
+        return self._parse_relative(date_str, clock) or self._parse_embedded_year(date_str, clock) or clock.today
+
+    @staticmethod
+    def _parse_absolute(date_str: str) -> Optional[date]:
+        text = date_str.strip()
+        try:
+            match = _ISO_DATE.match(text)
+            if match:
+                return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+            match = _US_DATE.match(text)
+            if match:
+                return date(int(match.group(3)), int(match.group(1)), int(match.group(2)))
+
+            match = _MONTH_DAY_YEAR.match(text)
+            if match and match.group(1).lower() in MONTHS:
+                return date(int(match.group(3)), MONTHS[match.group(1).lower()], int(match.group(2)))
+
+            match = _YEAR_ONLY.match(text)
+            if match:
+                return date(int(match.group(1)), 1, 1)
+        except ValueError:
+            pass
+        return None
+
+    @staticmethod
+    def _parse_relative(date_str: str, clock: DateClock) -> Optional[date]:
+        text = date_str.strip().lower()
+        if text in ('today', 'just now'):
+            return clock.today
+        if text == 'yesterday':
+            return clock.today - timedelta(days=1)
+
+        match = _RELATIVE.match(text)
+        if not match:
+            return None
+
+        amount = 1 if match.group(1) in ('a', 'an', 'one') else int(match.group(1))
+        unit = match.group(2)
+        if unit in _RELATIVE_UNITS:
+            return (clock.now - timedelta(**{_RELATIVE_UNITS[unit]: amount})).date()
+        return _shift_months(clock.today, amount if unit == 'month' else amount * 12)
+
+    @staticmethod
+    def _parse_embedded_year(date_str: str, clock: DateClock) -> Optional[date]:
+        """Último recurso: primer año plausible dentro del texto"""
+        match = _ANY_YEAR.search(date_str)
+        if match:
+            year = int(match.group())
+            if MIN_VALID_YEAR <= year <= clock.today.year:
+                return date(year, 1, 1)
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {'memo_entries': len(self._absolute)}
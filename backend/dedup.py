@@ -0,0 +1,140 @@
+# backend/dedup.py
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from text_matcher import tokenize
+
+# Constantes de mezcla (splitmix64) para combinar y permutar los hashes de los shingles
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SHINGLE_WEIGHTS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F), np.uint64(0x165667B19E3779F9))
+
+# Filas de shingles procesadas por bloque para acotar la memoria de la matriz (shingles x permutaciones)
+_CHUNK_ROWS = 65536
+
+
+class _WordHashes(dict):
+    """Hash estable de 64 bits por palabra, calculado una sola vez.
+
+    El índice vive todo el proceso: al llegar a max_entries palabras se vacía
+    (como el memo de DateNormalizer) para que el vocabulario no crezca sin límite.
+    """
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __missing__(self, word: str) -> int:
+        encoded = word.encode('utf-8')
+        word_hash = zlib.crc32(encoded) | (zlib.crc32(encoded, 0x5BD1E995) << 32)
+        if len(self) >= self.max_entries:
+            self.clear()
+        self[word] = word_hash
+        return word_hash
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    values = values ^ (values >> np.uint64(30))
+    values = values * _MIX_1
+    values = values ^ (values >> np.uint64(27))
+    values = values * _MIX_2
+    return values ^ (values >> np.uint64(31))
+
+
+class NearDuplicateIndex:
+    """Agrupa textos casi idénticos (p. ej. notas de agencia republicadas) con MinHash LSH.
+
+    Cada texto se resume en una firma MinHash sobre trigramas de palabras. La firma se
+    divide en bandas y solo se comparan los textos que comparten una banda completa, así
+    que el coste total es aproximadamente lineal en vez de cuadrático. Los candidatos se
+    confirman con la similitud de Jaccard estimada por la firma.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 32, bands: int = 8, shingle_size: int = 3,
+                 max_words: int = 100000):
+        if num_perm % bands:
+            raise ValueError("bands debe dividir num_perm")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self._rows = num_perm // bands
+        self._seeds = _mix(np.arange(1, num_perm + 1, dtype=np.uint64) * _SHINGLE_WEIGHTS[0])
+        self._word_hashes = _WordHashes(max_words)
+
+    def _shingles(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashes de los trigramas de palabras y el índice del texto al que pertenece cada uno"""
+        lookup = self._word_hashes.__getitem__
+        hashes: List[int] = []
+        counts: List[int] = []
+        for text in texts:
+            words = tokenize(text.lower())
+            hashes.extend(map(lookup, words))
+            counts.append(len(words))
+
+        size = self.shingle_size
+        if len(hashes) < size:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+
+        words = np.array(hashes, dtype=np.uint64)
+        word_owners = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+
+        # Trigramas que no cruzan de un texto a otro
+        valid = word_owners[:len(words) - size + 1] == word_owners[size - 1:]
+        shingles = np.zeros(int(valid.sum()), dtype=np.uint64)
+        for offset, weight in zip(range(size), _SHINGLE_WEIGHTS):
+            shingles ^= words[offset:offset + len(valid)][valid] * weight
+        return _mix(shingles), word_owners[:len(valid)][valid]
+
+    def signatures(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Firma MinHash por texto y máscara de textos con al menos un shingle"""
+        shingles, owners = self._shingles(texts)
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+        has_shingles = np.zeros(len(texts), dtype=bool)
+
+        for start in range(0, len(shingles), _CHUNK_ROWS):
+            chunk_owners = owners[start:start + _CHUNK_ROWS]
+            permuted = _mix(shingles[start:start + _CHUNK_ROWS, None] ^ self._seeds[None, :])
+            owner_ids, starts = np.unique(chunk_owners, return_index=True)
+            minima = np.minimum.reduceat(permuted, starts, axis=0)
+            signatures[owner_ids] = np.minimum(signatures[owner_ids], minima)
+            has_shingles[owner_ids] = True
+
+        return signatures, has_shingles
+
+    def cluster(self, texts: Sequence[str]) -> List[int]:
+        """Para cada texto, el índice del primer texto de su grupo (él mismo si es representante)"""
+        signatures, has_shingles = self.signatures(texts)
+        min_matches = self.threshold * self.num_perm
+        rows = self._rows
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        assignments = []
+
+        for index in range(len(texts)):
+            if not has_shingles[index]:
+                assignments.append(index)
+                continue
+
+            signature = signatures[index]
+            keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+            representative = None
+            checked = set()
+            for key in keys:
+                for candidate in buckets.get(key, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if np.count_nonzero(signatures[candidate] == signature) >= min_matches:
+                        if representative is None or candidate < representative:
+                            representative = candidate
+                        break
+
+            if representative is None:
+                representative = index
+                for key in keys:
+                    buckets.setdefault(key, []).append(index)
+            assignments.append(representative)
+
+        return assignments
@@ -0,0 +1,260 @@
+# backend/jobs.py
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Estados posibles de un trabajo
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+JobRunner = Callable[[Dict[str, Any], ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class JobError(Exception):
+    """Error de un trabajo con el código HTTP que debe reportarse al cliente"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class Job:
+    """Estado de un análisis en segundo plano"""
+
+    def __init__(self, job_id: str, key: str, payload: Dict[str, Any]):
+        self.id = job_id
+        self.key = key
+        self.payload = payload
+        self.status = QUEUED
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+
+
+class JobStore:
+    """Persistencia opcional de trabajos en SQLite"""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, key TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress TEXT, result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.key, json.dumps(job.payload), job.status, json.dumps(job.progress),
+                    json.dumps(job.result), json.dumps(job.error), job.created_at, job.updated_at
+                )
+            )
+            self._db.commit()
+
+    def load(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def unfinished(self) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def delete_finished_before(self, timestamp: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (COMPLETED, FAILED, timestamp)
+            )
+            self._db.commit()
+
+    @staticmethod
+    def _from_row(row) -> Job:
+        job = Job(row[0], row[1], json.loads(row[2]))
+        job.status = row[3]
+        job.progress = json.loads(row[4]) if row[4] else {}
+        job.result = json.loads(row[5]) if row[5] else None
+        job.error = json.loads(row[6]) if row[6] else None
+        job.created_at = row[7]
+        job.updated_at = row[8]
+        return job
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobManager:
+    """Cola de análisis en proceso con un pool fijo de workers.
+
+    Los trabajos idénticos en curso (misma clave) se agrupan en uno solo.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = 2,
+        db_path: Optional[str] = None,
+        retention_seconds: float = 3600,
+    ):
+        self.runner = runner
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self.store = JobStore(db_path) if db_path else None
+        self.counters = {'submitted': 0, 'coalesced': 0, 'completed': 0, 'failed': 0}
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: list = []
+
+    @classmethod
+    def from_env(cls, runner: JobRunner) -> "JobManager":
+        """Crea el gestor leyendo la configuración de variables de entorno"""
+        return cls(
+            runner,
+            workers=int(os.getenv("HYPECYCLE_JOB_WORKERS", "2")),
+            db_path=os.getenv("HYPECYCLE_JOBS_DB") or None,
+            retention_seconds=float(os.getenv("HYPECYCLE_JOB_RETENTION", "3600")),
+        )
+
+    async def start(self) -> None:
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.Queue()
+
+        # Reanudar los trabajos que quedaron pendientes en una ejecución anterior
+        if self.store is not None:
+            for job in self.store.unfinished():
+                job.status = QUEUED
+                self._track(job)
+                self._queue.put_nowait(job.id)
+
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def submit(self, key: str, payload: Dict[str, Any]) -> Tuple[Job, bool]:
+        """Encola un trabajo; devuelve (trabajo, True si se agrupó con uno en curso)"""
+        if self._queue is None:
+            raise RuntimeError("JobManager no iniciado")
+        self._evict_finished()
+
+        job_id = self._in_flight.get(key)
+        if job_id is not None:
+            self.counters['coalesced'] += 1
+            return self._jobs[job_id], True
+
+        job = Job(uuid.uuid4().hex, key, payload)
+        self._track(job)
+        self._save(job)
+        self._queue.put_nowait(job.id)
+        self.counters['submitted'] += 1
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.load(job_id)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': len(self._in_flight),
+            'workers': self.workers
+        }
+
+    def _track(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        self._in_flight[job.key] = job.id
+
+    def _save(self, job: Job) -> None:
+        job.updated_at = time.time()
+        if self.store is not None:
+            self.store.save(job)
+
+    def _evict_finished(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.updated_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if expired and self.store is not None:
+            self.store.delete_finished_before(cutoff)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        self._save(job)
+
+        def progress(update: Dict[str, Any]) -> None:
+            job.progress = {**job.progress, **update}
+            job.updated_at = time.time()
+
+        try:
+            job.result = await self.runner(job.payload, progress)
+            job.status = COMPLETED
+            self.counters['completed'] += 1
+        except asyncio.CancelledError:
+            raise
+        except JobError as e:
+            job.error = {'status_code': e.status_code, 'detail': e.detail}
+            job.status = FAILED
+            self.counters['failed'] += 1
+        except Exception as e:
+            job.error = {'status_code': 500, 'detail': f"Error interno: {str(e)}"}
+            job.status = FAILED
+            self.counters['failed'] += 1
+        finally:
+            if self._in_flight.get(job.key) == job.id and job.finished:
+                del self._in_flight[job.key]
+            self._save(job)
@@ -0,0 +1,248 @@
+# backend/log_setup.py
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+LOGGER_NAME = "hypecycle"
+
+# IDs de la solicitud HTTP y del análisis en curso; se agregan a cada registro
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+analysis_id_var: ContextVar[Optional[str]] = ContextVar("analysis_id", default=None)
+
+_CONTEXT_VARS = {'request_id': request_id_var, 'analysis_id': analysis_id_var}
+
+# Atributos propios de LogRecord: todo lo demás vino en extra= y va al JSON como campo
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_log_context() -> Dict[str, str]:
+    """IDs activos, para pasarlos a otro proceso o hilo del executor"""
+    return {name: var.get() for name, var in _CONTEXT_VARS.items() if var.get() is not None}
+
+
+@contextmanager
+def bind_log_context(context: Optional[Dict[str, Optional[str]]] = None, **ids: Optional[str]) -> Iterator[None]:
+    """Fija request_id / analysis_id durante el bloque"""
+    values = {**(context or {}), **ids}
+    tokens = [(_CONTEXT_VARS[name], _CONTEXT_VARS[name].set(value)) for name, value in values.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copia los IDs del contexto al registro en el hilo que lo emite"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _CONTEXT_VARS.items():
+            if getattr(record, name, None) is None:
+                setattr(record, name, var.get())
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Muestreo de registros repetitivos (extra={'sample_key': ...}).
+
+    Por clave y ventana de window segundos pasan los primeros burst registros y
+    luego uno de cada every; el registro que pasa lleva el conteo de la ventana.
+    """
+
+    def __init__(self, burst: int = 10, every: int = 100, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.window = window
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def allow(self, key: str) -> Optional[int]:
+        """Conteo de la ventana si el registro pasa el muestreo; None si se descarta"""
+        now = time.monotonic()
+        with self._lock:
+            started, count = self._windows.get(key, (now, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            count += 1
+            self._windows[key] = (started, count)
+            if count > self.burst and count % self.every:
+                self.suppressed += 1
+                return None
+        return count
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'sample_key', None)
+        if key is None or getattr(record, 'occurrences', None) is not None:
+            return True
+        record.occurrences = self.allow(key)
+        return record.occurrences is not None
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea: ts, level, logger, message, IDs y los campos de extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legible para desarrollo local, con los mismos campos al final"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(
+            f"{key}={value}" for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and value is not None
+        )
+        line = f"{datetime.fromtimestamp(record.created).strftime('%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        if fields:
+            line += f" [{fields}]"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Encola sin bloquear; con la cola llena el registro se descarta y se cuenta"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Solo se resuelven mensaje y traza (no son serializables tal cual); el JSON se arma en el listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LoggingState:
+    def __init__(self):
+        self.handler: Optional[_NonBlockingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.sampling: Optional[SamplingFilter] = None
+        self.queue_size = 10000
+        self.formatter: logging.Formatter = JsonFormatter()
+
+
+_state = _LoggingState()
+
+
+def _start_listener(stream=None) -> None:
+    """Cola acotada + hilo que escribe en stdout: la E/S sale del camino de la solicitud"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if _state.handler is not None:
+        logger.removeHandler(_state.handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=_state.queue_size)
+    handler = _NonBlockingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    handler.addFilter(_state.sampling)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(_state.formatter)
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=False)
+    listener.start()
+
+    logger.addHandler(handler)
+    _state.handler = handler
+    _state.listener = listener
+
+
+def configure_logging() -> logging.Logger:
+    """Configura el logger de la aplicación desde el entorno (idempotente)"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if _state.listener is not None:
+        return logger
+
+    logger.setLevel(os.getenv("HYPECYCLE_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+    _state.queue_size = int(os.getenv("HYPECYCLE_LOG_QUEUE_SIZE", "10000"))
+    _state.formatter = TextFormatter() if os.getenv("HYPECYCLE_LOG_FORMAT", "json").lower() == "text" else JsonFormatter()
+    _state.sampling = SamplingFilter(
+        burst=int(os.getenv("HYPECYCLE_LOG_SAMPLE_BURST", "10")),
+        every=int(os.getenv("HYPECYCLE_LOG_SAMPLE_EVERY", "100")),
+        window=float(os.getenv("HYPECYCLE_LOG_SAMPLE_WINDOW", "60")),
+    )
+    _start_listener()
+    atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola y detiene el hilo del listener"""
+    if _state.listener is not None:
+        _state.listener.stop()
+        _state.listener = None
+
+
+def _restart_after_fork() -> None:
+    # Los procesos hijos (pool de análisis) no heredan el hilo del listener: se crea uno propio.
+    # sys.stdout pudo quedar bloqueado por ese hilo en el momento del fork, así que se abre otro sobre el mismo fd
+    if _state.listener is not None:
+        try:
+            stream = open(os.dup(sys.stdout.fileno()), 'w', buffering=1, encoding='utf-8')
+        except (AttributeError, OSError, ValueError):
+            stream = None
+        _start_listener(stream)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def log_sampled(logger: logging.Logger, level: int, key: str, msg: str, **fields: Any) -> None:
+    """Registro muestreado por clave; los descartados no llegan a crear el LogRecord"""
+    if not logger.isEnabledFor(level):
+        return
+    occurrences = _state.sampling.allow(key) if _state.sampling else 1
+    if occurrences is not None:
+        logger.log(level, msg, extra={**fields, 'sample_key': key, 'occurrences': occurrences})
+
+
+def logging_stats() -> Dict[str, Any]:
+    return {
+        'queued': _state.handler.queue.qsize() if _state.handler else 0,
+        'dropped': _state.handler.dropped if _state.handler else 0,
+        'sampled_out': _state.sampling.suppressed if _state.sampling else 0,
+    }
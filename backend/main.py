@@ -1,20 +1,67 @@
 # backend/main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import requests
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, AsyncIterator, Callable, Tuple
+import hashlib
+import json
+import logging
 import re
 from datetime import datetime
 import os
 from dotenv import load_dotenv
-import time
+import asyncio
 from collections import Counter
-import numpy as np
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from date_normalizer import DateNormalizer
+from jobs import JobError, JobManager
+from log_setup import bind_log_context, configure_logging, current_log_context, log_sampled, logging_stats, new_id
+from metrics import REGISTRY
+from news_record import NewsRecord
+from query_planner import QueryPlanner
+from result_store import ResultStore, decode_cursor, encode_cursor
+from serp_cache import QueryCache
+from sentiment import create_sentiment_engine
+from serp_client import SerpClient, is_retryable_error
+from singleflight import SingleFlight
+from snapshots import Snapshot, SnapshotManager
+from topic_store import TopicStore
+from text_matcher import PhraseMatcher, tokenize
+
+# numpy, httpx y el índice de casi-duplicados se importan al primer uso para acelerar el arranque
+if TYPE_CHECKING:
+    import numpy as np
+    from dedup import NearDuplicateIndex
 
 load_dotenv()
 
-app = FastAPI()
+# Registros JSON en una cola atendida por un hilo aparte (HYPECYCLE_LOG_LEVEL, HYPECYCLE_LOG_FORMAT)
+logger = configure_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Construye una sola vez analizadores, léxicos y patrones compilados, arranca la cola de trabajos y los snapshots, y lo cierra todo al apagar"""
+    get_news_analyzer()
+    await job_manager.start()
+    await snapshot_manager.start()
+    try:
+        yield
+    finally:
+        await job_manager.stop()
+        await snapshot_manager.stop()
+        if _news_analyzer is not None:
+            await _news_analyzer.serp_client.aclose()
+            _news_analyzer.executor.shutdown()
+            _news_analyzer.query_cache.close()
+        if _topic_store is not None:
+            _topic_store.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +71,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class GZipExceptStreamsMiddleware:
+    """GZip para las respuestas JSON; las rutas en streaming se envían sin comprimir para no retener eventos"""
+
+    def __init__(self, app, minimum_size: int = 1000, excluded_paths: Tuple[str, ...] = ()):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in self.excluded_paths:
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+app.add_middleware(
+    GZipExceptStreamsMiddleware,
+    minimum_size=int(os.getenv("HYPECYCLE_GZIP_MIN_SIZE", "1000")),
+    excluded_paths=("/api/hypecycle/analyze/stream",)
+)
+
+class RequestIdMiddleware:
+    """Asigna un request_id a cada solicitud (o respeta X-Request-ID) para los registros y la respuesta"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if 0 < len(incoming) <= 64 and incoming.isprintable() else new_id()
+        
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+        
+        with bind_log_context(request_id=request_id):
+            await self.app(scope, receive, send_with_id)
+
+app.add_middleware(RequestIdMiddleware)
+
+# Métricas por proceso, exportadas en /metrics
+STAGE_SECONDS = REGISTRY.histogram(
+    "hypecycle_stage_seconds", "Duración de cada etapa del análisis (SERPAPI, procesamiento, dedup, análisis...)", ["stage"]
+)
+API_CALLS_PER_ANALYSIS = REGISTRY.histogram(
+    "hypecycle_api_calls_per_analysis", "Llamadas reales a SERPAPI (sin aciertos de caché) por búsqueda",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 15, 20)
+)
+SERP_CACHE_LOOKUPS = REGISTRY.counter("hypecycle_serp_cache_lookups_total", "Consultas a la caché de SERPAPI", ["result"])
+ITEMS_PROCESSED = REGISTRY.counter("hypecycle_items_processed_total", "Resultados crudos recibidos para procesar")
+ITEMS_DROPPED = REGISTRY.counter("hypecycle_items_dropped_total", "Resultados descartados por _is_valid_result o por error")
+DUPLICATES_REMOVED = REGISTRY.counter("hypecycle_duplicates_removed_total", "Resultados eliminados por deduplicación (exactos y casi-duplicados)")
+ANALYSES = REGISTRY.counter("hypecycle_analyses_total", "Análisis completos por resultado", ["outcome"])
+
+# Contador de llamadas reales a SERPAPI de la búsqueda en curso (lo heredan las tareas de cada rango)
+_upstream_calls: ContextVar[Optional[List[int]]] = ContextVar("upstream_calls", default=None)
+
 # Modelos Pydantic
 class SearchTerm(BaseModel):
     value: str
@@ -44,6 +152,20 @@ class NewsResult(BaseModel):
     sentiment: float
     country: Optional[str] = None
     keywords: List[str] = []
+    syndication_count: int = 1
+    published_date: Optional[str] = None
+
+def to_news_results(records: List[NewsRecord]) -> List[NewsResult]:
+    """Modelos de la API a partir de los registros internos, sin revalidar"""
+    return [
+        NewsResult.model_construct(
+            title=record.title, link=record.link, snippet=record.snippet, source=record.source,
+            date=record.date, year=record.year, sentiment=record.sentiment, country=record.country,
+            keywords=list(record.keywords), syndication_count=record.syndication_count,
+            published_date=record.published.isoformat() if record.published else None
+        )
+        for record in records
+    ]
 
 class InflectionPoint(BaseModel):
     year: int
@@ -86,6 +208,8 @@ class InnovationTestResponse(BaseModel):
     module_scores: List[ModuleScore]
     innovation_level: InnovationLevel
     chart_data: Dict[str, Any]
+
+class HypeCycleResponse(BaseModel):
     success: bool
     phase: str
     confidence: float
@@ -94,6 +218,32 @@ class InnovationTestResponse(BaseModel):
     chart_data: Dict[str, Any]
     news_results: List[NewsResult]
     analysis: Optional[HypeCycleAnalysis] = None
+    results_id: Optional[str] = None
+    total_results: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class NewsResultsPage(BaseModel):
+    news_results: List[NewsResult]
+    total_results: int
+    next_cursor: Optional[str] = None
+
+class HypeCycleCompareRequest(BaseModel):
+    topics: List[HypeCycleRequest]
+
+class TopicComparison(BaseModel):
+    label: str
+    success: bool
+    phase: Optional[str] = None
+    confidence: Optional[float] = None
+    total_mentions: int = 0
+    mention_counts: List[int] = []
+    sentiment_means: List[Optional[float]] = []
+    error: Optional[str] = None
+
+class HypeCycleCompareResponse(BaseModel):
+    success: bool
+    years: List[int]
+    topics: List[TopicComparison]
 
 # Clases de análisis migradas
 class QueryBuilder:
@@ -155,6 +305,46 @@ class ResultAnalyzer:
             'very', 'both', 'each', 'between', 'under', 'same', 'through',
             'until'
         }
+        
+        self.countries = {
+            'USA': ['united states', 'usa', 'u.s.', 'america'],
+            'UK': ['united kingdom', 'uk', 'britain', 'england'],
+            'China': ['china', 'chinese'], 'Japan': ['japan', 'japanese'],
+            'Germany': ['germany', 'german'], 'France': ['france', 'french'],
+            'Spain': ['spain', 'spanish'], 'Italy': ['italy', 'italian'],
+            'India': ['india', 'indian'], 'Brazil': ['brazil', 'brazilian'],
+            'Canada': ['canada', 'canadian'], 'Australia': ['australia', 'australian'],
+            'South Korea': ['south korea', 'korea'], 'Russia': ['russia', 'russian'],
+            'Netherlands': ['netherlands', 'dutch'], 'Sweden': ['sweden', 'swedish'],
+            'Switzerland': ['switzerland', 'swiss'], 'Singapore': ['singapore'],
+            'Israel': ['israel', 'israeli'], 'Norway': ['norway', 'norwegian'],
+            'Denmark': ['denmark', 'danish'], 'Finland': ['finland', 'finnish'],
+            'Belgium': ['belgium', 'belgian'], 'Austria': ['austria', 'austrian'],
+            'Ireland': ['ireland', 'irish'], 'Portugal': ['portugal', 'portuguese'],
+            'Greece': ['greece', 'greek'], 'Poland': ['poland', 'polish'],
+            'Turkey': ['turkey', 'turkish'], 'Mexico': ['mexico', 'mexican'],
+            'Argentina': ['argentina'], 'Chile': ['chile'], 'Colombia': ['colombia'],
+            'Egypt': ['egypt'], 'Nigeria': ['nigeria'], 'South Africa': ['south africa']
+        }
+        
+        # Automata construido una sola vez; el valor de cada alias es la prioridad del país
+        self._country_names = list(self.countries)
+        country_ranks = {}
+        for rank, patterns in enumerate(self.countries.values()):
+            for pattern in patterns:
+                country_ranks.setdefault(pattern, rank)
+        self.country_matcher = PhraseMatcher(country_ranks)
+        self._non_word_pattern = re.compile(r'[^\w\s]')
+        
+        # Patrones de extract_year, compilados una sola vez
+        self._size_pattern = re.compile(r'\d+\s*(?:kb|mb|gb|kib|mib|gib|bytes?)')
+        self._date_patterns = [
+            re.compile(r'published.*?in\s*(20\d{2})'),
+            re.compile(r'publication\s*date:?\s*(20\d{2})'),
+            re.compile(r'©\s*(20\d{2})'),
+            re.compile(r'\d{1,2}\s*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*(20\d{2})')
+        ]
+        self._year_pattern = re.compile(r'\b(19[7-9]\d|20[0-2]\d)\b')
 
     def extract_year(self, text: str) -> int:
         """Extrae el año del texto con validación estricta"""
@@ -170,26 +360,16 @@ class ResultAnalyzer:
                 return False
         
         # Limpiar el texto
-        cleaned_text = text.lower()
-        cleaned_text = re.sub(r'\d+\s*(?:kb|mb|gb|kib|mib|gib|bytes?)', '', cleaned_text)
+        cleaned_text = self._size_pattern.sub('', text.lower())
         
         # Buscar fechas explícitas
-        date_patterns = [
-            r'published.*?in\s*(20\d{2})',
-            r'publication\s*date:?\s*(20\d{2})',
-            r'©\s*(20\d{2})',
-            r'\d{1,2}\s*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*(20\d{2})'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.findall(pattern, cleaned_text)
-            for match in matches:
+        for pattern in self._date_patterns:
+            for match in pattern.findall(cleaned_text):
                 if is_valid_year(match):
                     return int(match)
         
         # Buscar años válidos
-        year_pattern = r'\b(19[7-9]\d|20[0-2]\d)\b'
-        years = re.findall(year_pattern, cleaned_text)
+        years = self._year_pattern.findall(cleaned_text)
         if years:
             valid_years = [int(y) for y in years if is_valid_year(y)]
             if valid_years:
@@ -199,270 +379,306 @@ class ResultAnalyzer:
 
     def extract_country(self, text: str) -> Optional[str]:
         """Extrae menciones de países del texto"""
-        countries = {
-            'USA': ['united states', 'usa', 'u.s.', 'america'],
-            'UK': ['united kingdom', 'uk', 'britain', 'england'],
-            'China': ['china', 'chinese'], 'Japan': ['japan', 'japanese'],
-            'Germany': ['germany', 'german'], 'France': ['france', 'french'],
-            'Spain': ['spain', 'spanish'], 'Italy': ['italy', 'italian'],
-            'India': ['india', 'indian'], 'Brazil': ['brazil', 'brazilian'],
-            'Canada': ['canada', 'canadian'], 'Australia': ['australia', 'australian'],
-            'South Korea': ['south korea', 'korea'], 'Russia': ['russia', 'russian'],
-            'Netherlands': ['netherlands', 'dutch'], 'Sweden': ['sweden', 'swedish'],
-            'Switzerland': ['switzerland', 'swiss'], 'Singapore': ['singapore'],
-            'Israel': ['israel', 'israeli'], 'Norway': ['norway', 'norwegian'],
-            'Denmark': ['denmark', 'danish'], 'Finland': ['finland', 'finnish'],
-            'Belgium': ['belgium', 'belgian'], 'Austria': ['austria', 'austrian'],
-            'Ireland': ['ireland', 'irish'], 'Portugal': ['portugal', 'portuguese'],
-            'Greece': ['greece', 'greek'], 'Poland': ['poland', 'polish'],
-            'Turkey': ['turkey', 'turkish'], 'Mexico': ['mexico', 'mexican'],
-            'Argentina': ['argentina'], 'Chile': ['chile'], 'Colombia': ['colombia'],
-            'Egypt': ['egypt'], 'Nigeria': ['nigeria'], 'South Africa': ['south africa']
-        }
-        
-        text_lower = text.lower()
-        for country, patterns in countries.items():
-            if any(pattern in text_lower for pattern in patterns):
-                return country
-        return None
+        return self._country_from_words(tokenize(text.lower()))
 
-    def extract_keywords(self, text: str, search_terms: List[SearchTerm]) -> List[str]:
-        """Extrae keywords relevantes excluyendo términos de búsqueda"""
-        # Obtener palabras de búsqueda para filtrarlas
+    def _country_from_words(self, words: List[str]) -> Optional[str]:
+        """Devuelve el país de mayor prioridad mencionado como palabra completa"""
+        ranks = self.country_matcher.find_values(words)
+        if not ranks:
+            return None
+        return self._country_names[min(ranks)]
+
+    def search_words(self, search_terms: List[SearchTerm]) -> set:
+        """Palabras de los términos de búsqueda que se excluyen de las keywords"""
         search_words = set()
         for term in search_terms:
-            words = re.sub(r'[^\w\s]', ' ', term.value.lower()).split()
+            words = self._non_word_pattern.sub(' ', term.value.lower()).split()
             search_words.update(words)
-        
-        # Procesar texto
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = text.split()
-        
-        # Filtrar palabras
-        keywords = [
-            word for word in words 
+        return search_words
+
+    def extract_keywords(self, text: str, search_terms: List[SearchTerm]) -> List[str]:
+        """Extrae keywords relevantes excluyendo términos de búsqueda"""
+        return self._keywords_from_lower(text.lower(), self.search_words(search_terms))
+
+    def _keywords_from_lower(self, text_lower: str, search_words: set) -> List[str]:
+        """Filtra las palabras del texto; isalpha ya descarta palabras con dígitos o años"""
+        words = self._non_word_pattern.sub(' ', text_lower).split()
+        common_words = self.common_words
+        return [
+            word for word in words
             if (
-                word not in self.common_words 
-                and word not in search_words
-                and len(word) > 3 
+                len(word) > 3
                 and word.isalpha()
-                and not word.isdigit()
-                and not re.match(r'.*\d+.*', word)
-                and not re.match(r'20\d{2}', word)
+                and word not in common_words
+                and word not in search_words
             )
         ]
-        
-        return keywords
 
-class NewsAnalyzer:
-    def __init__(self):
-        self.SERP_API_BASE_URL = "https://serpapi.com/search"
-        self.result_analyzer = ResultAnalyzer()
+class AnalysisExecutor:
+    """Ejecuta el análisis de texto (CPU) fuera del event loop.
 
-    def _analyze_query_complexity(self, query: str) -> Dict[str, Any]:
-        """Analiza la complejidad de una consulta"""
-        complexity_score = 0
-        reasons = []
-        
-        # Detectar operadores booleanos
-        boolean_operators = ['AND', 'OR', 'NOT', '&', '|', '-']
-        for operator in boolean_operators:
-            if operator in query.upper():
-                complexity_score += 2
-                reasons.append(f"operador {operator}")
-        
-        # Detectar términos entre comillas
-        quoted_terms = re.findall(r'"[^"]+"', query)
-        if len(quoted_terms) > 1:
-            complexity_score += len(quoted_terms)
-            reasons.append(f"{len(quoted_terms)} términos exactos")
-        
-        # Contar palabras
-        words_outside_quotes = re.sub(r'"[^"]+"', '', query).strip()
-        word_count = len([w for w in words_outside_quotes.split() if len(w) > 2])
-        if word_count > 2:
-            complexity_score += word_count - 2
-            reasons.append(f"{word_count} palabras separadas")
+    Los ítems se reparten en lotes de batch_size que se envían a un pool de procesos
+    (o de hilos); los lotes con hasta inline_max ítems se procesan en línea, ya que
+    el coste de enviarlos al pool superaría al del propio análisis.
+    """
+
+    MODES = ('process', 'thread', 'inline')
+
+    def __init__(self, mode: str = "process", workers: Optional[int] = None, batch_size: int = 250, inline_max: int = 50):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de ejecución desconocido: {mode}")
+        self.mode = mode
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.inline_max = inline_max
+        self._pool: Optional[Executor] = None
+        self.counters = {'inline_batches': 0, 'pooled_batches': 0, 'chunks': 0, 'items': 0}
+
+    @classmethod
+    def from_env(cls) -> "AnalysisExecutor":
+        workers = os.getenv("HYPECYCLE_EXECUTOR_WORKERS")
+        return cls(
+            mode=os.getenv("HYPECYCLE_EXECUTOR", "process"),
+            workers=int(workers) if workers else None,
+            batch_size=int(os.getenv("HYPECYCLE_EXECUTOR_BATCH_SIZE", "250")),
+            inline_max=int(os.getenv("HYPECYCLE_EXECUTOR_INLINE_MAX", "50")),
+        )
+
+    @property
+    def pool(self) -> Executor:
+        # El pool se crea con el primer lote grande, no al importar el módulo (los procesos hijos también lo importan)
+        if self._pool is None:
+            if self.mode == "process":
+                from concurrent.futures import ProcessPoolExecutor
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        return self._pool
+
+    async def map_batches(self, fn: Callable[..., List[Any]], items: List[Any], *args: Any) -> List[Any]:
+        """Aplica fn(lote, *args) por lotes y concatena los resultados en el orden original"""
+        self.counters['items'] += len(items)
+        if self.mode == "inline" or len(items) <= self.inline_max:
+            self.counters['inline_batches'] += 1
+            return fn(items, *args)
         
-        # Determinar nivel
-        if complexity_score == 0:
-            level = 'SIMPLE'
-            reason = "término único sin operadores"
-        elif complexity_score <= 2:
-            level = 'SIMPLE'
-            reason = "complejidad baja: " + ", ".join(reasons[:2])
-        else:
-            level = 'COMPLEX'
-            reason = "complejidad alta: " + ", ".join(reasons[:3])
+        loop = asyncio.get_running_loop()
+        chunks = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        self.counters['pooled_batches'] += 1
+        self.counters['chunks'] += len(chunks)
         
+        results = await asyncio.gather(*[loop.run_in_executor(self.pool, fn, chunk, *args) for chunk in chunks])
+        return [row for chunk_result in results for row in chunk_result]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
         return {
-            'level': level,
-            'reason': reason,
-            'score': complexity_score
+            **self.counters,
+            'mode': self.mode,
+            'workers': self.workers,
+            'batch_size': self.batch_size,
+            'inline_max': self.inline_max
         }
 
-    def _calculate_sentiment(self, text: str) -> float:
-        """Análisis básico de sentimiento sin VADER"""
-        positive_words = [
-            'breakthrough', 'innovative', 'revolutionary', 'success', 'leading',
-            'advanced', 'improved', 'better', 'growth', 'increase', 'promising',
-            'potential', 'opportunity', 'advantage', 'benefit', 'progress',
-            'development', 'achievement', 'excellent', 'outstanding', 'superior'
-        ]
-        
-        negative_words = [
-            'decline', 'failure', 'problem', 'issue', 'challenge', 'difficult',
-            'decrease', 'drop', 'fall', 'crisis', 'concern', 'risk', 'threat',
-            'limitation', 'obstacle', 'setback', 'disappointment', 'weak',
-            'poor', 'negative', 'loss', 'reduce', 'cut', 'eliminate'
-        ]
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+def _analyze_rows_worker(items: List[Dict[str, Any]], search_terms: List["SearchTerm"], validate: bool, now: datetime, log_context: Dict[str, str]) -> List[tuple]:
+    """Punto de entrada de los procesos del pool: usa el analizador global del proceso"""
+    # Los IDs de registro no viajan solos al pool (ni a sus hilos): se pasan con el lote
+    with bind_log_context(log_context):
+        return get_news_analyzer()._analyze_rows(items, search_terms, validate, now)
+
+class SearchError(Exception):
+    """La búsqueda no obtuvo ninguna respuesta válida de SERPAPI (se informa como 400)"""
+
+class NewsAnalyzer:
+    # Resultados por página de SERPAPI; una página llena indica un rango saturado
+    PAGE_SIZE = 100
+
+    def __init__(self):
+        self.SERP_API_BASE_URL = os.getenv("SERP_API_BASE_URL", "https://serpapi.com/search")
+        self.result_analyzer = ResultAnalyzer()
+        self.serp_client = SerpClient.from_env(self.SERP_API_BASE_URL)
+        self.query_cache = QueryCache.from_env()
+        self.date_normalizer = DateNormalizer()
+        self.executor = AnalysisExecutor.from_env()
+        self.query_planner = QueryPlanner.from_env(self.PAGE_SIZE)
         
-        total_words = len(text.split())
-        if total_words == 0:
-            return 0.0
+        # Similitud de Jaccard mínima para considerar dos noticias la misma nota; 0 desactiva la detección
+        self.near_duplicate_threshold = float(os.getenv("HYPECYCLE_NEAR_DUP_THRESHOLD", "0.6"))
+        self._near_duplicates: Optional["NearDuplicateIndex"] = None
         
-        sentiment_score = (positive_count - negative_count) / max(total_words / 10, 1)
-        return max(-1.0, min(1.0, sentiment_score))
+        # Motor de sentimiento (HYPECYCLE_SENTIMENT=heuristic|vader)
+        self.sentiment_engine = create_sentiment_engine()
+
+    @property
+    def near_duplicates(self) -> Optional["NearDuplicateIndex"]:
+        """Índice MinHash (y numpy) cargado con la primera deduplicación"""
+        if self._near_duplicates is None and self.near_duplicate_threshold > 0:
+            from dedup import NearDuplicateIndex
+            self._near_duplicates = NearDuplicateIndex(self.near_duplicate_threshold)
+        return self._near_duplicates
+
+    def _calculate_sentiment(self, text: str) -> float:
+        """Sentimiento de un texto con el motor configurado"""
+        return self.sentiment_engine.score(text)
 
-    def perform_news_search(self, query: str, serp_api_key: str, search_terms: List[SearchTerm]) -> tuple[bool, Any]:
-        """Realiza búsqueda híbrida con SERPAPI"""
+    async def perform_news_search(self, query: str, serp_api_key: str, search_terms: List[SearchTerm], on_page: Optional[Callable[[int, Tuple[int, int]], None]] = None, search_metrics: Optional[Dict[str, Any]] = None) -> tuple[bool, Any]:
+        """Realiza búsqueda híbrida con SERPAPI; search_metrics recibe el resumen del plan y de la paginación"""
+        upstream_calls = [0]
+        token = _upstream_calls.set(upstream_calls)
         try:
-            all_results = []
-            current_year = datetime.now().year
-            start_year = current_year - 12
-            
-            # Limpiar query
-            clean_query = re.sub(r'\s*(?:after|before):\d{4}(?:-\d{2}-\d{2})?\s*', '', query).strip()
-            
-            # Analizar complejidad
-            query_complexity = self._analyze_query_complexity(clean_query)
-            print(f"Query complexity: {query_complexity['level']} - {query_complexity['reason']}")
+            pages = []
+            async for page in self.iter_search_pages(query, serp_api_key, search_metrics):
+                pages.append(page)
+                if on_page:
+                    on_page(len(pages), page[1])
             
-            # Configuración base
-            base_params = {
-                "api_key": serp_api_key,
-                "tbm": "nws",
-                "num": 100,
-                "safe": "off",
-                "gl": "us",
-                "hl": "en",
-                "filter": "0"
-            }
+            # Procesar todos los resultados en un solo lote, en el orden de los rangos
+            pages.sort(key=lambda page: page[0])
+            raw_items = [item for _, _, items in pages for item in items]
+            all_results = await self.process_news_batch(raw_items, search_terms)
             
-            total_api_calls = 0
-            
-            # Estrategia según complejidad
-            if query_complexity['level'] == 'SIMPLE':
-                # Estrategia exploratoria
-                exploratory_query = f"{clean_query} after:{start_year}-01-01 before:{current_year}-12-31"
-                
-                # Primera consulta exploratoria
-                response = requests.get(
-                    self.SERP_API_BASE_URL, 
-                    params={**base_params, "q": exploratory_query, "start": 0}
-                )
-                response.raise_for_status()
-                data = response.json()
-                total_api_calls += 1
-                
-                if "news_results" in data and data["news_results"]:
-                    exploratory_results = data["news_results"]
-                    exploratory_count = len(exploratory_results)
-                    
-                    # Procesar resultados
-                    for item in exploratory_results:
-                        if self._is_valid_result(item):
-                            processed = self._process_news_item(item, search_terms)
-                            if processed:
-                                all_results.append(processed)
-                    
-                    # Si hay muchos resultados, buscar por rangos
-                    if exploratory_count >= 100 and total_api_calls < 10:
-                        range_size = 2 if exploratory_count >= 200 else 3
-                        date_ranges = []
-                        current_start = start_year
-                        
-                        while current_start <= current_year and len(date_ranges) < 6:
-                            range_end = min(current_start + range_size - 1, current_year)
-                            date_ranges.append((current_start, range_end))
-                            current_start = range_end + 1
-                        
-                        # Buscar por rangos con límite de API calls
-                        for start_date, end_date in date_ranges:
-                            if total_api_calls >= 10:
-                                break
-                                
-                            try:
-                                date_query = f"{clean_query} after:{start_date}-01-01 before:{end_date}-12-31"
-                                response = requests.get(
-                                    self.SERP_API_BASE_URL,
-                                    params={**base_params, "q": date_query, "start": 0}
-                                )
-                                response.raise_for_status()
-                                data = response.json()
-                                total_api_calls += 1
-                                
-                                if "news_results" in data:
-                                    for item in data["news_results"]:
-                                        if self._is_valid_result(item):
-                                            processed = self._process_news_item(item, search_terms)
-                                            if processed:
-                                                all_results.append(processed)
-                                
-                                time.sleep(0.1)  # Rate limiting
-                                
-                            except Exception as e:
-                                print(f"Error en rango {start_date}-{end_date}: {str(e)}")
-                                continue
-                
-            else:
-                # Estrategia directa para consultas complejas
-                date_ranges = [
-                    (start_year, start_year + 3),
-                    (start_year + 4, start_year + 7),
-                    (start_year + 8, current_year)
-                ]
-                
-                for start_date, end_date in date_ranges:
-                    if total_api_calls >= 6:
-                        break
-                        
-                    try:
-                        date_query = f"{clean_query} after:{start_date}-01-01 before:{end_date}-12-31"
-                        response = requests.get(
-                            self.SERP_API_BASE_URL,
-                            params={**base_params, "q": date_query, "start": 0}
-                        )
-                        response.raise_for_status()
-                        data = response.json()
-                        total_api_calls += 1
-                        
-                        if "news_results" in data:
-                            for item in data["news_results"]:
-                                if self._is_valid_result(item):
-                                    processed = self._process_news_item(item, search_terms)
-                                    if processed:
-                                        all_results.append(processed)
-                        
-                        time.sleep(0.1)
-                        
-                    except Exception as e:
-                        print(f"Error en rango complejo: {str(e)}")
-                        continue
-            
-            # Eliminar duplicados
-            unique_results = self._remove_duplicates(all_results)
-            print(f"Total API calls: {total_api_calls}, Unique results: {len(unique_results)}")
+            # Eliminar duplicados (en un hilo: el MinHash es sobre todo NumPy)
+            with STAGE_SECONDS.time(stage="dedup"):
+                unique_results = await asyncio.to_thread(self._remove_duplicates, all_results)
+            DUPLICATES_REMOVED.inc(len(all_results) - len(unique_results))
+            logger.info("Búsqueda completada", extra={"api_calls": len(pages), "unique_results": len(unique_results)})
             
             return True, unique_results
             
+        except SearchError as e:
+            logger.warning("Búsqueda fallida", extra={"error": str(e)})
+            return False, str(e)
         except Exception as e:
-            print(f"Error en búsqueda: {str(e)}")
+            logger.exception("Error en búsqueda")
             return False, str(e)
+        
+        finally:
+            _upstream_calls.reset(token)
+            API_CALLS_PER_ANALYSIS.observe(upstream_calls[0])
+            if search_metrics is not None:
+                search_metrics.setdefault('search', {})['upstream_calls'] = upstream_calls[0]
+
+    async def iter_search_pages(self, query: str, serp_api_key: str, search_metrics: Optional[Dict[str, Any]] = None, since_year: Optional[int] = None, allow_partial: bool = True) -> AsyncIterator[Tuple[Tuple[int, ...], Tuple[int, int], List[Dict[str, Any]]]]:
+        """Produce (orden, rango de años, resultados crudos) a medida que llega cada consulta.
+        
+        Las consultas salen del planificador: los rangos que vuelven saturados se bisecan o,
+        si ya no se pueden dividir, se paginan; todo se consulta apenas se conoce. El orden
+        (inicio, -fin, start) es determinista y pone cada rango antes que sus mitades y
+        que sus páginas siguientes. Si ningún rango responde (o alguno falla, con
+        allow_partial=False) se lanza SearchError con el último error, para no confundir
+        una caída de SERPAPI con una búsqueda sin resultados.
+        """
+        current_year = datetime.now().year
+        start_year = since_year if since_year is not None else current_year - 12
+        
+        clean_query = self._clean_query(query)
+        base_params = self._base_params(serp_api_key)
+        plan = self.query_planner.plan(clean_query, start_year, current_year)
+        
+        last_error: Optional[Exception] = None
+        
+        async def fetch(date_range: Tuple[int, int], start: int):
+            try:
+                items, error = await self._fetch_date_range(clean_query, base_params, *date_range, start=start), None
+            except Exception as e:
+                logger.warning("Error en rango", extra={"range": list(date_range), "start": start, "error": str(e)})
+                items, error = None, e
+            return (date_range[0], -date_range[1], start), date_range, start, items, error
+        
+        pending = {asyncio.ensure_future(fetch(date_range, 0)) for date_range in plan.initial_ranges}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda task: task.result()[0]):
+                    order, date_range, start, items, error = task.result()
+                    if error is not None:
+                        last_error = error
+                    next_requests = plan.advance(
+                        date_range, start, len(items) if items is not None else None,
+                        retryable=error is not None and is_retryable_error(error)
+                    )
+                    pending.update(asyncio.ensure_future(fetch(*request)) for request in next_requests)
+                    if items is not None:
+                        yield order, date_range, items
+            
+            if plan.all_failed or (plan.failed and not allow_partial):
+                # El mensaje de httpx incluye la URL: la API key no debe llegar al cliente
+                raise SearchError(re.sub(r'api_key=[^&\s\']+', 'api_key=***', str(last_error)))
+        finally:
+            for task in pending:
+                task.cancel()
+            self.query_planner.finish(plan)
+            if search_metrics is not None:
+                search_metrics.setdefault('search', {}).update(plan.summary())
+                search_metrics['pagination'] = plan.pagination_summary()
+            logger.debug("Plan de consultas", extra={**plan.summary(), **plan.pagination_summary()})
+
+    async def fetch_news_since(self, query: str, serp_api_key: str, search_terms: List[SearchTerm], since_year: Optional[int], search_metrics: Optional[Dict[str, Any]] = None) -> List[NewsRecord]:
+        """Consulta el periodo desde since_year (None = periodo completo) sin deduplicar, para un corpus persistido.
+        
+        Cualquier rango o página fallida lanza SearchError: un corpus persistido no debe
+        avanzar su watermark sobre un hueco. La deduplicación contra lo guardado la hace
+        quien llama (_fold_duplicates).
+        """
+        upstream_calls = [0]
+        token = _upstream_calls.set(upstream_calls)
+        try:
+            pages = [page async for page in self.iter_search_pages(query, serp_api_key, search_metrics, since_year=since_year, allow_partial=False)]
+        finally:
+            _upstream_calls.reset(token)
+            API_CALLS_PER_ANALYSIS.observe(upstream_calls[0])
+            if search_metrics is not None:
+                search_metrics.setdefault('search', {})['upstream_calls'] = upstream_calls[0]
+        pages.sort(key=lambda page: page[0])
+        return await self.process_news_batch([item for _, _, items in pages for item in items], search_terms)
+
+    @staticmethod
+    def _clean_query(query: str) -> str:
+        """Quita los filtros de fecha; los rangos se añaden por consulta"""
+        return re.sub(r'\s*(?:after|before):\d{4}(?:-\d{2}-\d{2})?\s*', '', query).strip()
+
+    @staticmethod
+    def _base_params(serp_api_key: str) -> Dict[str, Any]:
+        return {
+            "api_key": serp_api_key,
+            "tbm": "nws",
+            "num": NewsAnalyzer.PAGE_SIZE,
+            "safe": "off",
+            "gl": "us",
+            "hl": "en",
+            "filter": "0"
+        }
+
+    async def _fetch_date_range(self, clean_query: str, base_params: Dict[str, Any], start_date: int, end_date: int, start: int = 0) -> List[Dict[str, Any]]:
+        """Consulta una página de un rango de años (los errores se propagan al planificador)"""
+        data = await self._cached_search(clean_query, base_params, start_date, end_date, start)
+        return data.get("news_results", [])
+
+    async def _cached_search(self, clean_query: str, base_params: Dict[str, Any], start_date: int, end_date: int, start: int = 0) -> Dict[str, Any]:
+        """Consulta SERPAPI para un rango de años (página desde start) pasando primero por la caché"""
+        # La primera página conserva la clave de siempre; las siguientes incluyen el desplazamiento
+        page_params = {**base_params, "start": start} if start else base_params
+        cache_key = self.query_cache.make_key(clean_query, start_date, end_date, page_params)
+        cached = await asyncio.to_thread(self.query_cache.get, cache_key)
+        if cached is not None:
+            SERP_CACHE_LOOKUPS.inc(result="hit")
+            return cached
+        SERP_CACHE_LOOKUPS.inc(result="miss")
+        
+        upstream_calls = _upstream_calls.get()
+        if upstream_calls is not None:
+            upstream_calls[0] += 1
+        
+        date_query = f"{clean_query} after:{start_date}-01-01 before:{end_date}-12-31"
+        with STAGE_SECONDS.time(stage="serp_call"):
+            data = await self.serp_client.search({**base_params, "q": date_query, "start": start})
+        await asyncio.to_thread(self.query_cache.set, cache_key, data, self.query_cache.ttl_for_range(end_date))
+        return data
 
     def _is_valid_result(self, item: Dict[str, Any]) -> bool:
         """Valida si un resultado debe ser incluido"""
@@ -481,140 +697,289 @@ class NewsAnalyzer:
         except Exception:
             return False
 
-    def _process_news_item(self, item: Dict[str, Any], search_terms: List[SearchTerm]) -> Optional[NewsResult]:
+    def _process_news_item(self, item: Dict[str, Any], search_terms: List[SearchTerm]) -> Optional[NewsRecord]:
         """Procesa un resultado de noticia"""
-        try:
-            text = f"{item.get('title', '')} {item.get('snippet', '')}"
+        processed = self._process_news_batch([item], search_terms, validate=False)
+        return processed[0] if processed else None
+
+    async def process_news_batch(self, items: List[Dict[str, Any]], search_terms: List[SearchTerm]) -> List[NewsRecord]:
+        """Como _process_news_batch, pero el análisis de texto corre en el executor y no bloquea el event loop"""
+        with STAGE_SECONDS.time(stage="process_items"):
+            # Todos los lotes comparten el mismo instante para resolver fechas relativas
+            rows = await self.executor.map_batches(_analyze_rows_worker, items, search_terms, True, datetime.now(), current_log_context())
+            ITEMS_PROCESSED.inc(len(items))
+            ITEMS_DROPPED.inc(len(items) - len(rows))
             
-            processed = NewsResult(
-                title=str(item.get('title', '')),
-                link=str(item.get('link', '')),
-                snippet=str(item.get('snippet', '')),
-                source=str(item.get('source', '')),
-                date=str(item.get('date', '')),
-                year=self._extract_year_from_date(item.get('date', '')),
-                sentiment=self._calculate_sentiment(text),
-                country=self.result_analyzer.extract_country(text),
-                keywords=self.result_analyzer.extract_keywords(text, search_terms)[:5]
+            if len(rows) <= self.executor.inline_max:
+                return self._rows_to_records(rows)
+            return await asyncio.to_thread(self._rows_to_records, rows)
+
+    def _process_news_batch(self, items: List[Dict[str, Any]], search_terms: List[SearchTerm], validate: bool = True) -> List[NewsRecord]:
+        """Procesa en una sola pasada todos los resultados crudos de una búsqueda"""
+        return self._rows_to_records(self._analyze_rows(items, search_terms, validate))
+
+    def _analyze_rows(self, items: List[Dict[str, Any]], search_terms: List[SearchTerm], validate: bool = True, now: Optional[datetime] = None) -> List[tuple]:
+        """Análisis de texto de un lote; devuelve tuplas simples (baratas de enviar entre procesos)"""
+        analyzer = self.result_analyzer
+        search_words = analyzer.search_words(search_terms)
+        # Un solo reloj por lote: las fechas relativas ("3 days ago") se resuelven contra el mismo instante
+        clock = self.date_normalizer.clock(now)
+        rows = []
+        texts = []
+        tokens = []
+        
+        for item in items:
+            if validate and not self._is_valid_result(item):
+                continue
+            try:
+                title = str(item.get('title', ''))
+                snippet = str(item.get('snippet', ''))
+                date = item.get('date', '')
+                text = f"{item.get('title', '')} {item.get('snippet', '')}"
+                text_lower = text.lower()
+                words = tokenize(text_lower)
+                
+                published = clock.parse(date)
+                
+                rows.append((
+                    title,
+                    str(item.get('link', '')),
+                    snippet,
+                    str(item.get('source', '')),
+                    str(date),
+                    published,
+                    analyzer._country_from_words(words),
+                    analyzer._keywords_from_lower(text_lower, search_words)[:5]
+                ))
+                texts.append(text)
+                tokens.append(words)
+            except Exception as e:
+                # Uno por ítem: se muestrea para no inundar la salida con lotes malformados
+                log_sampled(logger, logging.WARNING, "process_item", "Error procesando noticia", error=str(e))
+        
+        # Sentimiento en lote: los textos repetidos (notas sindicadas) se evalúan una vez
+        sentiments = self.sentiment_engine.score_batch(texts, tokens)
+        return [row[:6] + (sentiment,) + row[6:] for row, sentiment in zip(rows, sentiments)]
+
+    @staticmethod
+    def _rows_to_records(rows: List[tuple]) -> List[NewsRecord]:
+        # Registros compactos; los modelos de la API se crean solo al responder
+        return [
+            NewsRecord(
+                title, link, snippet, source, date, published.year, sentiment,
+                country=country, keywords=keywords, published=published
             )
-            
-            return processed
-            
-        except Exception as e:
-            print(f"Error procesando noticia: {str(e)}")
-            return None
+            for title, link, snippet, source, date, published, sentiment, country, keywords in rows
+        ]
 
     def _extract_year_from_date(self, date_str: str) -> int:
         """Extrae el año de una fecha"""
-        try:
-            if not date_str:
-                return datetime.now().year
-            
-            # Intentar diferentes formatos
-            for fmt in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%b %d, %Y', '%Y']:
-                try:
-                    return datetime.strptime(date_str.split('T')[0], fmt).year
-                except ValueError:
-                    continue
-            
-            # Buscar año en el string
-            match = re.search(r'20\d{2}|19\d{2}', date_str)
-            if match:
-                year = int(match.group())
-                if 1970 <= year <= datetime.now().year:
-                    return year
-            
-            return datetime.now().year
-            
-        except Exception:
-            return datetime.now().year
+        return self.date_normalizer.clock().year(date_str)
 
-    def _remove_duplicates(self, results: List[NewsResult]) -> List[NewsResult]:
-        """Elimina duplicados basándose en URL y título"""
-        unique_results = []
-        seen_urls = set()
-        seen_titles = set()
+    def _assign_originals(self, stored: List[NewsRecord], results: List[NewsRecord]) -> List[int]:
+        """Para cada nota de stored + results, el índice de su nota original (ella misma si es original).
         
-        for result in results:
+        Duplicados exactos (misma URL o título) y casi-duplicados (notas sindicadas); la primera
+        aparición es la original y las notas de stored siempre lo son.
+        """
+        corpus = [*stored, *results]
+        originals = list(range(len(corpus)))
+        seen_urls = {}
+        seen_titles = {}
+        candidates = []
+        
+        # Duplicados exactos: misma URL o mismo título
+        for index, result in enumerate(corpus):
             url = result.link
             title = result.title.lower().strip()
             
-            if url not in seen_urls and title not in seen_titles:
-                seen_urls.add(url)
-                seen_titles.add(title)
-                unique_results.append(result)
+            original = seen_urls.get(url, seen_titles.get(title))
+            if original is None or index < len(stored):
+                seen_urls.setdefault(url, index)
+                seen_titles.setdefault(title, index)
+                candidates.append(index)
+            else:
+                originals[index] = original
         
-        return unique_results
+        # Casi-duplicados: cada grupo conserva su primera nota como representante
+        if self.near_duplicates is not None and len(candidates) > 1:
+            assignments = self.near_duplicates.cluster([
+                f"{corpus[index].title} {corpus[index].snippet}" for index in candidates
+            ])
+            for position, representative in enumerate(assignments):
+                if representative != position and candidates[position] >= len(stored):
+                    originals[candidates[position]] = candidates[representative]
+        
+        # Una copia exacta de una nota que resultó casi-duplicada apunta a la original del grupo
+        for index in range(len(stored), len(corpus)):
+            originals[index] = originals[originals[index]]
+        return originals
+
+    def _remove_duplicates(self, results: List[NewsRecord]) -> List[NewsRecord]:
+        """Elimina duplicados por URL, título y casi-duplicados (notas sindicadas)"""
+        originals = self._assign_originals([], results)
+        copies = [0] * len(results)
+        for result, original in zip(results, originals):
+            copies[original] += result.syndication_count
+        
+        return [
+            result if copies[index] == result.syndication_count else result.with_syndication_count(copies[index])
+            for index, result in enumerate(results) if originals[index] == index
+        ]
 
-    def analyze_hype_cycle(self, news_results: List[NewsResult]) -> Optional[HypeCycleAnalysis]:
+    def _fold_duplicates(self, stored: List[NewsRecord], fetched: List[NewsRecord]) -> Tuple[List[NewsRecord], List[Tuple[str, NewsRecord]]]:
+        """Separa un lote nuevo frente a un corpus guardado: (notas nuevas, [(enlace de la original, copia)]).
+        
+        Misma regla que _remove_duplicates, pero las copias se devuelven en vez de descartarse
+        para guardarlas como alias de su original (TopicStore.merge).
+        """
+        originals = self._assign_originals(stored, fetched)
+        corpus = [*stored, *fetched]
+        new_results = []
+        copies = []
+        for index, result in enumerate(fetched, start=len(stored)):
+            if originals[index] == index:
+                new_results.append(result)
+            else:
+                copies.append((corpus[originals[index]].link, result))
+        return new_results, copies
+
+    @STAGE_SECONDS.time(stage="analyze")
+    def analyze_hype_cycle(self, news_results: List[NewsRecord]) -> Optional[HypeCycleAnalysis]:
         """Análisis completo del Hype Cycle"""
+        import numpy as np
+
         try:
             if len(news_results) < 3:
                 return None
             
-            # Crear datos anuales
-            yearly_data = {}
-            for result in news_results:
-                year = result.year
-                if year not in yearly_data:
-                    yearly_data[year] = {'mentions': 0, 'sentiments': []}
-                
-                yearly_data[year]['mentions'] += 1
-                yearly_data[year]['sentiments'].append(result.sentiment)
+            # Representación columnar: un arreglo por campo
+            count = len(news_results)
+            years = np.fromiter((result.year for result in news_results), dtype=np.int64, count=count)
+            sentiments = np.fromiter((result.sentiment for result in news_results), dtype=np.float64, count=count)
             
-            # Calcular estadísticas anuales
-            yearly_stats = []
-            for year in sorted(yearly_data.keys()):
-                data = yearly_data[year]
-                sentiment_mean = np.mean(data['sentiments']) if data['sentiments'] else 0
-                sentiment_std = np.std(data['sentiments']) if len(data['sentiments']) > 1 else 0
-                
-                yearly_stats.append({
-                    'year': year,
-                    'mention_count': data['mentions'],
-                    'sentiment_mean': sentiment_mean,
-                    'sentiment_std': sentiment_std
-                })
+            return self._analysis_from_yearly(
+                self._group_by_year(years, sentiments),
+                total_mentions=count,
+                avg_sentiment=float(sentiments.mean())
+            )
             
-            # Calcular cambios
-            for i in range(1, len(yearly_stats)):
-                prev_mentions = yearly_stats[i-1]['mention_count']
-                current_mentions = yearly_stats[i]['mention_count']
-                
-                if prev_mentions > 0:
-                    yearly_stats[i]['mention_change'] = (current_mentions - prev_mentions) / prev_mentions
-                else:
-                    yearly_stats[i]['mention_change'] = 0
-                
-                yearly_stats[i]['sentiment_change'] = (
-                    yearly_stats[i]['sentiment_mean'] - yearly_stats[i-1]['sentiment_mean']
-                )
+        except Exception as e:
+            logger.exception("Error en análisis del Hype Cycle")
+            return None
+
+    @STAGE_SECONDS.time(stage="analyze")
+    def analyze_yearly_totals(self, yearly_totals: Dict[int, Tuple[int, float, float]]) -> Optional[HypeCycleAnalysis]:
+        """Análisis a partir de agregados anuales (menciones, suma y suma de cuadrados del sentimiento)"""
+        import numpy as np
+
+        try:
+            total_mentions = sum(count for count, _, _ in yearly_totals.values())
+            if total_mentions < 3:
+                return None
             
-            # Detectar puntos de inflexión
-            inflection_points = self._analyze_gartner_points(yearly_stats)
+            years = np.array(sorted(yearly_totals), dtype=np.int64)
+            totals = np.array([yearly_totals[year] for year in years.tolist()], dtype=np.float64)
+            counts, sentiment_sums, sentiment_sq_sums = totals[:, 0], totals[:, 1], totals[:, 2]
             
-            # Determinar fase actual
-            phase, confidence = self._determine_current_phase(yearly_stats, inflection_points)
+            means = sentiment_sums / counts
+            variances = np.where(counts > 1, sentiment_sq_sums / counts - means ** 2, 0.0)
+            
+            yearly = {
+                'year': years,
+                'mention_count': counts.astype(np.int64),
+                'sentiment_mean': means,
+                'sentiment_std': np.sqrt(np.maximum(variances, 0.0))
+            }
             
-            return HypeCycleAnalysis(
-                phase=phase,
-                confidence=confidence,
-                yearly_stats=yearly_stats,
-                inflection_points=inflection_points,
-                metrics={
-                    'total_mentions': len(news_results),
-                    'years_analyzed': len(yearly_stats),
-                    'peak_mentions': max([stat['mention_count'] for stat in yearly_stats]),
-                    'avg_sentiment': np.mean([result.sentiment for result in news_results])
-                }
+            return self._analysis_from_yearly(
+                yearly,
+                total_mentions=total_mentions,
+                avg_sentiment=float(sentiment_sums.sum() / total_mentions)
             )
             
         except Exception as e:
-            print(f"Error en análisis del Hype Cycle: {str(e)}")
+            logger.exception("Error en análisis del Hype Cycle")
             return None
 
-    def _analyze_gartner_points(self, yearly_stats: List[Dict[str, Any]]) -> Dict[str, Optional[InflectionPoint]]:
+    @staticmethod
+    def _group_by_year(years: "np.ndarray", sentiments: "np.ndarray") -> Dict[str, "np.ndarray"]:
+        """Agrupa por año con np.unique/np.bincount: menciones, media y desviación del sentimiento"""
+        import numpy as np
+
+        unique_years, inverse, counts = np.unique(years, return_inverse=True, return_counts=True)
+        means = np.bincount(inverse, weights=sentiments) / counts
+        deviations = sentiments - means[inverse]
+        stds = np.sqrt(np.bincount(inverse, weights=deviations * deviations) / counts)
+        
+        return {
+            'year': unique_years,
+            'mention_count': counts,
+            'sentiment_mean': means,
+            'sentiment_std': np.where(counts > 1, stds, 0.0)
+        }
+
+    def _analysis_from_yearly(self, yearly: Dict[str, "np.ndarray"], total_mentions: int, avg_sentiment: float) -> HypeCycleAnalysis:
+        """Cambios interanuales, puntos de inflexión y fase a partir de las series anuales"""
+        import numpy as np
+
+        # Calcular cambios (el primer año no tiene año previo)
+        counts = yearly['mention_count']
+        previous = counts[:-1].astype(np.float64)
+        mention_change = np.zeros(len(counts))
+        np.divide(counts[1:] - previous, previous, out=mention_change[1:], where=previous > 0)
+        yearly['mention_change'] = mention_change
+        yearly['sentiment_change'] = np.concatenate(([0.0], np.diff(yearly['sentiment_mean'])))
+        
+        # Detectar puntos de inflexión
+        inflection_points = self._analyze_gartner_points(yearly)
+        
+        # Determinar fase actual
+        phase, confidence = self._determine_current_phase(yearly, inflection_points)
+        
+        return HypeCycleAnalysis(
+            phase=phase,
+            confidence=confidence,
+            yearly_stats=self._yearly_stats_records(yearly),
+            inflection_points=inflection_points,
+            metrics={
+                'total_mentions': total_mentions,
+                'years_analyzed': len(counts),
+                'peak_mentions': int(counts.max()),
+                'avg_sentiment': avg_sentiment
+            }
+        )
+
+    @staticmethod
+    def _yearly_stats_records(yearly: Dict[str, "np.ndarray"]) -> List[Dict[str, Any]]:
+        """Convierte las series anuales al formato yearly_stats de la API"""
+        columns = {key: values.tolist() for key, values in yearly.items()}
+        yearly_stats = []
+        for i, year in enumerate(columns['year']):
+            stat = {
+                'year': year,
+                'mention_count': columns['mention_count'][i],
+                'sentiment_mean': columns['sentiment_mean'][i],
+                'sentiment_std': columns['sentiment_std'][i]
+            }
+            if i > 0:
+                stat['mention_change'] = columns['mention_change'][i]
+                stat['sentiment_change'] = columns['sentiment_change'][i]
+            yearly_stats.append(stat)
+        return yearly_stats
+
+    @staticmethod
+    def _inflection_point(yearly: Dict[str, "np.ndarray"], index: int) -> InflectionPoint:
+        return InflectionPoint(
+            year=int(yearly['year'][index]),
+            mentions=int(yearly['mention_count'][index]),
+            sentiment=float(yearly['sentiment_mean'][index])
+        )
+
+    def _analyze_gartner_points(self, yearly: Dict[str, "np.ndarray"]) -> Dict[str, Optional[InflectionPoint]]:
         """Detecta puntos de inflexión del Hype Cycle"""
+        import numpy as np
+
         try:
             inflection_points = {
                 'innovation_trigger': None,
@@ -622,55 +987,39 @@ class NewsAnalyzer:
                 'trough': None
             }
             
-            if not yearly_stats:
+            mentions = yearly['mention_count']
+            if not len(mentions):
                 return inflection_points
             
             # Encontrar punto de innovación (primer año con menciones significativas)
-            mentions = [stat['mention_count'] for stat in yearly_stats]
-            threshold = np.mean(mentions) * 0.1
-            
-            for stat in yearly_stats:
-                if stat['mention_count'] >= threshold:
-                    inflection_points['innovation_trigger'] = InflectionPoint(
-                        year=stat['year'],
-                        mentions=stat['mention_count'],
-                        sentiment=stat['sentiment_mean']
-                    )
-                    break
+            significant = mentions >= mentions.mean() * 0.1
+            if significant.any():
+                inflection_points['innovation_trigger'] = self._inflection_point(yearly, int(np.argmax(significant)))
             
-            # Encontrar pico (máximo de menciones)
-            max_mentions_stat = max(yearly_stats, key=lambda x: x['mention_count'])
-            inflection_points['peak'] = InflectionPoint(
-                year=max_mentions_stat['year'],
-                mentions=max_mentions_stat['mention_count'],
-                sentiment=max_mentions_stat['sentiment_mean']
-            )
+            # Encontrar pico (máximo de menciones; el primero si hay empate)
+            peak_index = int(np.argmax(mentions))
+            inflection_points['peak'] = self._inflection_point(yearly, peak_index)
             
             # Encontrar valle (mínimo después del pico)
-            peak_year = max_mentions_stat['year']
-            post_peak_stats = [stat for stat in yearly_stats if stat['year'] > peak_year]
-            
-            if post_peak_stats:
-                min_mentions_stat = min(post_peak_stats, key=lambda x: x['mention_count'])
-                inflection_points['trough'] = InflectionPoint(
-                    year=min_mentions_stat['year'],
-                    mentions=min_mentions_stat['mention_count'],
-                    sentiment=min_mentions_stat['sentiment_mean']
-                )
+            if peak_index + 1 < len(mentions):
+                trough_index = peak_index + 1 + int(np.argmin(mentions[peak_index + 1:]))
+                inflection_points['trough'] = self._inflection_point(yearly, trough_index)
             
             return inflection_points
             
         except Exception as e:
-            print(f"Error analizando puntos de inflexión: {str(e)}")
+            logger.exception("Error analizando puntos de inflexión")
             return {
                 'innovation_trigger': None,
                 'peak': None,
                 'trough': None
             }
 
-    def _determine_current_phase(self, yearly_stats: List[Dict[str, Any]], inflection_points: Dict[str, Optional[InflectionPoint]]) -> tuple[str, float]:
+    def _determine_current_phase(self, yearly: Dict[str, "np.ndarray"], inflection_points: Dict[str, Optional[InflectionPoint]]) -> tuple[str, float]:
         """Determina la fase actual del Hype Cycle"""
         current_year = datetime.now().year
+        years = yearly['year']
+        mention_change = yearly['mention_change']
         
         # Verificar puntos de inflexión
         innovation_point = inflection_points.get('innovation_trigger')
@@ -696,9 +1045,9 @@ class NewsAnalyzer:
                         return "Trough of Disillusionment", 0.85
                     elif 1 < years_since_trough <= 4:
                         # Verificar tendencia de recuperación
-                        recent_stats = [stat for stat in yearly_stats if stat['year'] >= trough_point.year]
-                        if len(recent_stats) > 1:
-                            recent_trend = np.mean([stat.get('mention_change', 0) for stat in recent_stats[-2:]])
+                        recent_changes = mention_change[years >= trough_point.year]
+                        if len(recent_changes) > 1:
+                            recent_trend = recent_changes[-2:].mean()
                             if recent_trend > 0:
                                 return "Slope of Enlightenment", 0.8
                         return "Trough of Disillusionment", 0.75
@@ -714,21 +1063,30 @@ class NewsAnalyzer:
                     return "Innovation Trigger", 0.6
         
         # Análisis de respaldo si no hay puntos claros
-        if yearly_stats:
-            latest_stat = yearly_stats[-1]
-            recent_growth = yearly_stats[-1].get('mention_change', 0) if len(yearly_stats) > 1 else 0
+        if len(years):
+            recent_growth = mention_change[-1] if len(years) > 1 else 0
             
-            if recent_growth > 0.3 and latest_stat['sentiment_mean'] > 0.1:
+            if recent_growth > 0.3 and yearly['sentiment_mean'][-1] > 0.1:
                 return "Innovation Trigger", 0.6
             elif recent_growth < -0.3:
                 return "Trough of Disillusionment", 0.55
         
         return "Pre-Innovation Trigger", 0.5
 
-# Instancias globales
-news_analyzer = NewsAnalyzer()
+# Instancias globales; los analizadores se construyen en el arranque (ver lifespan)
+_news_analyzer: Optional[NewsAnalyzer] = None
 query_builder = QueryBuilder()
+single_flight = SingleFlight()
+result_store = ResultStore.from_env()
+
+def get_news_analyzer() -> NewsAnalyzer:
+    """Analizador compartido; fuera de la app (procesos del pool, scripts) se construye al primer uso"""
+    global _news_analyzer
+    if _news_analyzer is None:
+        _news_analyzer = NewsAnalyzer()
+    return _news_analyzer
 
+@STAGE_SECONDS.time(stage="insights")
 def generate_insights(analysis: HypeCycleAnalysis) -> List[str]:
     """Genera insights basados en el análisis"""
     insights = []
@@ -798,76 +1156,453 @@ def generate_insights(analysis: HypeCycleAnalysis) -> List[str]:
 
 # Endpoints principales
 @app.post("/api/hypecycle/analyze", response_model=HypeCycleResponse)
-async def analyze_hypecycle(request: HypeCycleRequest):
+async def analyze_hypecycle(request: HypeCycleRequest, http_request: Request, fields: Optional[str] = None, page_size: Optional[int] = None):
     """Endpoint principal para análisis del Hype Cycle"""
+    try:
+        key = canonical_request_key(request)
+        # Temas del catálogo: respuesta precalculada mientras esté fresca
+        snapshot = snapshot_manager.fresh(key)
+        if snapshot is not None:
+            return serve_snapshot(snapshot, fields, page_size, http_request.headers.get("accept-encoding", ""))
+        
+        # Solicitudes idénticas simultáneas comparten una sola búsqueda y análisis
+        response = await single_flight.do(key, lambda: compute_hypecycle(request))
+        return shape_response(response, fields, page_size)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error inesperado")
+        raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
+
+async def compute_hypecycle(request: HypeCycleRequest, on_page: Optional[Callable[[int, Tuple[int, int]], None]] = None, results_id: Optional[str] = None) -> HypeCycleResponse:
+    """Búsqueda + análisis completo; los errores se reportan como HTTPException"""
+    try:
+        with bind_log_context(analysis_id=new_id()):
+            response = await _compute_hypecycle(request, on_page, results_id)
+    except Exception:
+        ANALYSES.inc(outcome="error")
+        raise
+    ANALYSES.inc(outcome="ok")
+    return response
+
+async def _compute_hypecycle(request: HypeCycleRequest, on_page: Optional[Callable[[int, Tuple[int, int]], None]], results_id: Optional[str]) -> HypeCycleResponse:
+    # Validar API key y términos, y construir query
+    serp_api_key, google_query, valid_terms = _validated_search(request)
+    news_analyzer = get_news_analyzer()
+    logger.info("Búsqueda iniciada", extra={"query": google_query})
+    
+    # Realizar búsqueda
+    search_metrics: Dict[str, Any] = {}
+    success, results = await news_analyzer.perform_news_search(google_query, serp_api_key, valid_terms, on_page=on_page, search_metrics=search_metrics)
+    
+    if not success:
+        raise HTTPException(status_code=400, detail=f"Error en búsqueda: {results}")
+    
+    if not results:
+        raise HTTPException(status_code=404, detail="No se encontraron resultados")
+    
+    logger.info("Resultados encontrados", extra={"results": len(results)})
+    
+    # Analizar Hype Cycle
+    analysis = news_analyzer.analyze_hype_cycle(results)
+    
+    if not analysis:
+        raise HTTPException(status_code=400, detail="No se pudieron analizar los resultados")
+    
+    # Plan de consultas y paginación de SERPAPI (cobertura de los rangos saturados)
+    analysis.metrics.update(search_metrics)
+    return build_hypecycle_response(results, analysis, results_id)
+
+def canonical_request_key(request: HypeCycleRequest) -> str:
+    """Clave estable de una solicitud: términos normalizados, operadores, coincidencia exacta y año"""
+    terms = [
+        (" ".join(term.value.lower().split()), term.operator.upper(), term.exact_match)
+        for term in request.search_terms if term.value.strip()
+    ]
+    # El operador del último término no se usa en la query
+    if terms:
+        value, _, exact_match = terms[-1]
+        terms[-1] = (value, "", exact_match)
+    
+    # Con un único operador conmutativo (AND u OR) el orden de los términos no cambia la consulta;
+    # con NOT sí: "ai NOT crypto" no es "crypto NOT ai"
+    operators = {operator for _, operator, _ in terms[:-1]}
+    if operators <= {"AND"} or operators == {"OR"}:
+        operator = operators.pop() if operators else ""
+        terms = sorted((value, operator, exact_match) for value, _, exact_match in terms)
+    
+    raw_key = json.dumps({"terms": terms, "min_year": request.min_year}, sort_keys=True)
+    return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+def build_chart_data(analysis: HypeCycleAnalysis) -> Dict[str, Any]:
+    """Prepara los datos del gráfico a partir del análisis"""
+    return {
+        "yearly_mentions": {str(stat['year']): stat['mention_count'] for stat in analysis.yearly_stats},
+        "yearly_sentiment": {str(stat['year']): stat['sentiment_mean'] for stat in analysis.yearly_stats},
+        "phase_position": get_phase_position(analysis.phase),
+        "total_mentions": analysis.metrics['total_mentions'],
+        "inflection_points": {
+            key: {
+                "year": point.year,
+                "mentions": point.mentions,
+                "sentiment": point.sentiment
+            } if point else None
+            for key, point in analysis.inflection_points.items()
+        }
+    }
+
+def build_hypecycle_response(results: List[NewsRecord], analysis: HypeCycleAnalysis, results_id: Optional[str] = None) -> HypeCycleResponse:
+    """Arma la respuesta completa: insights, datos del gráfico y resultados (results_id propio si ya se paginan en otro lado)"""
+    return HypeCycleResponse(
+        success=True,
+        phase=analysis.phase,
+        confidence=analysis.confidence,
+        total_mentions=analysis.metrics['total_mentions'],
+        insights=generate_insights(analysis),
+        chart_data=build_chart_data(analysis),
+        news_results=to_news_results(results),
+        analysis=analysis,
+        # Los resultados quedan guardados para paginarlos con /api/hypecycle/results
+        results_id=results_id or result_store.put(results),
+        total_results=len(results)
+    )
+
+# Campos que se pueden pedir con ?fields=; la paginación acompaña a news_results
+RESPONSE_FIELDS = set(HypeCycleResponse.model_fields)
+PAGINATION_FIELDS = {'results_id', 'total_results', 'next_cursor'}
+MAX_PAGE_SIZE = 1000
+
+def shape_response(response: HypeCycleResponse, fields: Optional[str], page_size: Optional[int]) -> Response:
+    """Aplica proyección de campos y primera página de news_results sin modificar la respuesta compartida, y serializa"""
+    if page_size is not None:
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"page_size debe estar entre 1 y {MAX_PAGE_SIZE}")
+        has_more = len(response.news_results) > page_size
+        response = response.model_copy(update={
+            'news_results': response.news_results[:page_size],
+            'next_cursor': encode_cursor(response.results_id, page_size) if has_more else None
+        })
+    
+    requested = None
+    if fields is not None:
+        requested = {field.strip() for field in fields.split(',') if field.strip()}
+        unknown = requested - RESPONSE_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Campos desconocidos: {', '.join(sorted(unknown))}")
+        if 'news_results' in requested:
+            requested |= PAGINATION_FIELDS
+    
+    # Serialización directa con pydantic (sin la revalidación de response_model de FastAPI)
+    with STAGE_SECONDS.time(stage="serialize"):
+        content = response.model_dump_json(include=requested)
+    return Response(content=content, media_type="application/json")
+
+def serve_snapshot(snapshot: Snapshot, fields: Optional[str], page_size: Optional[int], accept_encoding: str) -> Response:
+    """Respuesta de un snapshot: el cuerpo ya comprimido tal cual o, con fields/page_size, proyectado como siempre"""
+    headers = {"Age": str(int(snapshot.age()))}
+    if fields is None and page_size is None:
+        if "gzip" in accept_encoding:
+            # Con Content-Encoding presente el middleware de GZip no vuelve a comprimir
+            return Response(content=snapshot.body, media_type="application/json", headers={
+                **headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"
+            })
+        return Response(content=snapshot.json_bytes(), media_type="application/json", headers=headers)
+    
+    response = shape_response(HypeCycleResponse.model_validate_json(snapshot.json_bytes()), fields, page_size)
+    response.headers.update(headers)
+    return response
+
+@app.get("/api/hypecycle/results", response_model=NewsResultsPage)
+async def get_news_results(cursor: str, limit: int = 100):
+    """Página siguiente de news_results a partir del cursor de una respuesta previa"""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+    
+    position = decode_cursor(cursor)
+    if position is None:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    results_id, offset = position
+    page = result_store.page(results_id, offset, limit) or snapshot_manager.page(results_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=410, detail="Los resultados expiraron; repite el análisis")
+    
+    records, next_offset, total = page
+    return NewsResultsPage(
+        news_results=to_news_results(records),
+        total_results=total,
+        next_cursor=encode_cursor(results_id, next_offset) if next_offset is not None else None
+    )
+
+def _validated_search(request: HypeCycleRequest) -> tuple[str, str, List[SearchTerm]]:
+    """Valida la API key y los términos; devuelve (api key, query, términos válidos)"""
     serp_api_key = os.getenv("SERP_API_KEY")
     
     if not serp_api_key:
-        raise HTTPException(status_code=500, detail="SERP_API_KEY no configurada")
+        # En modo replay (SERP_TRANSPORT=replay) se responde desde las grabaciones, sin key
+        if get_news_analyzer().serp_client.requires_api_key:
+            raise HTTPException(status_code=500, detail="SERP_API_KEY no configurada")
+        serp_api_key = "replay"
     
-    # Validar términos de búsqueda
     valid_terms = [term for term in request.search_terms if term.value.strip()]
     if not valid_terms:
         raise HTTPException(status_code=400, detail="Se requiere al menos un término de búsqueda válido")
     
-    try:
-        # Construir query
+    with STAGE_SECONDS.time(stage="query_build"):
         google_query = query_builder.build_google_query(valid_terms, request.min_year)
-        print(f"Searching for: {google_query}")
-        
-        # Realizar búsqueda
-        success, results = news_analyzer.perform_news_search(google_query, serp_api_key, valid_terms)
-        
-        if not success:
-            raise HTTPException(status_code=400, detail=f"Error en búsqueda: {results}")
-        
-        if not results:
-            raise HTTPException(status_code=404, detail="No se encontraron resultados")
-        
-        print(f"Found {len(results)} results")
-        
-        # Analizar Hype Cycle
-        analysis = news_analyzer.analyze_hype_cycle(results)
-        
-        if not analysis:
-            raise HTTPException(status_code=400, detail="No se pudieron analizar los resultados")
-        
-        # Generar insights
-        insights = generate_insights(analysis)
-        
-        # Preparar datos del gráfico
-        chart_data = {
-            "yearly_mentions": {str(stat['year']): stat['mention_count'] for stat in analysis.yearly_stats},
-            "yearly_sentiment": {str(stat['year']): stat['sentiment_mean'] for stat in analysis.yearly_stats},
-            "phase_position": get_phase_position(analysis.phase),
-            "total_mentions": analysis.metrics['total_mentions'],
-            "inflection_points": {
-                key: {
-                    "year": point.year,
-                    "mentions": point.mentions,
-                    "sentiment": point.sentiment
-                } if point else None
-                for key, point in analysis.inflection_points.items()
-            }
-        }
-        
-        return HypeCycleResponse(
-            success=True,
-            phase=analysis.phase,
-            confidence=analysis.confidence,
-            total_mentions=analysis.metrics['total_mentions'],
-            insights=insights,
-            chart_data=chart_data,
-            news_results=results,
-            analysis=analysis
-        )
+    return serp_api_key, google_query, valid_terms
+
+def _ndjson(message: Dict[str, Any]) -> str:
+    return json.dumps(message, ensure_ascii=False, default=float) + "\n"
+
+@app.post("/api/hypecycle/analyze/stream")
+async def analyze_hypecycle_stream(request: HypeCycleRequest):
+    """Variante en streaming (NDJSON): envía resultados parciales a medida que llega cada rango"""
+    serp_api_key, google_query, valid_terms = _validated_search(request)
+    news_analyzer = get_news_analyzer()
+    
+    async def events():
+        all_results: List[NewsRecord] = []
+        unique_results: List[NewsRecord] = []
+        search_metrics: Dict[str, Any] = {}
+        with bind_log_context(analysis_id=new_id()):
+            logger.info("Búsqueda en streaming iniciada", extra={"query": google_query})
+            try:
+                async for _, date_range, items in news_analyzer.iter_search_pages(google_query, serp_api_key, search_metrics):
+                    all_results.extend(await news_analyzer.process_news_batch(items, valid_terms))
+                
+                    # La deduplicación conserva el primer resultado, así que los nuevos quedan al final
+                    with STAGE_SECONDS.time(stage="dedup"):
+                        deduplicated = await asyncio.to_thread(news_analyzer._remove_duplicates, all_results)
+                    new_results = deduplicated[len(unique_results):]
+                    unique_results = deduplicated
+                
+                    yearly_mentions = Counter(str(result.year) for result in unique_results)
+                    provisional = news_analyzer.analyze_hype_cycle(unique_results)
+                    yield _ndjson({
+                        "type": "range",
+                        "range": list(date_range),
+                        "news_results": [result.to_dict() for result in new_results],
+                        "yearly_mentions": dict(sorted(yearly_mentions.items())),
+                        "total_mentions": len(unique_results),
+                        "phase": provisional.phase if provisional else None,
+                        "confidence": provisional.confidence if provisional else None
+                    })
+                
+                DUPLICATES_REMOVED.inc(len(all_results) - len(unique_results))
+                if not unique_results:
+                    yield _ndjson({"type": "error", "status_code": 404, "detail": "No se encontraron resultados"})
+                    return
+                
+                analysis = news_analyzer.analyze_hype_cycle(unique_results)
+                if not analysis:
+                    yield _ndjson({"type": "error", "status_code": 400, "detail": "No se pudieron analizar los resultados"})
+                    return
+                
+                analysis.metrics.update(search_metrics)
+                response = build_hypecycle_response(unique_results, analysis)
+                yield _ndjson({"type": "final", "response": json.loads(response.model_dump_json())})
+            
+            except SearchError as e:
+                yield _ndjson({"type": "error", "status_code": 400, "detail": f"Error en búsqueda: {str(e)}"})
+            except Exception as e:
+                logger.exception("Error en streaming")
+                yield _ndjson({"type": "error", "status_code": 500, "detail": f"Error interno: {str(e)}"})
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+# Máximo de temas por comparación
+COMPARE_MAX_TOPICS = int(os.getenv("HYPECYCLE_COMPARE_MAX_TOPICS", "20"))
+
+@app.post("/api/hypecycle/compare", response_model=HypeCycleCompareResponse)
+async def compare_hypecycles(request: HypeCycleCompareRequest):
+    """Compara varios temas: búsquedas concurrentes bajo el mismo presupuesto de SERPAPI y series alineadas por año"""
+    if not request.topics:
+        raise HTTPException(status_code=400, detail="Se requiere al menos un tema")
+    if len(request.topics) > COMPARE_MAX_TOPICS:
+        raise HTTPException(status_code=400, detail=f"Máximo {COMPARE_MAX_TOPICS} temas por comparación")
+    
+    # Falla pronto si falta la API key o algún tema no tiene términos
+    for topic in request.topics:
+        _validated_search(topic)
+    
+    # Todos los rangos de todos los temas pasan por el mismo SerpClient (semáforo + token bucket)
+    # y la misma caché; temas repetidos o ya en curso se comparten vía single-flight
+    outcomes = await asyncio.gather(*[
+        single_flight.do(canonical_request_key(topic), lambda topic=topic: compute_hypecycle(topic))
+        for topic in request.topics
+    ], return_exceptions=True)
+    
+    years = sorted({
+        stat['year']
+        for outcome in outcomes if isinstance(outcome, HypeCycleResponse) and outcome.analysis
+        for stat in outcome.analysis.yearly_stats
+    })
+    
+    topics = []
+    for topic, outcome in zip(request.topics, outcomes):
+        label = " ".join(term.value.strip() for term in topic.search_terms if term.value.strip())
+        if isinstance(outcome, HypeCycleResponse):
+            topics.append(build_topic_comparison(label, outcome, years))
+        else:
+            detail = outcome.detail if isinstance(outcome, HTTPException) else f"Error interno: {str(outcome)}"
+            logger.warning("Error comparando tema", extra={"topic": label, "detail": detail})
+            topics.append(TopicComparison(label=label, success=False, error=detail))
+    
+    return HypeCycleCompareResponse(
+        success=any(topic.success for topic in topics),
+        years=years,
+        topics=topics
+    )
+
+def build_topic_comparison(label: str, response: HypeCycleResponse, years: List[int]) -> TopicComparison:
+    """Series del tema alineadas a los años de la comparación (0 menciones / sin sentimiento si falta el año)"""
+    stats_by_year = {stat['year']: stat for stat in response.analysis.yearly_stats}
+    return TopicComparison(
+        label=label,
+        success=True,
+        phase=response.phase,
+        confidence=response.confidence,
+        total_mentions=response.total_mentions,
+        mention_counts=[stats_by_year[year]['mention_count'] if year in stats_by_year else 0 for year in years],
+        sentiment_means=[stats_by_year[year]['sentiment_mean'] if year in stats_by_year else None for year in years]
+    )
+
+async def run_hypecycle_job(payload: Dict[str, Any], progress: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """Ejecuta un análisis encolado e informa el avance por rango completado"""
+    request = HypeCycleRequest(**payload)
+    progress({"stage": "searching", "pages_completed": 0})
+    
+    def on_page(pages_completed: int, date_range: Tuple[int, int]) -> None:
+        progress({"pages_completed": pages_completed, "last_range": list(date_range)})
+    
+    try:
+        response = await compute_hypecycle(request, on_page=on_page)
+    except HTTPException as e:
+        raise JobError(e.status_code, e.detail)
+    
+    progress({"stage": "done"})
+    return json.loads(response.model_dump_json())
+
+job_manager = JobManager.from_env(run_hypecycle_job)
+
+async def build_snapshot(payload: Dict[str, Any], results_id: str) -> bytes:
+    """Análisis completo de un tema del catálogo, serializado una vez para servirlo tal cual"""
+    response = await compute_hypecycle(HypeCycleRequest(**payload), results_id=results_id)
+    response.analysis.metrics['snapshot'] = {"results_id": results_id, "created_at": datetime.now().isoformat()}
+    return response.model_dump_json().encode('utf-8')
+
+# Catálogo de temas precalculados (HYPECYCLE_SNAPSHOT_CATALOG); sin catálogo no hace nada
+snapshot_manager = SnapshotManager.from_env(build_snapshot, lambda payload: canonical_request_key(HypeCycleRequest(**payload)))
+_topic_store: Optional[TopicStore] = None
+
+def get_topic_store() -> TopicStore:
+    global _topic_store
+    if _topic_store is None:
+        _topic_store = TopicStore.from_env()
+    return _topic_store
+
+@app.post("/api/hypecycle/refresh", response_model=HypeCycleResponse)
+async def refresh_hypecycle(request: HypeCycleRequest, fields: Optional[str] = None, page_size: Optional[int] = None):
+    """Análisis de un tema seguido: la primera vez busca todo, luego solo los rangos nuevos"""
+    try:
+        response = await single_flight.do("refresh:" + canonical_request_key(request), lambda: refresh_topic(request))
+        return shape_response(response, fields, page_size)
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.exception("Error inesperado")
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
+async def refresh_topic(request: HypeCycleRequest) -> HypeCycleResponse:
+    """Actualiza el corpus persistido del tema desde su watermark y analiza los agregados anuales"""
+    serp_api_key, google_query, valid_terms = _validated_search(request)
+    key = canonical_request_key(request)
+    current_year = datetime.now().year
+    news_analyzer = get_news_analyzer()
+    topic_store = get_topic_store()
+    
+    search_metrics: Dict[str, Any] = {}
+    topic = await asyncio.to_thread(topic_store.get_topic, key)
+    # Primera vez: corpus completo; después, desde el año del watermark (seguía abierto)
+    mode = "full" if topic is None else "incremental"
+    since_year = topic['watermark_year'] if topic else None
+    try:
+        results = await news_analyzer.fetch_news_since(google_query, serp_api_key, valid_terms, since_year, search_metrics)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error en búsqueda: {str(e)}")
+    
+    # Las copias sindicadas (también las de notas ya guardadas) se pliegan en su original;
+    # basta comparar con lo guardado desde el año anterior al watermark
+    stored = []
+    if topic is not None and results:
+        stored_items = await asyncio.to_thread(topic_store.load_items, key, since_year - 1)
+        stored = [NewsRecord.from_dict(item) for item in stored_items]
+    with STAGE_SECONDS.time(stage="dedup"):
+        new_results, copies = await asyncio.to_thread(news_analyzer._fold_duplicates, stored, results)
+    DUPLICATES_REMOVED.inc(len(copies))
+    
+    # Sin resultados no se crea el tema: el próximo refresco vuelve a buscar el periodo completo
+    if topic is None and not new_results:
+        raise HTTPException(status_code=404, detail="No se encontraron resultados")
+    
+    # El watermark solo avanza tras una búsqueda exitosa que trajo resultados
+    added = 0
+    if new_results or copies:
+        added = await asyncio.to_thread(
+            topic_store.merge, key, request.model_dump(), [result.to_dict() for result in new_results], current_year,
+            [(link, result.to_dict()) for link, result in copies]
+        )
+    yearly_totals = await asyncio.to_thread(topic_store.yearly_totals, key)
+    
+    if not yearly_totals:
+        raise HTTPException(status_code=404, detail="No se encontraron resultados")
+    
+    analysis = news_analyzer.analyze_yearly_totals(yearly_totals)
+    if not analysis:
+        raise HTTPException(status_code=400, detail="No se pudieron analizar los resultados")
+    
+    analysis.metrics.update(search_metrics)
+    analysis.metrics['refresh'] = {
+        "mode": mode,
+        "since_year": topic['watermark_year'] if topic else None,
+        "fetched_items": len(results),
+        "new_items": added,
+        "folded_copies": len(copies)
+    }
+    logger.info("Tema actualizado", extra={"mode": mode, "new_items": added, "fetched_items": len(results)})
+    
+    stored_items = await asyncio.to_thread(topic_store.load_items, key)
+    records = [NewsRecord.from_dict(item) for item in stored_items]
+    return build_hypecycle_response(records, analysis)
+
+@app.post("/api/hypecycle/jobs", status_code=202)
+async def create_hypecycle_job(request: HypeCycleRequest):
+    """Encola un análisis y devuelve su ID; solicitudes idénticas en curso comparten trabajo"""
+    _validated_search(request)
+    job, coalesced = job_manager.submit(canonical_request_key(request), request.model_dump())
+    return {"job_id": job.id, "status": job.status, "coalesced": coalesced}
+
+@app.get("/api/hypecycle/jobs/{job_id}")
+async def get_hypecycle_job(job_id: str):
+    """Estado, avance y resultado de un análisis en segundo plano"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return job.to_dict()
+
+@app.get("/api/hypecycle/snapshots")
+async def list_snapshots():
+    """Snapshots precalculados del catálogo con su antigüedad"""
+    return {**snapshot_manager.stats(), "snapshots": snapshot_manager.snapshots()}
+
+@app.post("/api/hypecycle/snapshots/refresh", status_code=202)
+async def refresh_snapshots():
+    """Precalcula ya, sin esperar la ventana horaria, los temas sin snapshot o vencidos"""
+    return {"due": snapshot_manager.refresh_now()}
+
 def get_phase_position(phase: str) -> Dict[str, float]:
     """Obtiene la posición de una fase en la curva del Hype Cycle"""
     positions = {
@@ -880,10 +1615,61 @@ def get_phase_position(phase: str) -> Dict[str, float]:
     }
     return positions.get(phase, {"x": 50, "y": 50})
 
+@app.get("/metrics")
+async def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    return Response(content=REGISTRY.render(), headers={"Content-Type": REGISTRY.CONTENT_TYPE})
+
+def _component_stats() -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+    """Exporta como gauges los contadores que ya llevan caché, cliente, single-flight, cola y executor"""
+    news_analyzer = get_news_analyzer()
+    components = {
+        "serp_client": news_analyzer.serp_client.stats(),
+        "serp_cache": news_analyzer.query_cache.stats(),
+        "single_flight": single_flight.stats(),
+        "jobs": job_manager.stats(),
+        "results": result_store.stats(),
+        "executor": news_analyzer.executor.stats(),
+        "planner": news_analyzer.query_planner.stats(),
+        "snapshots": snapshot_manager.stats(),
+        "logging": logging_stats(),
+    }
+    return [
+        (f"hypecycle_{component}_{key}", "gauge", f"{component}.{key}", [({}, float(value))])
+        for component, stats in components.items()
+        for key, value in stats.items()
+        if isinstance(value, (int, float))
+    ]
+
+REGISTRY.register_collector(_component_stats)
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "message": "CycleAI Backend is running"}
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Estadísticas de aciertos y fallos de la caché de SERPAPI"""
+    return get_news_analyzer().query_cache.stats()
+
+@app.get("/api/serp/stats")
+async def serp_stats():
+    """Latencias, errores y reintentos de las llamadas a SERPAPI"""
+    return get_news_analyzer().serp_client.stats()
+
+@app.get("/api/hypecycle/stats")
+async def hypecycle_stats():
+    """Solicitudes agrupadas (single-flight), cola de trabajos, resultados paginables, executor, planificador, snapshots y registros"""
+    return {
+        "single_flight": single_flight.stats(),
+        "jobs": job_manager.stats(),
+        "results": result_store.stats(),
+        "executor": get_news_analyzer().executor.stats(),
+        "planner": get_news_analyzer().query_planner.stats(),
+        "snapshots": snapshot_manager.stats(),
+        "logging": logging_stats()
+    }
+
 @app.get("/api/test")
 async def test_endpoint():
     """Endpoint de prueba sin API key"""
@@ -1107,7 +1893,7 @@ def analyze_innovation_test(answers: List[InnovationAnswer], company_name: str)
         )
         
     except Exception as e:
-        print(f"Error analyzing innovation test: {str(e)}")
+        logger.exception("Error en análisis del test de innovación")
         raise HTTPException(status_code=500, detail=f"Error en análisis: {str(e)}")
 
 def determine_innovation_level(overall_percentage: float, module_scores: List[ModuleScore]) -> InnovationLevel:
@@ -1172,5 +1958,7 @@ def determine_innovation_level(overall_percentage: float, module_scores: List[Mo
                 "Implementar programas de formación en innovación para todo el personal"
             ]
         )
+
+if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,78 @@
+# backend/news_record.py
+import sys
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+# Años compartidos: los int > 256 no se cachean y cada registro tendría su propio objeto
+_YEARS: Dict[int, int] = {}
+
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class NewsRecord:
+    """Noticia procesada en su forma interna: slots, cadenas repetidas internadas y sin validación.
+
+    El pipeline (dedup, análisis, almacén de resultados y de temas) trabaja con estos
+    registros; se convierten a NewsResult solo al serializar la respuesta.
+    """
+
+    __slots__ = (
+        'title', 'link', 'snippet', 'source', 'date', 'year', 'sentiment',
+        'country', 'keywords', 'syndication_count', 'published'
+    )
+
+    def __init__(self, title: str, link: str, snippet: str, source: str, date: str, year: int, sentiment: float,
+                 country: Optional[str] = None, keywords: Tuple[str, ...] = (), syndication_count: int = 1,
+                 published: Optional[date] = None):
+        self.title = title
+        self.link = link
+        self.snippet = snippet
+        # Fuente, fecha cruda, país y palabras clave se repiten mucho entre noticias
+        self.source = sys.intern(source)
+        self.date = sys.intern(date)
+        self.year = _YEARS.setdefault(year, year)
+        self.sentiment = sentiment
+        self.country = _intern_optional(country)
+        self.keywords = tuple(sys.intern(keyword) for keyword in keywords)
+        self.syndication_count = syndication_count
+        self.published = published
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> "NewsRecord":
+        """Desde la forma de NewsResult (p. ej. un ítem guardado en el TopicStore)"""
+        published_date = item.get('published_date')
+        return cls(
+            item['title'], item['link'], item['snippet'], item['source'], item['date'], item['year'], item['sentiment'],
+            country=item.get('country'),
+            keywords=item.get('keywords') or (),
+            syndication_count=item.get('syndication_count', 1),
+            published=date.fromisoformat(published_date) if published_date else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Mismos campos y orden que NewsResult.model_dump()"""
+        return {
+            'title': self.title,
+            'link': self.link,
+            'snippet': self.snippet,
+            'source': self.source,
+            'date': self.date,
+            'year': self.year,
+            'sentiment': self.sentiment,
+            'country': self.country,
+            'keywords': list(self.keywords),
+            'syndication_count': self.syndication_count,
+            'published_date': self.published.isoformat() if self.published else None
+        }
+
+    def with_syndication_count(self, count: int) -> "NewsRecord":
+        copy = NewsRecord.__new__(NewsRecord)
+        for name in self.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.syndication_count = count
+        return copy
+
+    def __repr__(self) -> str:
+        return f"NewsRecord(title={self.title!r}, year={self.year}, source={self.source!r})"
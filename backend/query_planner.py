@@ -0,0 +1,264 @@
+# backend/query_planner.py
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+DateRange = Tuple[int, int]
+
+
+def topic_key(clean_query: str) -> str:
+    return " ".join(clean_query.lower().split())
+
+
+class DensityHistory:
+    """Resultados por año observados por tema (LRU en memoria).
+
+    Cada consulta reparte sus resultados de forma uniforme entre los años de su rango;
+    la observación sobre el rango más corto (la más precisa) reemplaza a las demás.
+    En rangos saturados el conteo es solo una cota inferior.
+    """
+
+    def __init__(self, max_topics: int = 1024):
+        self.max_topics = max_topics
+        self._topics: "OrderedDict[str, Dict[int, Tuple[int, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, topic: str, date_range: DateRange, count: int) -> None:
+        start, end = date_range
+        span = end - start + 1
+        per_year = count / span
+        with self._lock:
+            years = self._topics.setdefault(topic, {})
+            self._topics.move_to_end(topic)
+            for year in range(start, end + 1):
+                known = years.get(year)
+                if known is None or span <= known[0]:
+                    years[year] = (span, per_year)
+            while len(self._topics) > self.max_topics:
+                self._topics.popitem(last=False)
+
+    def estimates(self, topic: str, start: int, end: int) -> Optional[List[float]]:
+        """Resultados estimados por año del rango; None si falta algún año"""
+        with self._lock:
+            years = self._topics.get(topic)
+            if not years or any(year not in years for year in range(start, end + 1)):
+                return None
+            return [years[year][1] for year in range(start, end + 1)]
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+
+class _RangePaging:
+    __slots__ = ('next_start', 'outstanding', 'seen', 'expected', 'done')
+
+    def __init__(self, page_size: int, expected: float = 0.0):
+        self.next_start = page_size
+        self.outstanding = 0
+        self.seen = page_size
+        self.expected = expected  # resultados esperados según el historial (0 si no hay)
+        self.done = False
+
+
+class SearchPlan:
+    """Plan de una búsqueda: rangos iniciales, bisección de los rangos saturados y paginación.
+
+    Un rango saturado se biseca mientras alcance el presupuesto de consultas; si ya no se
+    puede dividir (un solo año o sin presupuesto) se pagina (start=100, 200, ...) en
+    ventanas concurrentes hasta una página corta o hasta agotar las páginas. Rangos,
+    mitades y reintentos salen de max_calls; las páginas, de su propio presupuesto de
+    max_pages, para que la bisección no deje sin páginas a los rangos densos.
+    """
+
+    def __init__(self, planner: "QueryPlanner", topic: str, initial_ranges: List[DateRange], from_history: bool):
+        self.planner = planner
+        self.topic = topic
+        self.initial_ranges = initial_ranges
+        self.from_history = from_history
+        self.calls = len(initial_ranges)  # primeras páginas de rango (iniciales, mitades y reintentos)
+        self.splits = 0
+        self.budget_exhausted = False
+        self.pages = 0
+        self._paging: Dict[DateRange, _RangePaging] = {}
+        self.truncated_ranges = 0
+        # Consultas (rango, start) cuyo último intento falló, y rangos ya reintentados
+        self.failed: Set[Tuple[DateRange, int]] = set()
+        self.retried: Set[DateRange] = set()
+        self.completed_ranges = 0
+
+    @property
+    def all_failed(self) -> bool:
+        """Ninguna primera página de rango respondió: la búsqueda entera falló"""
+        return self.completed_ranges == 0 and bool(self.failed)
+
+    def advance(self, date_range: DateRange, start: int, count: Optional[int], retryable: bool = False) -> List[Tuple[DateRange, int]]:
+        """Registra una página (count=None si falló; retryable si el error es transitorio) y devuelve las consultas (rango, start) siguientes"""
+        if count is None:
+            self.failed.add((date_range, start))
+        else:
+            self.failed.discard((date_range, start))
+        if start == 0:
+            return self._first_page(date_range, count, retryable)
+        return self._next_page(date_range, start, count)
+
+    def _first_page(self, date_range: DateRange, count: Optional[int], retryable: bool) -> List[Tuple[DateRange, int]]:
+        # Un rango con error no dice nada de la densidad: ni se registra ni se divide.
+        # Si el error es transitorio se reintenta una vez, dentro del presupuesto de consultas
+        if count is None:
+            if retryable and date_range not in self.retried and self.calls < self.planner.max_calls:
+                self.retried.add(date_range)
+                self.calls += 1
+                return [(date_range, 0)]
+            return []
+        self.completed_ranges += 1
+        estimates = self.planner.history.estimates(self.topic, *date_range)
+        self.planner.history.observe(self.topic, date_range, count)
+        if count < self.planner.page_size:
+            return []
+
+        start, end = date_range
+        if start < end:
+            if self.calls + 2 <= self.planner.max_calls:
+                self.calls += 2
+                self.splits += 1
+                middle = (start + end) // 2
+                return [((start, middle), 0), ((middle + 1, end), 0)]
+            self.budget_exhausted = True
+
+        paging = self._paging[date_range] = _RangePaging(self.planner.page_size, sum(estimates) if estimates else 0.0)
+        return self._next_window(date_range, paging)
+
+    def _next_page(self, date_range: DateRange, start: int, count: Optional[int]) -> List[Tuple[DateRange, int]]:
+        paging = self._paging[date_range]
+        paging.outstanding -= 1
+        if count is None or count < self.planner.page_size:
+            # Página corta (o fallida): no hay más resultados; las páginas ya en vuelo terminan igual
+            paging.done = True
+        if count:
+            paging.seen = max(paging.seen, start + count)
+        if paging.outstanding:
+            return []
+
+        # Conteo total del rango (cota inferior si queda truncado)
+        self.planner.history.observe(self.topic, date_range, paging.seen)
+        if paging.done:
+            return []
+        return self._next_window(date_range, paging)
+
+    def _next_window(self, date_range: DateRange, paging: _RangePaging) -> List[Tuple[DateRange, int]]:
+        page_size = self.planner.page_size
+        # Si el historial anticipa cuántos resultados hay, se piden de una vez las páginas que faltan
+        wanted = self.planner.page_window
+        if paging.expected > paging.next_start:
+            wanted = math.ceil((paging.expected - paging.next_start) / page_size)
+        available = min(wanted, self.planner.max_pages - self.pages)
+        if available <= 0:
+            self.truncated_ranges += 1
+            return []
+
+        offsets = [paging.next_start + i * page_size for i in range(available)]
+        paging.next_start += available * page_size
+        paging.outstanding += available
+        self.pages += available
+        return [(date_range, offset) for offset in offsets]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'planned_calls': self.calls + self.pages,
+            'splits': self.splits,
+            'budget_exhausted': self.budget_exhausted,
+            'from_history': self.from_history,
+            'failed_ranges': sum(1 for _, start in self.failed if start == 0),
+            'failed_pages': sum(1 for _, start in self.failed if start > 0),
+            'retried_ranges': len(self.retried)
+        }
+
+    def pagination_summary(self) -> Dict[str, Any]:
+        return {
+            'paginated_ranges': len(self._paging),
+            'extra_pages': self.pages,
+            'page_budget': self.planner.max_pages,
+            'truncated_ranges': self.truncated_ranges,
+            'complete_ranges': sum(1 for paging in self._paging.values() if paging.done and not paging.outstanding)
+        }
+
+
+class QueryPlanner:
+    """Divide el periodo de búsqueda según la densidad observada en vez de un calendario fijo.
+
+    Sin historial se consulta todo el periodo y se biseca recursivamente cada rango cuya
+    página vuelve llena (page_size resultados); los rangos saturados que ya no se dividen
+    se paginan, page_window páginas a la vez. Cada búsqueda hace como mucho max_calls
+    consultas de rango (bisección y reintentos incluidos) más max_pages páginas extra.
+    Con historial del tema se parte directamente de rangos que se espera que no saturen.
+    """
+
+    def __init__(self, page_size: int = 100, max_calls: int = 10, history_size: int = 1024, fill_ratio: float = 0.8,
+                 max_pages: int = 4, page_window: int = 3):
+        self.page_size = page_size
+        self.max_calls = max(1, max_calls)
+        self.fill_ratio = fill_ratio
+        self.max_pages = max_pages
+        self.page_window = max(1, page_window)
+        self.history = DensityHistory(history_size)
+        self.counters = {
+            'plans': 0, 'history_plans': 0, 'splits': 0, 'budget_exhausted': 0, 'extra_pages': 0, 'truncated_ranges': 0,
+            'failed_ranges': 0, 'retried_ranges': 0
+        }
+
+    @classmethod
+    def from_env(cls, page_size: int = 100) -> "QueryPlanner":
+        return cls(
+            page_size=page_size,
+            max_calls=int(os.getenv("HYPECYCLE_PLANNER_MAX_CALLS", "10")),
+            history_size=int(os.getenv("HYPECYCLE_PLANNER_HISTORY_SIZE", "1024")),
+            max_pages=int(os.getenv("HYPECYCLE_MAX_EXTRA_PAGES", "4")),
+            page_window=int(os.getenv("HYPECYCLE_PAGE_WINDOW", "3")),
+        )
+
+    def plan(self, clean_query: str, start: int, end: int) -> SearchPlan:
+        topic = topic_key(clean_query)
+        initial = self._ranges_from_history(topic, start, end)
+        self.counters['plans'] += 1
+        if initial is not None:
+            self.counters['history_plans'] += 1
+        return SearchPlan(self, topic, initial or [(start, end)], from_history=initial is not None)
+
+    def _ranges_from_history(self, topic: str, start: int, end: int) -> Optional[List[DateRange]]:
+        """Agrupa años consecutivos mientras la suma estimada quepa en una página con margen"""
+        estimates = self.history.estimates(topic, start, end)
+        if estimates is None:
+            return None
+
+        capacity = self.page_size * self.fill_ratio
+        ranges: List[DateRange] = []
+        range_start, total = start, 0.0
+        for year, estimate in zip(range(start, end + 1), estimates):
+            if year > range_start and total + estimate > capacity:
+                ranges.append((range_start, year - 1))
+                range_start, total = year, 0.0
+            total += estimate
+        ranges.append((range_start, end))
+
+        # Una sola consulta es el plan sin historial; más de las permitidas no cabe en el presupuesto
+        if len(ranges) == 1 or len(ranges) > self.max_calls:
+            return None
+        return ranges
+
+    def finish(self, plan: SearchPlan) -> None:
+        self.counters['splits'] += plan.splits
+        self.counters['budget_exhausted'] += int(plan.budget_exhausted)
+        self.counters['extra_pages'] += plan.pages
+        self.counters['truncated_ranges'] += plan.truncated_ranges
+        self.counters['failed_ranges'] += len(plan.failed)
+        self.counters['retried_ranges'] += len(plan.retried)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.counters,
+            'max_calls': self.max_calls,
+            'max_pages': self.max_pages,
+            'topics': len(self.history)
+        }
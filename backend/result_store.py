@@ -0,0 +1,73 @@
+# backend/result_store.py
+import base64
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def encode_cursor(results_id: str, offset: int) -> str:
+    """Cursor opaco: identificador del conjunto de resultados y desplazamiento"""
+    raw = json.dumps([results_id, offset], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        results_id, offset = json.loads(raw)
+        if isinstance(results_id, str) and isinstance(offset, int) and offset >= 0:
+            return results_id, offset
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+class ResultStore:
+    """Conjuntos de resultados recientes en memoria (LRU con TTL) para paginar news_results"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Sequence[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'stores': 0, 'pages': 0, 'expired': 0}
+
+    @classmethod
+    def from_env(cls) -> "ResultStore":
+        return cls(
+            max_entries=int(os.getenv("HYPECYCLE_RESULTS_SIZE", "256")),
+            ttl=float(os.getenv("HYPECYCLE_RESULTS_TTL", "1800")),
+        )
+
+    def put(self, results: Sequence[Any]) -> str:
+        results_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[results_id] = (time.time() + self.ttl, results)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.counters['stores'] += 1
+        return results_id
+
+    def page(self, results_id: str, offset: int, limit: int) -> Optional[Tuple[List[Any], Optional[int], int]]:
+        """Devuelve (página, desplazamiento siguiente o None, total); None si el conjunto expiró"""
+        with self._lock:
+            entry = self._entries.get(results_id)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at <= time.time():
+                del self._entries[results_id]
+                self.counters['expired'] += 1
+                return None
+            self._entries.move_to_end(results_id)
+            self.counters['pages'] += 1
+
+        end = offset + limit
+        return list(results[offset:end]), end if end < len(results) else None, len(results)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'entries': len(self._entries)}
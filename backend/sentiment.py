@@ -0,0 +1,134 @@
+# backend/sentiment.py
+import hashlib
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+from text_matcher import PhraseMatcher, tokenize
+
+
+class SentimentEngine(ABC):
+    """Interfaz de los motores de sentimiento: puntaje en [-1, 1] por texto.
+
+    score_batch evalúa una sola vez cada texto distinto del lote y memoriza los puntajes
+    por hash del contenido, así las notas sindicadas repetidas no se vuelven a evaluar.
+    """
+
+    name = "base"
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._memo: Dict[bytes, float] = {}
+        self.counters = {'scored': 0, 'memo_hits': 0}
+
+    @abstractmethod
+    def _score(self, text: str, words: Optional[List[str]] = None) -> float:
+        """Puntaje de un texto; words son sus palabras ya tokenizadas, si se tienen"""
+
+    def score(self, text: str) -> float:
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: Sequence[str], tokens: Optional[Sequence[List[str]]] = None) -> List[float]:
+        """Puntajes de un lote; tokens son las palabras ya tokenizadas de cada texto, si se tienen"""
+        memo = self._memo
+        scores = []
+        for index, text in enumerate(texts):
+            key = hashlib.blake2b(text.encode('utf-8'), digest_size=12).digest()
+            score = memo.get(key)
+            if score is None:
+                score = self._score(text, tokens[index] if tokens is not None else None)
+                if len(memo) >= self.max_entries:
+                    memo.clear()
+                memo[key] = score
+                self.counters['scored'] += 1
+            else:
+                self.counters['memo_hits'] += 1
+            scores.append(score)
+        return scores
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, 'memo_entries': len(self._memo)}
+
+
+class HeuristicSentiment(SentimentEngine):
+    """Léxico de palabras positivas/negativas: cada palabra aporta +1/-1 una sola vez"""
+
+    name = "heuristic"
+
+    POSITIVE_WORDS = [
+        'breakthrough', 'innovative', 'revolutionary', 'success', 'leading',
+        'advanced', 'improved', 'better', 'growth', 'increase', 'promising',
+        'potential', 'opportunity', 'advantage', 'benefit', 'progress',
+        'development', 'achievement', 'excellent', 'outstanding', 'superior'
+    ]
+
+    NEGATIVE_WORDS = [
+        'decline', 'failure', 'problem', 'issue', 'challenge', 'difficult',
+        'decrease', 'drop', 'fall', 'crisis', 'concern', 'risk', 'threat',
+        'limitation', 'obstacle', 'setback', 'disappointment', 'weak',
+        'poor', 'negative', 'loss', 'reduce', 'cut', 'eliminate'
+    ]
+
+    def __init__(self, max_entries: int = 50000):
+        super().__init__(max_entries)
+        # Automata del léxico: cada palabra aporta +1/-1 una sola vez si aparece en el texto
+        lexicon = {word: (word, 1) for word in self.POSITIVE_WORDS}
+        lexicon.update({word: (word, -1) for word in self.NEGATIVE_WORDS})
+        self.matcher = PhraseMatcher(lexicon)
+
+    def _score(self, text: str, words: Optional[List[str]] = None) -> float:
+        total_words = len(text.split())
+        if total_words == 0:
+            return 0.0
+        if words is None:
+            words = tokenize(text.lower())
+
+        polarity = sum(weight for _, weight in self.matcher.find_values(words))
+        return max(-1.0, min(1.0, polarity / max(total_words / 10, 1)))
+
+
+# Analizador VADER compartido por proceso; los hijos de un fork heredan el léxico ya cargado
+_vader_lock = threading.Lock()
+_vader_analyzer = None
+
+
+def _reset_vader_lock() -> None:
+    # El lock heredado pudo quedar tomado por otro hilo del padre en el momento del fork
+    global _vader_lock
+    _vader_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_vader_lock)
+
+
+def _shared_vader():
+    """Carga el léxico de VADER al primer uso (import diferido)"""
+    global _vader_analyzer
+    if _vader_analyzer is None:
+        with _vader_lock:
+            if _vader_analyzer is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _vader_analyzer = SentimentIntensityAnalyzer()
+    return _vader_analyzer
+
+
+class VaderSentiment(SentimentEngine):
+    """Puntaje compuesto de VADER (léxico, intensificadores y negaciones); más preciso y más lento"""
+
+    name = "vader"
+
+    def _score(self, text: str, words: Optional[List[str]] = None) -> float:
+        return _shared_vader().polarity_scores(text)['compound']
+
+
+SENTIMENT_ENGINES = {engine.name: engine for engine in (HeuristicSentiment, VaderSentiment)}
+
+
+def create_sentiment_engine(name: Optional[str] = None) -> SentimentEngine:
+    """Motor por nombre (por defecto HYPECYCLE_SENTIMENT o 'heuristic')"""
+    name = (name or os.getenv("HYPECYCLE_SENTIMENT", "heuristic")).lower()
+    if name not in SENTIMENT_ENGINES:
+        raise ValueError(f"Motor de sentimiento desconocido: {name} (opciones: {', '.join(SENTIMENT_ENGINES)})")
+    return SENTIMENT_ENGINES[name]()
@@ -0,0 +1,137 @@
+# backend/serp_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+# Operadores que Google distingue por mayúsculas y no deben normalizarse
+QUERY_OPERATORS = {'AND', 'OR', 'NOT'}
+
+# Parámetros que no afectan el resultado y se excluyen de la clave
+IGNORED_PARAMS = {'api_key', 'q'}
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza espacios y mayúsculas de una consulta conservando los operadores"""
+    tokens = []
+    for token in query.split():
+        tokens.append(token if token in QUERY_OPERATORS else token.lower())
+    return " ".join(tokens)
+
+
+class QueryCache:
+    """Caché de respuestas de SERPAPI con nivel LRU en memoria y nivel SQLite en disco"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = 512,
+        closed_range_ttl: float = 30 * 24 * 3600,
+        open_range_ttl: float = 6 * 3600,
+    ):
+        self.max_entries = max_entries
+        self.closed_range_ttl = closed_range_ttl
+        self.open_range_ttl = open_range_ttl
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS serp_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "QueryCache":
+        """Crea la caché leyendo la configuración de variables de entorno"""
+        return cls(
+            db_path=os.getenv("SERP_CACHE_PATH", "serp_cache.sqlite3") or None,
+            max_entries=int(os.getenv("SERP_CACHE_SIZE", "512")),
+            closed_range_ttl=float(os.getenv("SERP_CACHE_TTL_CLOSED", str(30 * 24 * 3600))),
+            open_range_ttl=float(os.getenv("SERP_CACHE_TTL_OPEN", str(6 * 3600))),
+        )
+
+    def make_key(self, query: str, start_year: int, end_year: int, params: Dict[str, Any]) -> str:
+        """Construye la clave a partir de la consulta normalizada, el rango y los parámetros base"""
+        relevant_params = {k: str(v) for k, v in params.items() if k not in IGNORED_PARAMS}
+        raw_key = json.dumps(
+            [normalize_query(query), start_year, end_year, relevant_params],
+            sort_keys=True
+        )
+        return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+    def ttl_for_range(self, end_year: int) -> float:
+        """Los años cerrados casi no cambian; el año en curso sí"""
+        if end_year < datetime.now().year:
+            return self.closed_range_ttl
+        return self.open_range_ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return payload
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM serp_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    payload = json.loads(row[1])
+                    self._remember(key, row[0], payload)
+                    self.counters['disk_hits'] += 1
+                    return payload
+
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key: str, payload: Dict[str, Any], ttl: float) -> None:
+        expires_at = time.time() + ttl
+
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO serp_cache (key, expires_at, payload) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(payload))
+                )
+                self._db.commit()
+            self.counters['stores'] += 1
+
+    def _remember(self, key: str, expires_at: float, payload: Dict[str, Any]) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.counters['memory_hits'] + self.counters['disk_hits']
+        lookups = hits + self.counters['misses']
+        return {
+            **self.counters,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'persistent': self._db is not None
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,238 @@
+# backend/serp_client.py
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+# Códigos de estado que justifican reintentar la llamada
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# live: SERPAPI real; record: SERPAPI real guardando cada respuesta; replay: solo grabaciones, sin red
+TRANSPORT_MODES = ("live", "record", "replay")
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Error transitorio (red, 429 o 5xx) que vale la pena reintentar más tarde"""
+    import httpx
+
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in RETRYABLE_STATUS_CODES
+
+
+class TokenBucket:
+    """Limitador de tasa tipo token bucket para las llamadas a SERPAPI"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """Espera hasta que haya un token disponible y lo consume"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CallMetrics:
+    """Acumula latencias y resultados de las llamadas a SERPAPI"""
+
+    def __init__(self, window: int = 1000):
+        self.latencies = deque(maxlen=window)
+        self.counters = {'calls': 0, 'errors': 0, 'retries': 0}
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.counters['calls'] += 1
+        if not ok:
+            self.counters['errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            **self.counters,
+            'latency_p50': percentile(0.50),
+            'latency_p95': percentile(0.95),
+            'latency_p99': percentile(0.99),
+            'latency_max': ordered[-1] if ordered else 0.0
+        }
+
+
+class SerpClient:
+    """Cliente asíncrono compartido para SERPAPI con pool de conexiones y reintentos"""
+
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int = 5,
+        rate_per_second: float = 10.0,
+        burst: int = 5,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        transport_mode: str = "live",
+        recordings_dir: str = "serp_recordings",
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        if transport_mode not in TRANSPORT_MODES:
+            raise ValueError(f"SERP_TRANSPORT desconocido: {transport_mode} (opciones: {', '.join(TRANSPORT_MODES)})")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = TokenBucket(rate_per_second, burst)
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transport_mode = transport_mode
+        self.recordings_dir = recordings_dir
+        # Un transporte explícito (p. ej. httpx.MockTransport) reemplaza al del modo
+        self._custom_transport = transport
+        self._transport: Optional["httpx.AsyncBaseTransport"] = None
+        self.metrics = CallMetrics()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    @classmethod
+    def from_env(cls, base_url: str) -> "SerpClient":
+        """Crea el cliente leyendo la configuración de variables de entorno"""
+        return cls(
+            base_url,
+            max_concurrency=int(os.getenv("SERP_MAX_CONCURRENCY", "5")),
+            rate_per_second=float(os.getenv("SERP_RATE_LIMIT_PER_SEC", "10")),
+            burst=int(os.getenv("SERP_RATE_BURST", "5")),
+            max_connections=int(os.getenv("SERP_POOL_SIZE", "10")),
+            connect_timeout=float(os.getenv("SERP_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("SERP_READ_TIMEOUT", "30")),
+            max_retries=int(os.getenv("SERP_MAX_RETRIES", "3")),
+            transport_mode=os.getenv("SERP_TRANSPORT", "live").lower(),
+            recordings_dir=os.getenv("SERP_RECORDINGS_DIR", "serp_recordings"),
+        )
+
+    @property
+    def requires_api_key(self) -> bool:
+        """En replay las respuestas salen de disco y no hace falta SERP_API_KEY"""
+        return self.transport_mode != "replay"
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        # httpx se importa con el primer cliente para no cargarlo en el arranque
+        import httpx
+
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+            self._transport = self._custom_transport
+            if self._transport is None:
+                from serp_transport import create_transport
+                self._transport = create_transport(self.transport_mode, self.recordings_dir, limits)
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                transport=self._transport
+            )
+        return self._client
+
+    async def search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Ejecuta una consulta respetando concurrencia, tasa y política de reintentos"""
+        import httpx
+
+        attempt = 0
+        while True:
+            retry_delay = None
+
+            async with self._semaphore:
+                await self.rate_limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    response = await self.client.get(self.base_url, params=params)
+                except httpx.TransportError:
+                    self.metrics.record(time.perf_counter() - started, ok=False)
+                    if attempt >= self.max_retries:
+                        raise
+                else:
+                    ok = response.status_code < 400
+                    self.metrics.record(time.perf_counter() - started, ok=ok)
+                    if ok:
+                        return response.json()
+                    if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                    retry_delay = self._parse_retry_after(response.headers.get("Retry-After"))
+
+            # Esperar fuera del semáforo para no bloquear otras consultas
+            if retry_delay is None:
+                retry_delay = self._backoff_delay(attempt)
+            attempt += 1
+            self.metrics.counters['retries'] += 1
+            await asyncio.sleep(min(retry_delay, self.backoff_max))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Backoff exponencial con jitter"""
+        delay = self.backoff_base * (2 ** attempt)
+        return delay + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Interpreta el encabezado Retry-After en segundos o como fecha HTTP"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics.stats(),
+            'max_concurrency': self.max_concurrency,
+            'max_connections': self.max_connections,
+            'transport': self.transport_mode,
+            **(self._transport.stats() if hasattr(self._transport, 'stats') else {})
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
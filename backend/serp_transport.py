@@ -0,0 +1,121 @@
+# backend/serp_transport.py
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from serp_client import TRANSPORT_MODES
+
+# La API key no forma parte de la clave: las grabaciones sirven con cualquier key (o sin ella)
+IGNORED_PARAMS = {'api_key'}
+
+# El cuerpo se guarda ya decodificado; estos encabezados describirían la respuesta original
+_STALE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def recording_key(params: Iterable[Tuple[str, str]]) -> str:
+    relevant = sorted((key, str(value)) for key, value in params if key not in IGNORED_PARAMS)
+    return hashlib.sha256(json.dumps(relevant, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class RecordingStore:
+    """Respuestas de SERPAPI en disco, un JSON por combinación de parámetros"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, params: Dict[str, str], status_code: int, body: Any) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Escritura atómica: una réplica concurrente nunca lee un archivo a medias
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'status_code': status_code, 'body': body}, f, ensure_ascii=False)
+        os.replace(temporary, path)
+
+
+def _request_params(request: httpx.Request) -> Tuple[str, Dict[str, str]]:
+    items = request.url.params.multi_items()
+    return recording_key(items), {key: value for key, value in items if key not in IGNORED_PARAMS}
+
+
+class RecordTransport(httpx.AsyncBaseTransport):
+    """Llama a SERPAPI a través de inner y guarda cada respuesta exitosa"""
+
+    def __init__(self, store: RecordingStore, inner: httpx.AsyncBaseTransport):
+        self.store = store
+        self.inner = inner
+        self.counters = {'recorded': 0, 'record_errors': 0}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        if response.status_code >= 400:
+            return response
+
+        content = await response.aread()
+        await response.aclose()
+        key, params = _request_params(request)
+        try:
+            body = json.loads(content)
+            # Las grabaciones se comparten: no deben llevar la key aunque la respuesta la repita
+            if isinstance(body, dict) and isinstance(body.get('search_parameters'), dict):
+                body['search_parameters'].pop('api_key', None)
+            await asyncio.to_thread(self.store.save, key, params, response.status_code, body)
+            self.counters['recorded'] += 1
+        except (OSError, ValueError):
+            # Grabar es secundario: la respuesta llega igual a la búsqueda
+            self.counters['record_errors'] += 1
+
+        headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() not in _STALE_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Responde solo con grabaciones; una consulta no grabada devuelve 404 sin tocar la red"""
+
+    def __init__(self, store: RecordingStore):
+        self.store = store
+        self.counters = {'replayed': 0, 'replay_misses': 0}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key, _ = _request_params(request)
+        recorded = await asyncio.to_thread(self.store.load, key)
+        if recorded is None:
+            self.counters['replay_misses'] += 1
+            return httpx.Response(404, json={'error': f"Consulta no grabada ({key[:12]})"})
+        self.counters['replayed'] += 1
+        return httpx.Response(recorded['status_code'], json=recorded['body'])
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+def create_transport(mode: str, recordings_dir: str, limits: httpx.Limits) -> Optional[httpx.AsyncBaseTransport]:
+    """Transporte de SERP_TRANSPORT; None en modo live (el de httpx por defecto)"""
+    if mode == "live":
+        return None
+    store = RecordingStore(recordings_dir)
+    if mode == "record":
+        return RecordTransport(store, httpx.AsyncHTTPTransport(limits=limits))
+    if mode == "replay":
+        return ReplayTransport(store)
+    raise ValueError(f"SERP_TRANSPORT desconocido: {mode} (opciones: {', '.join(TRANSPORT_MODES)})")
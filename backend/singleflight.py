@@ -0,0 +1,39 @@
+# backend/singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave en una sola ejecución.
+
+    La ejecución corre en su propia tarea, así que si el primer cliente se
+    desconecta los demás siguen recibiendo el resultado.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.counters = {'calls': 0, 'executions': 0, 'coalesced': 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.counters['calls'] += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.counters['executions'] += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.counters['coalesced'] += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Evita el aviso de excepción no recuperada cuando todos los clientes se fueron
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'in_flight': len(self._in_flight)}
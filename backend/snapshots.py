@@ -0,0 +1,276 @@
+# backend/snapshots.py
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from log_setup import LOGGER_NAME, bind_log_context, new_id
+from news_record import NewsRecord
+
+logger = logging.getLogger(f"{LOGGER_NAME}.snapshots")
+
+# Recibe la solicitud del catálogo y el results_id del snapshot; devuelve la respuesta serializada en JSON
+SnapshotBuilder = Callable[[Dict[str, Any], str], Awaitable[bytes]]
+KeyFunction = Callable[[Dict[str, Any]], str]
+
+
+def load_catalog(path: str) -> List[Dict[str, Any]]:
+    """Catálogo de temas: lista JSON de solicitudes de análisis o de nombres de tecnología"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    return [{'search_terms': [{'value': entry}]} if isinstance(entry, str) else entry for entry in entries]
+
+
+def parse_window(value: str) -> Optional[Tuple[int, int]]:
+    """Horas locales "2-6" (puede cruzar medianoche, "22-4"); vacío = a cualquier hora"""
+    if not value.strip():
+        return None
+    start, end = (int(part) for part in value.split('-'))
+    return start % 24, end % 24
+
+
+class Snapshot:
+    """Respuesta materializada de un tema del catálogo, comprimida con gzip"""
+
+    __slots__ = ('key', 'request', 'results_id', 'body', 'created_at', 'build_seconds')
+
+    def __init__(self, key: str, request: Dict[str, Any], results_id: str, body: bytes, created_at: float,
+                 build_seconds: float):
+        self.key = key
+        self.request = request
+        self.results_id = results_id
+        self.body = body
+        self.created_at = created_at
+        self.build_seconds = build_seconds
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.created_at
+
+    def json_bytes(self) -> bytes:
+        return gzip.decompress(self.body)
+
+    def to_dict(self, max_age: float) -> Dict[str, Any]:
+        age = self.age()
+        return {
+            'key': self.key,
+            'request': self.request,
+            'created_at': datetime.fromtimestamp(self.created_at).isoformat(),
+            'age_seconds': round(age, 1),
+            'fresh': age <= max_age,
+            'build_seconds': round(self.build_seconds, 3),
+            'size_bytes': len(self.body)
+        }
+
+
+class SnapshotStore:
+    """Persistencia de los snapshots en SQLite (sobreviven a los reinicios)"""
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "key TEXT PRIMARY KEY, request TEXT NOT NULL, results_id TEXT NOT NULL, body BLOB NOT NULL, "
+            "created_at REAL NOT NULL, build_seconds REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def save(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    snapshot.key, json.dumps(snapshot.request), snapshot.results_id, snapshot.body,
+                    snapshot.created_at, snapshot.build_seconds
+                )
+            )
+            self._db.commit()
+
+    def load_all(self) -> List[Snapshot]:
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM snapshots").fetchall()
+        return [Snapshot(row[0], json.loads(row[1]), row[2], row[3], row[4], row[5]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class SnapshotManager:
+    """Precalcula en horario valle el análisis de los temas del catálogo y lo sirve desde memoria.
+
+    Cada snapshot es la respuesta completa ya serializada y comprimida: servirla no busca,
+    no analiza ni serializa. Se sirve mientras tenga menos de max_age segundos; dentro de
+    la ventana horaria se reconstruyen, uno a la vez, los que superan refresh_age.
+    """
+
+    def __init__(
+        self,
+        builder: SnapshotBuilder,
+        key_fn: KeyFunction,
+        catalog: Optional[List[Dict[str, Any]]] = None,
+        db_path: Optional[str] = None,
+        max_age: float = 129600,
+        refresh_age: float = 72000,
+        window: Optional[Tuple[int, int]] = None,
+        check_interval: float = 300,
+    ):
+        self.builder = builder
+        self.max_age = max_age
+        self.refresh_age = refresh_age
+        self.window = window
+        self.check_interval = check_interval
+        self.catalog = {key_fn(request): request for request in catalog or []}
+        self.store = SnapshotStore(db_path) if db_path and self.catalog else None
+        self.counters = {'hits': 0, 'stale': 0, 'builds': 0, 'build_failures': 0}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._by_results_id: Dict[str, Snapshot] = {}
+        # news_results ya decodificados por results_id: se descomprime y parsea una vez, no en cada página
+        self._news_results: Dict[str, List[Dict[str, Any]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._force = False
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, builder: SnapshotBuilder, key_fn: KeyFunction) -> "SnapshotManager":
+        """Sin HYPECYCLE_SNAPSHOT_CATALOG no hay catálogo y el subsistema queda inactivo"""
+        catalog_path = os.getenv("HYPECYCLE_SNAPSHOT_CATALOG")
+        return cls(
+            builder,
+            key_fn,
+            catalog=load_catalog(catalog_path) if catalog_path else None,
+            db_path=os.getenv("HYPECYCLE_SNAPSHOTS_DB", "snapshots.sqlite3") or None,
+            max_age=float(os.getenv("HYPECYCLE_SNAPSHOT_MAX_AGE", "129600")),
+            refresh_age=float(os.getenv("HYPECYCLE_SNAPSHOT_REFRESH_AGE", "72000")),
+            window=parse_window(os.getenv("HYPECYCLE_SNAPSHOT_WINDOW", "2-6")),
+            check_interval=float(os.getenv("HYPECYCLE_SNAPSHOT_CHECK_INTERVAL", "300")),
+        )
+
+    async def start(self) -> None:
+        if not self.catalog or self._task is not None:
+            return
+        if self.store is not None:
+            # Solo los temas que siguen en el catálogo
+            for snapshot in await asyncio.to_thread(self.store.load_all):
+                if snapshot.key in self.catalog:
+                    self._publish(snapshot)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._scheduler())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def fresh(self, key: str) -> Optional[Snapshot]:
+        """Snapshot servible de la solicitud (misma clave canónica y dentro de max_age)"""
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        if snapshot.age() > self.max_age:
+            self.counters['stale'] += 1
+            return None
+        self.counters['hits'] += 1
+        return snapshot
+
+    def page(self, results_id: str, offset: int, limit: int) -> Optional[Tuple[List[NewsRecord], Optional[int], int]]:
+        """Como ResultStore.page, sobre los news_results de un snapshot publicado"""
+        snapshot = self._by_results_id.get(results_id)
+        if snapshot is None:
+            return None
+        results = self._news_results.get(results_id)
+        if results is None:
+            results = self._news_results[results_id] = json.loads(snapshot.json_bytes())['news_results']
+        end = offset + limit
+        return [NewsRecord.from_dict(item) for item in results[offset:end]], end if end < len(results) else None, len(results)
+
+    def refresh_now(self) -> int:
+        """Reconstruye ya (sin esperar la ventana) los snapshots que faltan o superan refresh_age"""
+        self._force = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return len(self._due())
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        return [snapshot.to_dict(self.max_age) for snapshot in self._snapshots.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            **self.counters,
+            'catalog': len(self.catalog),
+            'snapshots': len(self._snapshots),
+            'fresh': sum(1 for snapshot in self._snapshots.values() if snapshot.age(now) <= self.max_age)
+        }
+
+    def _publish(self, snapshot: Snapshot) -> None:
+        # Los cursores del snapshot reemplazado expiran, como los de un conjunto de ResultStore
+        previous = self._snapshots.get(snapshot.key)
+        if previous is not None:
+            self._by_results_id.pop(previous.results_id, None)
+            self._news_results.pop(previous.results_id, None)
+        self._snapshots[snapshot.key] = snapshot
+        self._by_results_id[snapshot.results_id] = snapshot
+
+    def _in_window(self) -> bool:
+        if self.window is None:
+            return True
+        start, end = self.window
+        hour = datetime.now().hour
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    def _due(self) -> List[str]:
+        """Temas sin snapshot o con uno más viejo que refresh_age, el más viejo primero"""
+        now = time.time()
+        due = [
+            key for key in self.catalog
+            if key not in self._snapshots or self._snapshots[key].age(now) >= self.refresh_age
+        ]
+        return sorted(due, key=lambda key: self._snapshots[key].created_at if key in self._snapshots else 0)
+
+    async def _scheduler(self) -> None:
+        while True:
+            # Se limpia antes de la tanda: un refresh_now() durante la tanda dispara otra enseguida
+            self._wakeup.clear()
+            if self._force or self._in_window():
+                self._force = False
+                for key in self._due():
+                    await self._build(key)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _build(self, key: str) -> None:
+        request = self.catalog[key]
+        results_id = f"snapshot-{new_id()}"
+        started = time.perf_counter()
+        try:
+            with bind_log_context(request_id=results_id):
+                content = await self.builder(request, results_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.counters['build_failures'] += 1
+            logger.warning("Error precalculando snapshot", extra={"snapshot_key": key, "error": str(e)})
+            return
+
+        build_seconds = time.perf_counter() - started
+        snapshot = Snapshot(key, request, results_id, gzip.compress(content, compresslevel=6), time.time(), build_seconds)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.save, snapshot)
+        self._publish(snapshot)
+        self.counters['builds'] += 1
+        logger.info("Snapshot precalculado", extra={
+            "snapshot_key": key, "build_seconds": round(build_seconds, 3), "size_bytes": len(snapshot.body)
+        })
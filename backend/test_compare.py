@@ -0,0 +1,74 @@
+# backend/test_compare.py
+import asyncio
+import re
+from datetime import datetime
+
+import httpx
+
+import main
+
+CURRENT_YEAR = datetime.now().year
+
+# Años con noticias de cada tema; "vaporware" no tiene ninguna
+TOPIC_YEARS = {
+    "graphene": range(CURRENT_YEAR - 8, CURRENT_YEAR + 1),
+    "perovskite": range(CURRENT_YEAR - 3, CURRENT_YEAR + 1),
+}
+
+
+def topic_page(request):
+    query = request.url.params["q"]
+    start, end = (int(year) for year in re.findall(r'(?:after|before):(\d{4})', query))
+    topic = next((name for name in TOPIC_YEARS if name in query), None)
+    years = [year for year in TOPIC_YEARS.get(topic, ()) if start <= year <= end]
+    return httpx.Response(200, json={"news_results": [
+        {
+            "title": f"{topic} {year} story {index}",
+            "link": f"https://news.example.com/{topic}/{year}/{index}",
+            "snippet": f"{topic} research story number {index} from {year} with lab and market details",
+            "source": "AP",
+            "date": f"{year}-04-0{index + 1}"
+        }
+        for year in years for index in range(year - years[0] + 1 if years else 0)
+    ]})
+
+
+def compare(analyzer, monkeypatch, *topics):
+    monkeypatch.setenv("SERP_API_KEY", "key")
+    analyzer.serp_client._custom_transport = httpx.MockTransport(topic_page)
+    body = {"topics": [{"search_terms": [{"value": topic}]} for topic in topics]}
+
+    async def send():
+        async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+            return await client.post("/api/hypecycle/compare", json=body)
+
+    return asyncio.run(send())
+
+
+def test_series_are_aligned_to_the_union_of_years(analyzer, monkeypatch):
+    response = compare(analyzer, monkeypatch, "graphene", "perovskite")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['years'] == list(TOPIC_YEARS["graphene"])
+    graphene, perovskite = data['topics']
+    assert len(graphene['mention_counts']) == len(perovskite['mention_counts']) == len(data['years'])
+    assert perovskite['mention_counts'][:5] == [0] * 5
+    assert perovskite['sentiment_means'][:5] == [None] * 5
+    assert sum(perovskite['mention_counts']) == perovskite['total_mentions']
+
+
+def test_a_failing_topic_does_not_fail_the_comparison(analyzer, monkeypatch):
+    response = compare(analyzer, monkeypatch, "graphene", "vaporware")
+
+    data = response.json()
+    assert data['success']
+    assert data['topics'][1]['success'] is False
+    assert data['topics'][1]['error'] == "No se encontraron resultados"
+    assert data['topics'][1]['mention_counts'] == []
+
+
+def test_topic_limit(analyzer, monkeypatch):
+    response = compare(analyzer, monkeypatch, *["graphene"] * (main.COMPARE_MAX_TOPICS + 1))
+
+    assert response.status_code == 400
@@ -0,0 +1,82 @@
+# backend/test_date_normalizer.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import pytest
+
+from date_normalizer import DateNormalizer
+
+NOW = datetime(2025, 3, 31, 15, 30)
+
+
+@pytest.fixture
+def clock():
+    return DateNormalizer().clock(NOW)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2023-07-04", date(2023, 7, 4)),
+    ("2023-7-4T10:00:00Z", date(2023, 7, 4)),
+    ("07/04/2023, 10:00 AM, +0000 UTC", date(2023, 7, 4)),
+    ("Jul 4, 2023", date(2023, 7, 4)),
+    ("July 4, 2023", date(2023, 7, 4)),
+    ("Sept. 4, 2023", date(2023, 9, 4)),
+    ("2019", date(2019, 1, 1)),
+])
+def test_absolute_formats(clock, text, expected):
+    assert clock.parse(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("today", date(2025, 3, 31)),
+    ("yesterday", date(2025, 3, 30)),
+    ("5 hours ago", date(2025, 3, 31)),
+    ("16 hours ago", date(2025, 3, 30)),
+    ("3 days ago", date(2025, 3, 28)),
+    ("2 weeks ago", date(2025, 3, 17)),
+    ("a month ago", date(2025, 2, 28)),
+    ("1 year ago", date(2024, 3, 31)),
+])
+def test_relative_dates_use_the_clock(clock, text, expected):
+    assert clock.parse(text) == expected
+
+
+def test_embedded_year_is_the_last_resort(clock):
+    assert clock.parse("Updated in 2021 edition") == date(2021, 1, 1)
+    assert clock.parse("Invalid 2023-02-30") == date(2023, 1, 1)
+
+
+def test_future_or_unknown_dates_fall_back_to_today(clock):
+    assert clock.parse("Published 2099") == date(2025, 3, 31)
+    assert clock.parse("sometime") == date(2025, 3, 31)
+    assert clock.parse("") == date(2025, 3, 31)
+
+
+def test_relative_dates_are_not_shared_between_clocks():
+    normalizer = DateNormalizer()
+
+    assert normalizer.clock(NOW).year("3 months ago") == 2024
+    assert normalizer.clock(datetime(2025, 6, 1)).year("3 months ago") == 2025
+    assert normalizer.stats()['memo_entries'] == 1
+
+
+def test_absolute_memo_is_bounded():
+    normalizer = DateNormalizer(max_entries=2)
+    clock = normalizer.clock(NOW)
+
+    for year in (2020, 2021, 2022):
+        clock.parse(f"{year}-01-01")
+
+    assert normalizer.stats()['memo_entries'] <= 2
+
+
+def test_memo_is_safe_to_share_between_threads():
+    # Memo diminuto: los hilos lo vacían continuamente mientras otros lo leen
+    normalizer = DateNormalizer(max_entries=4)
+    clock = normalizer.clock(NOW)
+    texts = [f"{year}-0{month}-01" for year in range(2000, 2020) for month in range(1, 10)] * 20
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        parsed = list(executor.map(clock.parse, texts))
+
+    assert parsed == [date.fromisoformat(text) for text in texts]
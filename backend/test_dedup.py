@@ -0,0 +1,90 @@
+# backend/test_dedup.py
+import pytest
+
+from dedup import NearDuplicateIndex
+from news_record import NewsRecord
+
+STORY = (
+    "Solid state battery maker raises new funding to expand production capacity in Germany "
+    "as automakers race to secure supply for electric vehicles next year"
+)
+EDITED = STORY.replace("next year", "in 2027")
+OTHER = (
+    "Regulators open an inquiry into wind farm subsidies after a report found delays "
+    "in grid connection approvals across several northern regions"
+)
+
+
+def record(title, link, snippet=STORY, year=2024):
+    return NewsRecord(title, link, snippet, "Reuters", f"{year}-05-01", year, 0.1)
+
+
+def test_syndicated_copies_share_a_representative():
+    index = NearDuplicateIndex(threshold=0.6)
+
+    assert index.cluster([STORY, OTHER, EDITED, STORY]) == [0, 1, 0, 0]
+
+
+def test_threshold_one_only_groups_identical_texts():
+    index = NearDuplicateIndex(threshold=1.0)
+
+    assert index.cluster([STORY, EDITED, STORY]) == [0, 1, 0]
+
+
+def test_half_shared_text_is_not_a_duplicate():
+    index = NearDuplicateIndex(threshold=0.6)
+    mixed = " ".join(STORY.split()[:12] + OTHER.split()[12:])
+
+    assert index.cluster([STORY, OTHER, mixed]) == [0, 1, 2]
+
+
+def test_texts_without_shingles_are_their_own_group():
+    index = NearDuplicateIndex(threshold=0.6)
+
+    assert index.cluster(["", "two words", ""]) == [0, 1, 2]
+
+
+def test_word_hash_memo_is_bounded():
+    index = NearDuplicateIndex(threshold=0.6, max_words=8)
+
+    assert index.cluster([STORY, OTHER, EDITED]) == [0, 1, 0]
+    assert len(index._word_hashes) <= 8
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=32, bands=5)
+
+
+def test_remove_duplicates_counts_syndication(analyzer):
+    results = [
+        record("Battery funding", "https://a.example/1"),
+        record("Wind inquiry", "https://b.example/1", OTHER),
+        record("Battery funding", "https://c.example/1"),
+        record("Battery funding round", "https://d.example/1", EDITED),
+        record("Other title", "https://a.example/1", OTHER),
+    ]
+
+    unique = analyzer._remove_duplicates(results)
+
+    assert [result.link for result in unique] == ["https://a.example/1", "https://b.example/1"]
+    assert [result.syndication_count for result in unique] == [4, 1]
+
+
+def test_fold_duplicates_against_stored_items(analyzer):
+    stored = [record("Battery funding", "https://a.example/1")]
+    fetched = [
+        record("Battery funding", "https://a.example/1"),
+        record("Battery funding round", "https://d.example/1", EDITED),
+        record("Wind inquiry", "https://b.example/1", OTHER),
+        record("Wind inquiry", "https://e.example/1", OTHER),
+    ]
+
+    new_results, copies = analyzer._fold_duplicates(stored, fetched)
+
+    assert [result.link for result in new_results] == ["https://b.example/1"]
+    assert [(link, copy.link) for link, copy in copies] == [
+        ("https://a.example/1", "https://a.example/1"),
+        ("https://a.example/1", "https://d.example/1"),
+        ("https://b.example/1", "https://e.example/1"),
+    ]
@@ -0,0 +1,38 @@
+# backend/test_executor.py
+import asyncio
+
+import pytest
+
+from main import AnalysisExecutor
+
+
+def doubled(batch, factor):
+    return [item * factor for item in batch]
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+def test_batches_keep_the_original_order(mode):
+    executor = AnalysisExecutor(mode, workers=3, batch_size=7, inline_max=10)
+    try:
+        result = asyncio.run(executor.map_batches(doubled, list(range(100)), 2))
+    finally:
+        executor.shutdown()
+
+    assert result == [item * 2 for item in range(100)]
+
+
+def test_small_batches_run_inline():
+    executor = AnalysisExecutor("thread", batch_size=7, inline_max=10)
+
+    asyncio.run(executor.map_batches(doubled, list(range(10)), 1))
+    asyncio.run(executor.map_batches(doubled, list(range(30)), 1))
+    executor.shutdown()
+
+    assert executor.stats()['inline_batches'] == 1
+    assert executor.stats()['pooled_batches'] == 1
+    assert executor.stats()['chunks'] == 5
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        AnalysisExecutor("gpu")
@@ -0,0 +1,160 @@
+# backend/test_jobs.py
+import asyncio
+
+import pytest
+
+import main
+from jobs import COMPLETED, FAILED, QUEUED, RUNNING, JobError, JobManager, JobStore
+
+
+async def wait_finished(manager, job_id):
+    for _ in range(200):
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        await asyncio.sleep(0.005)
+    raise AssertionError("el trabajo no terminó")
+
+
+def test_job_runs_through_its_states():
+    async def scenario():
+        release = asyncio.Event()
+        seen = []
+
+        async def runner(payload, progress):
+            progress({'ranges': 1})
+            await release.wait()
+            return {'echo': payload['value']}
+
+        manager = JobManager(runner, workers=1)
+        await manager.start()
+        job, coalesced = manager.submit("key", {'value': 7})
+        seen.append(job.status)
+        await asyncio.sleep(0.01)
+        seen.append(job.status)
+        release.set()
+        job = await wait_finished(manager, job.id)
+        await manager.stop()
+        return job, coalesced, seen, manager
+
+    job, coalesced, seen, manager = asyncio.run(scenario())
+
+    assert not coalesced
+    assert seen == [QUEUED, RUNNING]
+    assert job.status == COMPLETED
+    assert job.result == {'echo': 7}
+    assert job.progress == {'ranges': 1}
+    assert manager.stats()['in_flight'] == 0
+
+
+def test_identical_jobs_in_flight_are_coalesced():
+    async def scenario():
+        release = asyncio.Event()
+        runs = []
+
+        async def runner(payload, progress):
+            runs.append(payload)
+            await release.wait()
+            return {}
+
+        manager = JobManager(runner, workers=2)
+        await manager.start()
+        first, _ = manager.submit("key", {})
+        second, coalesced = manager.submit("key", {})
+        release.set()
+        await wait_finished(manager, first.id)
+        # Terminado el primero, la misma clave vuelve a ejecutarse
+        third, third_coalesced = manager.submit("key", {})
+        await wait_finished(manager, third.id)
+        await manager.stop()
+        return first, second, coalesced, third, third_coalesced, runs
+
+    first, second, coalesced, third, third_coalesced, runs = asyncio.run(scenario())
+
+    assert coalesced and second is first
+    assert not third_coalesced and third.id != first.id
+    assert len(runs) == 2
+
+
+@pytest.mark.parametrize("error, expected", [
+    (JobError(404, "No se encontraron resultados"), {'status_code': 404, 'detail': "No se encontraron resultados"}),
+    (RuntimeError("boom"), {'status_code': 500, 'detail': "Error interno: boom"}),
+])
+def test_failures_are_reported_with_their_status(error, expected):
+    async def scenario():
+        async def runner(payload, progress):
+            raise error
+
+        manager = JobManager(runner, workers=1)
+        await manager.start()
+        job, _ = manager.submit("key", {})
+        job = await wait_finished(manager, job.id)
+        await manager.stop()
+        return job, manager
+
+    job, manager = asyncio.run(scenario())
+
+    assert job.status == FAILED
+    assert job.error == expected
+    assert manager.counters['failed'] == 1
+
+
+def test_submit_requires_start():
+    async def runner(payload, progress):
+        return {}
+
+    with pytest.raises(RuntimeError):
+        JobManager(runner).submit("key", {})
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def never(payload, progress):
+        await asyncio.Event().wait()
+
+    async def runner(payload, progress):
+        return {'resumed': payload['value']}
+
+    async def scenario():
+        manager = JobManager(never, workers=1, db_path=db_path)
+        await manager.start()
+        job, _ = manager.submit("key", {'value': 3})
+        await asyncio.sleep(0.01)
+        await manager.stop()
+
+        restarted = JobManager(runner, workers=1, db_path=db_path)
+        await restarted.start()
+        resumed = await wait_finished(restarted, job.id)
+        await restarted.stop()
+        return resumed
+
+    resumed = asyncio.run(scenario())
+
+    assert resumed.status == COMPLETED
+    assert resumed.result == {'resumed': 3}
+    store = JobStore(db_path)
+    assert store.unfinished() == []
+    assert store.load(resumed.id).status == COMPLETED
+    store.close()
+
+
+def request_key(*terms, min_year=2014):
+    return main.canonical_request_key(main.HypeCycleRequest(
+        search_terms=[{'value': value, 'operator': operator} for value, operator in terms], min_year=min_year
+    ))
+
+
+def test_commutative_queries_share_a_key():
+    assert request_key(("AI", "AND"), ("crypto", "AND")) == request_key(("crypto", "AND"), (" ai ", "AND"))
+    assert request_key(("ai", "OR"), ("crypto", "AND")) == request_key(("crypto", "OR"), ("ai", "NOT"))
+
+
+def test_not_queries_keep_their_term_order():
+    assert request_key(("ai", "NOT"), ("crypto", "AND")) != request_key(("crypto", "NOT"), ("ai", "AND"))
+    assert request_key(("ai", "AND"), ("ml", "NOT"), ("crypto", "AND")) != request_key(("ml", "AND"), ("ai", "NOT"), ("crypto", "AND"))
+
+
+def test_mixed_operators_and_years_change_the_key():
+    assert request_key(("ai", "AND"), ("ml", "OR"), ("crypto", "AND")) != request_key(("ml", "AND"), ("ai", "OR"), ("crypto", "AND"))
+    assert request_key(("ai", "AND")) != request_key(("ai", "AND"), min_year=2018)
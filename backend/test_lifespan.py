@@ -0,0 +1,15 @@
+# backend/test_lifespan.py
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_lifespan_starts_workers_and_closes_the_analyzer(analyzer):
+    http_client = analyzer.serp_client.client
+
+    with TestClient(main.app) as client:
+        assert main.job_manager._worker_tasks
+        assert client.get("/metrics").status_code == 200
+
+    assert main.job_manager._worker_tasks == []
+    assert http_client.is_closed
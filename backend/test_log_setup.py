@@ -0,0 +1,43 @@
+# backend/test_log_setup.py
+import json
+import logging
+
+from log_setup import ContextFilter, JsonFormatter, SamplingFilter, bind_log_context, current_log_context
+
+
+def make_record(msg="Búsqueda completada", **extra):
+    record = logging.LogRecord("hypecycle.test", logging.INFO, __file__, 1, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_context_ids_are_bound_and_restored():
+    with bind_log_context(request_id="req-1"):
+        with bind_log_context(analysis_id="an-1"):
+            assert current_log_context() == {'request_id': "req-1", 'analysis_id': "an-1"}
+        assert current_log_context() == {'request_id': "req-1"}
+    assert current_log_context() == {}
+
+
+def test_json_lines_carry_ids_and_extra_fields():
+    record = make_record(api_calls=3)
+    with bind_log_context(request_id="req-1"):
+        ContextFilter().filter(record)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload['message'] == "Búsqueda completada"
+    assert payload['level'] == "INFO"
+    assert payload['request_id'] == "req-1"
+    assert payload['api_calls'] == 3
+    assert 'analysis_id' not in payload
+
+
+def test_sampling_passes_a_burst_then_one_in_every():
+    sampling = SamplingFilter(burst=2, every=5, window=60)
+
+    passed = [count for count in (sampling.allow("rate-limit") for _ in range(12)) if count is not None]
+
+    assert passed == [1, 2, 5, 10]
+    assert sampling.suppressed == 8
+    assert sampling.allow("other") == 1
@@ -0,0 +1,45 @@
+# backend/test_metrics.py
+import pytest
+
+from metrics import Registry
+
+
+def test_counter_and_histogram_text_format():
+    registry = Registry()
+    requests = registry.counter("hc_requests_total", "Solicitudes", ["route"])
+    latency = registry.histogram("hc_seconds", "Latencia", buckets=(0.1, 1.0))
+
+    requests.inc(route="/analyze")
+    requests.inc(2, route="/analyze")
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+    assert 'hc_requests_total{route="/analyze"} 3' in lines
+    assert lines[lines.index("# TYPE hc_seconds histogram") + 1:] == [
+        'hc_seconds_bucket{le="0.1"} 1',
+        'hc_seconds_bucket{le="1"} 2',
+        'hc_seconds_bucket{le="+Inf"} 2',
+        'hc_seconds_sum 0.55',
+        'hc_seconds_count 2',
+    ]
+
+
+def test_collectors_are_read_at_export_time():
+    registry = Registry()
+    queue = []
+    registry.register_collector(lambda: [("hc_queue_depth", "gauge", "Cola", [({}, len(queue))])])
+
+    queue.extend([1, 2])
+
+    assert "hc_queue_depth 2" in registry.render().splitlines()
+
+
+def test_labels_must_match_and_names_are_unique():
+    registry = Registry()
+    counter = registry.counter("hc_total", "Total", ["stage"])
+
+    with pytest.raises(ValueError):
+        counter.inc(route="x")
+    with pytest.raises(ValueError):
+        registry.counter("hc_total", "Otra vez")
@@ -0,0 +1,159 @@
+# backend/test_query_planner.py
+from query_planner import QueryPlanner
+
+
+def run_plan(plan, results_per_year, fail=()):
+    """Ejecuta el plan como iter_search_pages: cada consulta devuelve min(página, resultados restantes)"""
+    pending = [(date_range, 0) for date_range in plan.initial_ranges]
+    queries = []
+    while pending:
+        date_range, start = pending.pop(0)
+        queries.append((date_range, start))
+        if (date_range, start) in fail:
+            pending.extend(plan.advance(date_range, start, None, retryable=True))
+            continue
+        total = sum(results_per_year.get(year, 0) for year in range(date_range[0], date_range[1] + 1))
+        count = max(0, min(plan.planner.page_size, total - start))
+        pending.extend(plan.advance(date_range, start, count))
+    return queries
+
+
+def test_unsaturated_period_is_a_single_query():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    plan = planner.plan("solar", 2014, 2026)
+
+    queries = run_plan(plan, {2020: 40})
+
+    assert queries == [((2014, 2026), 0)]
+    assert plan.summary()['planned_calls'] == 1
+    assert not plan.from_history
+
+
+def test_saturated_range_is_bisected():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    plan = planner.plan("solar", 2014, 2021)
+
+    queries = run_plan(plan, {year: 20 for year in range(2014, 2022)})
+
+    assert queries == [((2014, 2021), 0), ((2014, 2017), 0), ((2018, 2021), 0)]
+    assert plan.splits == 1
+    assert not plan.budget_exhausted
+
+
+def test_saturated_single_year_is_paginated():
+    planner = QueryPlanner(page_size=100, max_calls=10, max_pages=4, page_window=2)
+    plan = planner.plan("solar", 2024, 2024)
+
+    queries = run_plan(plan, {2024: 250})
+
+    assert queries == [((2024, 2024), 0), ((2024, 2024), 100), ((2024, 2024), 200)]
+    summary = plan.pagination_summary()
+    assert summary['extra_pages'] == 2
+    assert summary['complete_ranges'] == 1
+    assert summary['truncated_ranges'] == 0
+
+
+def test_pages_have_their_own_budget():
+    planner = QueryPlanner(page_size=100, max_calls=10, max_pages=4)
+    plan = planner.plan("solar", 2014, 2026)
+
+    queries = run_plan(plan, {year: 1000 for year in range(2014, 2027)})
+
+    # La bisección agota max_calls, pero las páginas extra siguen disponibles
+    assert plan.budget_exhausted
+    assert plan.calls <= 10
+    assert plan.pages == 4
+    assert len(queries) == plan.summary()['planned_calls'] == plan.calls + plan.pages
+    assert plan.pagination_summary()['truncated_ranges'] > 0
+
+
+# Tema de 13 años con forma de hype cycle: los últimos años saturan una página
+HYPE_COUNTS = dict(zip(range(2014, 2027), [5, 8, 10, 15, 20, 30, 40, 60, 90, 120, 150, 130, 110]))
+
+
+def test_dense_years_are_completed_after_bisection():
+    planner = QueryPlanner(page_size=100, max_calls=10, max_pages=4)
+    plan = planner.plan("solar", 2014, 2026)
+
+    run_plan(plan, HYPE_COUNTS)
+
+    assert plan.budget_exhausted
+    assert plan.pagination_summary()['extra_pages'] > 1
+    assert plan.pagination_summary()['complete_ranges'] >= 1
+
+
+def test_history_plans_paginate_dense_years():
+    planner = QueryPlanner(page_size=100, max_calls=10, max_pages=4)
+    run_plan(planner.plan("solar", 2014, 2026), HYPE_COUNTS)
+
+    plan = planner.plan("solar", 2014, 2026)
+    run_plan(plan, HYPE_COUNTS)
+
+    # La planificación por historial usa max_calls en rangos y aun así pagina
+    assert plan.from_history
+    assert plan.pages > 0
+    complete = [date_range for date_range, paging in plan._paging.items() if paging.done and not paging.outstanding]
+    assert (2024, 2024) in complete
+
+
+def test_page_budget_caps_extra_pages():
+    planner = QueryPlanner(page_size=100, max_calls=50, max_pages=3, page_window=2)
+    plan = planner.plan("solar", 2024, 2024)
+
+    queries = run_plan(plan, {2024: 1000})
+
+    assert len(queries) == 4
+    assert plan.pages == 3
+    assert plan.pagination_summary()['truncated_ranges'] == 1
+
+
+def test_history_plans_ranges_that_fit_a_page():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    counts = {year: 30 for year in range(2014, 2022)}
+    run_plan(planner.plan("Solar", 2014, 2021), counts)
+
+    plan = planner.plan("solar ", 2014, 2021)
+
+    assert plan.from_history
+    assert plan.initial_ranges == [(2014, 2015), (2016, 2017), (2018, 2019), (2020, 2021)]
+    assert run_plan(plan, counts) == [(date_range, 0) for date_range in plan.initial_ranges]
+
+
+def test_transient_failure_is_retried_once():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    plan = planner.plan("solar", 2014, 2026)
+
+    queries = run_plan(plan, {2020: 40}, fail={((2014, 2026), 0)})
+
+    assert queries == [((2014, 2026), 0), ((2014, 2026), 0)]
+    assert plan.all_failed
+    assert plan.summary()['failed_ranges'] == 1
+    assert plan.summary()['retried_ranges'] == 1
+
+
+def test_permanent_failure_is_not_retried():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    plan = planner.plan("solar", 2014, 2026)
+
+    assert plan.advance((2014, 2026), 0, None, retryable=False) == []
+    assert plan.all_failed
+    assert plan.calls == 1
+
+
+def test_retry_respects_the_call_budget():
+    planner = QueryPlanner(page_size=100, max_calls=1)
+    plan = planner.plan("solar", 2014, 2026)
+
+    assert plan.advance((2014, 2026), 0, None, retryable=True) == []
+
+
+def test_partial_failure_is_not_a_total_failure():
+    planner = QueryPlanner(page_size=100, max_calls=10)
+    plan = planner.plan("solar", 2014, 2021)
+    counts = {year: 30 for year in range(2014, 2022)}
+
+    run_plan(plan, counts, fail={((2018, 2021), 0)})
+
+    assert not plan.all_failed
+    assert ((2018, 2021), 0) in plan.failed
+    assert plan.summary()['failed_ranges'] == 1
@@ -0,0 +1,85 @@
+# backend/test_result_paging.py
+import asyncio
+import gzip
+import json
+import re
+
+import httpx
+
+import main
+from snapshots import Snapshot, SnapshotManager
+
+
+def yearly_page(request):
+    """Cuatro noticias por año del rango consultado"""
+    start, end = (int(year) for year in re.findall(r'(?:after|before):(\d{4})', request.url.params["q"]))
+    return httpx.Response(200, json={"news_results": [
+        {
+            "title": f"Graphene {year} report {index}",
+            "link": f"https://news.example.com/graphene/{year}/{index}",
+            "snippet": f"Graphene {['growth', 'risk', 'funding', 'patent'][index]} story from {year} about new materials",
+            "source": "AP",
+            "date": f"{year}-03-1{index}"
+        }
+        for year in range(start, end + 1) for index in range(4)
+    ]})
+
+
+def test_first_page_and_cursor_pages_cover_all_results(analyzer, monkeypatch):
+    monkeypatch.setenv("SERP_API_KEY", "key")
+    analyzer.serp_client._custom_transport = httpx.MockTransport(yearly_page)
+    body = {"search_terms": [{"value": "graphene"}]}
+
+    async def send():
+        async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+            full = (await client.post("/api/hypecycle/analyze", json=body)).json()
+            first = (await client.post("/api/hypecycle/analyze?fields=phase,news_results&page_size=7", json=body)).json()
+            pages, cursor = [first], first['next_cursor']
+            while cursor:
+                pages.append((await client.get("/api/hypecycle/results", params={"cursor": cursor, "limit": 7})).json())
+                cursor = pages[-1]['next_cursor']
+            return full, pages
+
+    full, pages = asyncio.run(send())
+
+    first = pages[0]
+    assert set(first) == {'phase', 'news_results', 'results_id', 'total_results', 'next_cursor'}
+    assert len(first['news_results']) == 7
+    assert first['total_results'] == full['total_results'] == len(full['news_results'])
+    assert [item['link'] for page in pages for item in page['news_results']] == \
+        [item['link'] for item in full['news_results']]
+
+
+def snapshot(key, results_id, links):
+    body = json.dumps({"news_results": [
+        {"title": link, "link": link, "snippet": "snippet", "source": "AP", "date": "2024", "year": 2024, "sentiment": 0.0}
+        for link in links
+    ]}).encode()
+    return Snapshot(key, {}, results_id, gzip.compress(body), 0.0, 0.0)
+
+
+def test_snapshot_pages_decode_the_body_once(monkeypatch):
+    decoded = []
+    json_bytes = Snapshot.json_bytes
+    monkeypatch.setattr(Snapshot, 'json_bytes', lambda self: decoded.append(self.results_id) or json_bytes(self))
+    manager = SnapshotManager(None, lambda request: "")
+    manager._publish(snapshot("graphene", "r1", ["a", "b", "c"]))
+
+    first, next_offset, total = manager.page("r1", 0, 2)
+    second, last_offset, _ = manager.page("r1", next_offset, 2)
+
+    assert [record.link for record in first + second] == ["a", "b", "c"]
+    assert (next_offset, last_offset, total) == (2, None, 3)
+    assert decoded == ["r1"]
+
+
+def test_replacing_a_snapshot_expires_its_cursors():
+    manager = SnapshotManager(None, lambda request: "")
+    manager._publish(snapshot("graphene", "r1", ["a"]))
+    manager.page("r1", 0, 1)
+
+    manager._publish(snapshot("graphene", "r2", ["b"]))
+
+    assert manager.page("r1", 0, 1) is None
+    assert manager.page("r2", 0, 1)[0][0].link == "b"
+    assert "r1" not in manager._news_results
@@ -0,0 +1,157 @@
+# backend/test_search_failures.py
+import asyncio
+import json
+import re
+from datetime import datetime
+
+import httpx
+import pytest
+
+import main
+from topic_store import TopicStore
+
+REQUEST = {"search_terms": [{"value": "solid battery"}]}
+CURRENT_YEAR = datetime.now().year
+
+
+def news_page(request):
+    """Tres noticias por año consultado, con enlaces propios del rango"""
+    query = request.url.params["q"]
+    start, end = (int(year) for year in re.findall(r'(?:after|before):(\d{4})', query))
+    return [
+        {
+            "title": f"Solid battery {year} story {index}",
+            "link": f"https://news.example.com/{year}/{index}",
+            "snippet": f"Solid battery update number {index} published during {year} with new details",
+            "source": "Reuters",
+            "date": f"{year}-06-0{index + 1}"
+        }
+        for year in range(start, end + 1) for index in range(3)
+    ]
+
+
+class Upstream:
+    """SERPAPI falso: responde páginas o el código de error configurado, y cuenta las llamadas"""
+
+    def __init__(self, status=200, failing_years=()):
+        self.status = status
+        self.failing_years = set(failing_years)
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        query = request.url.params["q"]
+        if self.status != 200 or any(f"after:{year}" in query for year in self.failing_years):
+            return httpx.Response(self.status if self.status != 200 else 503, json={"error": "upstream"})
+        return httpx.Response(200, json={"news_results": news_page(request)})
+
+
+@pytest.fixture
+def upstream(analyzer, monkeypatch):
+    monkeypatch.setenv("SERP_API_KEY", "secret-key")
+    monkeypatch.setattr(main, "_topic_store", TopicStore(":memory:"))
+    analyzer.serp_client.max_retries = 0
+    fake = Upstream()
+    analyzer.serp_client._custom_transport = httpx.MockTransport(fake)
+    return fake
+
+
+def post(path, body=REQUEST):
+    async def send():
+        async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+            return await client.post(path, json=body)
+    return asyncio.run(send())
+
+
+def topic_watermark():
+    topic = main.get_topic_store().get_topic(main.canonical_request_key(main.HypeCycleRequest(**REQUEST)))
+    return topic and topic['watermark_year']
+
+
+def test_rejected_key_is_a_search_error(upstream):
+    upstream.status = 401
+
+    response = post("/api/hypecycle/analyze")
+
+    assert response.status_code == 400
+    assert response.json()['detail'].startswith("Error en búsqueda")
+    assert "secret-key" not in response.text
+    assert upstream.calls == 1
+
+
+def test_outage_is_retried_once_then_reported(upstream):
+    upstream.status = 503
+
+    response = post("/api/hypecycle/analyze")
+
+    assert response.status_code == 400
+    assert upstream.calls == 2
+
+
+def test_stream_reports_search_errors(upstream):
+    upstream.status = 503
+
+    response = post("/api/hypecycle/analyze/stream")
+
+    last_event = json.loads(response.text.strip().splitlines()[-1])
+    assert last_event['type'] == 'error'
+    assert last_event['status_code'] == 400
+
+
+def test_analysis_survives_a_failed_range(analyzer, upstream):
+    analyzer.query_planner.page_size = 3
+    upstream.failing_years = {CURRENT_YEAR - 5}
+
+    response = post("/api/hypecycle/analyze")
+
+    assert response.status_code == 200
+    assert response.json()['analysis']['metrics']['search']['failed_ranges'] >= 1
+
+
+def test_refresh_outage_creates_no_topic(upstream):
+    upstream.status = 503
+
+    assert post("/api/hypecycle/refresh").status_code == 400
+    assert topic_watermark() is None
+
+    upstream.status = 200
+    assert post("/api/hypecycle/refresh").status_code == 200
+    assert topic_watermark() == CURRENT_YEAR
+
+
+def test_incremental_outage_keeps_the_watermark(upstream):
+    assert post("/api/hypecycle/refresh").status_code == 200
+    store = main.get_topic_store()
+    key = main.canonical_request_key(main.HypeCycleRequest(**REQUEST))
+    store._db.execute("UPDATE topics SET watermark_year = watermark_year - 2 WHERE key = ?", (key,))
+    totals = store.yearly_totals(key)
+
+    upstream.status = 503
+    assert post("/api/hypecycle/refresh").status_code == 400
+
+    assert topic_watermark() == CURRENT_YEAR - 2
+    assert store.yearly_totals(key) == totals
+
+
+def test_repeated_refresh_does_not_inflate_counts(upstream):
+    assert post("/api/hypecycle/refresh").status_code == 200
+    key = main.canonical_request_key(main.HypeCycleRequest(**REQUEST))
+    store = main.get_topic_store()
+    totals = store.yearly_totals(key)
+    syndication = [item['syndication_count'] for item in store.load_items(key)]
+
+    response = post("/api/hypecycle/refresh")
+
+    assert response.status_code == 200
+    assert response.json()['analysis']['metrics']['refresh']['new_items'] == 0
+    assert store.yearly_totals(key) == totals
+    assert [item['syndication_count'] for item in store.load_items(key)] == syndication
+
+
+def test_incremental_fetch_fails_on_any_failed_range(analyzer, upstream):
+    analyzer.query_planner.page_size = 3
+    upstream.failing_years = {CURRENT_YEAR - 1}
+    terms = [main.SearchTerm(value="solid battery")]
+
+    with pytest.raises(main.SearchError):
+        asyncio.run(analyzer.fetch_news_since('"solid battery"', "secret-key", terms, CURRENT_YEAR - 2))
@@ -0,0 +1,38 @@
+# backend/test_sentiment.py
+import pytest
+
+from sentiment import HeuristicSentiment, SentimentEngine, create_sentiment_engine
+
+
+def test_repeated_texts_are_scored_once():
+    engine = HeuristicSentiment()
+    texts = ["A breakthrough success", "Layoffs and failure", "A breakthrough success"]
+
+    scores = engine.score_batch(texts)
+
+    assert scores[0] == scores[2] > 0 > scores[1]
+    assert engine.stats() == {'scored': 2, 'memo_hits': 1, 'memo_entries': 2}
+
+
+def test_memo_is_bounded():
+    engine = HeuristicSentiment(max_entries=2)
+
+    engine.score_batch([f"story {index}" for index in range(5)])
+
+    assert engine.stats()['memo_entries'] <= 2
+
+
+def test_engines_must_implement_score():
+    class Incomplete(SentimentEngine):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_engine_by_name(monkeypatch):
+    monkeypatch.setenv("HYPECYCLE_SENTIMENT", "Heuristic")
+
+    assert isinstance(create_sentiment_engine(), HeuristicSentiment)
+    with pytest.raises(ValueError):
+        create_sentiment_engine("oracle")
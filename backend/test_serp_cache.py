@@ -0,0 +1,62 @@
+# backend/test_serp_cache.py
+from datetime import datetime
+
+from serp_cache import QueryCache, normalize_query
+
+PARAMS = {"api_key": "secret", "tbm": "nws", "num": 100}
+
+
+def test_normalization_keeps_operators():
+    assert normalize_query("  Solid   Battery OR Graphene  NOT hype") == "solid battery OR graphene NOT hype"
+
+
+def test_key_ignores_api_key_and_query_spacing():
+    cache = QueryCache()
+
+    key = cache.make_key("Solid Battery", 2020, 2021, PARAMS)
+
+    assert key == cache.make_key("solid  battery", 2020, 2021, {**PARAMS, "api_key": "other"})
+    assert key != cache.make_key("solid battery", 2020, 2022, PARAMS)
+    assert key != cache.make_key("solid battery", 2020, 2021, {**PARAMS, "start": 100})
+
+
+def test_open_ranges_expire_sooner():
+    cache = QueryCache(closed_range_ttl=100, open_range_ttl=10)
+
+    assert cache.ttl_for_range(datetime.now().year - 1) == 100
+    assert cache.ttl_for_range(datetime.now().year) == 10
+
+
+def test_expired_entries_are_misses():
+    cache = QueryCache()
+    cache.set("key", {"news_results": []}, ttl=-1)
+
+    assert cache.get("key") is None
+    assert cache.counters['misses'] == 1
+
+
+def test_memory_tier_is_an_lru():
+    cache = QueryCache(max_entries=2)
+    cache.set("a", {"page": "a"}, 60)
+    cache.set("b", {"page": "b"}, 60)
+    cache.get("a")
+    cache.set("c", {"page": "c"}, 60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"page": "a"}
+    assert cache.stats()['memory_entries'] == 2
+
+
+def test_disk_tier_survives_restarts(tmp_path):
+    db_path = str(tmp_path / "serp_cache.sqlite3")
+    cache = QueryCache(db_path=db_path)
+    cache.set("key", {"news_results": [{"title": "x"}]}, 60)
+    cache.close()
+
+    reopened = QueryCache(db_path=db_path)
+
+    assert reopened.get("key") == {"news_results": [{"title": "x"}]}
+    assert reopened.counters['disk_hits'] == 1
+    assert reopened.get("key") is not None
+    assert reopened.counters['memory_hits'] == 1
+    reopened.close()
@@ -0,0 +1,76 @@
+# backend/test_serp_client.py
+import asyncio
+
+import httpx
+import pytest
+
+from serp_client import SerpClient, is_retryable_error
+
+
+def make_client(handler, **options):
+    return SerpClient(
+        "https://serp.test/search", rate_per_second=0, backoff_base=0.001,
+        transport=httpx.MockTransport(handler), **options
+    )
+
+
+def run(client, params=None):
+    async def search():
+        try:
+            return await client.search(params or {"q": "solar"})
+        finally:
+            await client.aclose()
+    return asyncio.run(search())
+
+
+def test_transient_errors_are_retried():
+    statuses = [503, 429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"news_results": [{"title": "ok"}]})
+
+    client = make_client(handler, max_retries=3)
+
+    assert run(client) == {"news_results": [{"title": "ok"}]}
+    assert client.metrics.counters == {'calls': 3, 'errors': 2, 'retries': 2}
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(401, json={"error": "Invalid API key"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(make_client(handler, max_retries=3))
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_the_limit():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("down", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        run(make_client(handler, max_retries=2))
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("value, expected", [("3", 3.0), ("-5", 0.0), (None, None), ("soon", None)])
+def test_retry_after_header(value, expected):
+    assert SerpClient._parse_retry_after(value) == expected
+
+
+def test_retryable_errors():
+    request = httpx.Request("GET", "https://serp.test/search")
+
+    def status_error(code):
+        return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+    assert is_retryable_error(httpx.ReadTimeout("slow", request=request))
+    assert is_retryable_error(status_error(503))
+    assert not is_retryable_error(status_error(401))
+    assert not is_retryable_error(ValueError("parse"))
@@ -0,0 +1,126 @@
+# backend/test_singleflight.py
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flight = SingleFlight()
+        executions = []
+
+        async def work():
+            executions.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+        return flight, executions, results
+
+    flight, executions, results = asyncio.run(scenario())
+
+    assert results == ["result"] * 5
+    assert len(executions) == 1
+    assert flight.stats() == {'calls': 5, 'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first, await second
+
+    first, result = asyncio.run(scenario())
+
+    assert first.cancelled()
+    assert result == "result"
+
+
+def test_execution_finishes_when_every_caller_left():
+    async def scenario():
+        flight = SingleFlight()
+        finished = asyncio.Event()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            finished.set()
+            return "result"
+
+        caller = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(finished.wait(), 1)
+        await asyncio.sleep(0)
+        return flight.stats()
+
+    assert asyncio.run(scenario())['in_flight'] == 0
+
+
+def test_errors_reach_every_caller_and_free_the_key():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+        async def succeed():
+            return "again"
+
+        return results, await flight.do("key", succeed)
+
+    results, retried = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "again"
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        return await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2))), flight
+
+    results, flight = asyncio.run(scenario())
+
+    assert results == [1, 2]
+    assert flight.counters['executions'] == 2
+
+
+@pytest.mark.parametrize("callers", [1, 3])
+def test_execution_runs_once_per_burst(callers):
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        first = await asyncio.gather(*[flight.do("key", work) for _ in range(callers)])
+        second = await flight.do("key", work)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == [1] * callers
+    assert second == 2
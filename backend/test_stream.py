@@ -0,0 +1,58 @@
+# backend/test_stream.py
+import asyncio
+import json
+import re
+
+import httpx
+
+import main
+
+
+def yearly_page(request):
+    """Cinco noticias por año del rango consultado"""
+    start, end = (int(year) for year in re.findall(r'(?:after|before):(\d{4})', request.url.params["q"]))
+    return httpx.Response(200, json={"news_results": [
+        {
+            "title": f"Graphene {year} report {index}",
+            "link": f"https://news.example.com/graphene/{year}/{index}",
+            "snippet": f"Graphene {['growth', 'risk', 'funding', 'patent', 'launch'][index]} story from {year} about new materials",
+            "source": "AP",
+            "date": f"{year}-03-1{index}"
+        }
+        for year in range(start, end + 1) for index in range(5)
+    ]})
+
+
+def post_stream(analyzer, monkeypatch, body):
+    monkeypatch.setenv("SERP_API_KEY", "key")
+    analyzer.serp_client._custom_transport = httpx.MockTransport(yearly_page)
+
+    async def send():
+        async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+            return await client.post("/api/hypecycle/analyze/stream", json=body)
+
+    return asyncio.run(send())
+
+
+def test_partial_ranges_then_final_response(analyzer, monkeypatch):
+    # Páginas de 20: el periodo se divide en varios rangos que llegan por separado
+    analyzer.query_planner.page_size = 20
+
+    response = post_stream(analyzer, monkeypatch, {"search_terms": [{"value": "graphene"}]})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+    ranges = [event for event in events if event['type'] == 'range']
+    final = events[-1]
+    assert len(ranges) > 1
+    assert final['type'] == 'final'
+    assert [event['total_mentions'] for event in ranges] == sorted(event['total_mentions'] for event in ranges)
+    assert final['response']['total_mentions'] == ranges[-1]['total_mentions']
+
+
+def test_invalid_request_fails_before_streaming(analyzer, monkeypatch):
+    response = post_stream(analyzer, monkeypatch, {"search_terms": [{"value": "  "}]})
+
+    assert response.status_code == 400
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,35 @@
+# backend/test_text_matcher.py
+from text_matcher import PhraseMatcher, tokenize
+
+
+def test_tokenize_keeps_dotted_abbreviations():
+    assert tokenize("the u.s. and u.k. markets, 2024!") == ["the", "u.s", "and", "u.k", "markets", "2024"]
+
+
+def test_matches_whole_words_only():
+    matcher = PhraseMatcher({"uk": "UK", "cut": "negative"})
+
+    assert matcher.search("Duke executives discuss the UK") == [(4, "UK")]
+
+
+def test_multi_word_phrases_report_their_start():
+    matcher = PhraseMatcher({"south korea": "South Korea", "korea": "South Korea", "united states": "USA"})
+
+    matches = matcher.search("Exports from South Korea to the United States")
+
+    assert matches == [(2, "South Korea"), (3, "South Korea"), (6, "USA")]
+
+
+def test_overlapping_phrases_follow_failure_links():
+    matcher = PhraseMatcher({"new york times": "paper", "york": "city", "times square": "place"})
+
+    matches = matcher.search("new york times square")
+
+    assert sorted(matches) == [(0, "paper"), (1, "city"), (2, "place")]
+
+
+def test_find_values_collects_distinct_values():
+    matcher = PhraseMatcher({"growth": 1, "increase": 1, "risk": -1, "": 0})
+
+    assert matcher.find_values(tokenize("growth and more growth despite risk")) == {1, -1}
+    assert matcher.find_values([]) == set()
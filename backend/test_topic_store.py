@@ -0,0 +1,86 @@
+# backend/test_topic_store.py
+import sqlite3
+
+import pytest
+
+from topic_store import TopicStore
+
+
+def item(link, title, year=2024, sentiment=0.5, syndication_count=1):
+    return {
+        'title': title, 'link': link, 'snippet': title, 'source': "Reuters", 'date': f"{year}-01-01",
+        'year': year, 'sentiment': sentiment, 'country': None, 'keywords': [],
+        'syndication_count': syndication_count, 'published_date': None
+    }
+
+
+@pytest.fixture
+def store():
+    topic_store = TopicStore(":memory:")
+    yield topic_store
+    topic_store.close()
+
+
+def test_merge_without_items_creates_nothing(store):
+    assert store.merge("topic", {}, [], 2025) == 0
+    assert store.get_topic("topic") is None
+
+
+def test_exact_duplicates_are_ignored(store):
+    added = store.merge("topic", {}, [item("https://a/1", "Story"), item("https://a/1", "Other"), item("https://b/1", "story ")], 2025)
+
+    assert added == 1
+    assert store.yearly_totals("topic") == {2024: (1, 0.5, 0.25)}
+    assert store.get_topic("topic")['watermark_year'] == 2025
+
+
+def test_yearly_totals_accumulate_across_merges(store):
+    store.merge("topic", {'search_terms': []}, [item("https://a/1", "One", 2023, 0.5)], 2024)
+    store.merge("topic", {'search_terms': []}, [item("https://a/2", "Two", 2023, -0.5), item("https://a/3", "Three", 2024, 1.0)], 2025)
+
+    assert store.yearly_totals("topic") == {2023: (2, 0.0, 0.5), 2024: (1, 1.0, 1.0)}
+    assert store.get_topic("topic")['watermark_year'] == 2025
+    assert store.get_topic("other") is None
+
+
+def test_copies_add_to_the_original_once(store):
+    store.merge("topic", {}, [item("https://a/1", "Story")], 2025)
+    copies = [("https://a/1", item("https://b/1", "Story - Wire"))]
+
+    store.merge("topic", {}, [], 2025, copies)
+    store.merge("topic", {}, [], 2025, copies)
+
+    assert [stored['syndication_count'] for stored in store.load_items("topic")] == [2]
+    assert store.yearly_totals("topic") == {2024: (1, 0.5, 0.25)}
+
+
+def test_copies_of_unknown_originals_are_skipped(store):
+    store.merge("topic", {}, [item("https://a/1", "Story")], 2025)
+
+    store.merge("topic", {}, [], 2025, [("https://missing/1", item("https://b/1", "Copy"))])
+
+    assert [stored['link'] for stored in store.load_items("topic")] == ["https://a/1"]
+
+
+def test_load_items_filters_by_year(store):
+    store.merge("topic", {}, [item("https://a/1", "Old", 2020), item("https://a/2", "New", 2024)], 2025)
+
+    assert [stored['title'] for stored in store.load_items("topic", 2023)] == ["New"]
+    assert len(store.load_items("topic")) == 2
+
+
+def test_old_databases_gain_the_alias_column(tmp_path):
+    db_path = str(tmp_path / "topics.sqlite3")
+    db = sqlite3.connect(db_path)
+    db.execute(
+        "CREATE TABLE topic_items (key TEXT NOT NULL, seq INTEGER NOT NULL, link TEXT NOT NULL, "
+        "title_norm TEXT NOT NULL, year INTEGER NOT NULL, sentiment REAL NOT NULL, data TEXT NOT NULL)"
+    )
+    db.commit()
+    db.close()
+
+    store = TopicStore(db_path)
+    store.merge("topic", {}, [item("https://a/1", "Story")], 2025, [("https://a/1", item("https://b/1", "Copy"))])
+
+    assert [stored['syndication_count'] for stored in store.load_items("topic")] == [2]
+    store.close()
@@ -0,0 +1,64 @@
+# backend/test_yearly_analysis.py
+import random
+
+import pytest
+
+from news_record import NewsRecord
+
+# Menciones por año con forma de hype cycle: subida, pico, caída y recuperación
+HYPE_COUNTS = {2015: 2, 2016: 5, 2017: 20, 2018: 45, 2019: 30, 2020: 12, 2021: 15, 2022: 18, 2023: 20}
+
+
+def records(counts, seed=3):
+    rng = random.Random(seed)
+    return [
+        NewsRecord(f"Story {year}-{index}", f"https://n/{year}/{index}", "snippet", "AP", str(year), year,
+                   round(rng.uniform(-1, 1), 3))
+        for year, count in counts.items() for index in range(count)
+    ]
+
+
+def test_group_by_year_matches_a_plain_loop(analyzer):
+    results = records(HYPE_COUNTS)
+
+    analysis = analyzer.analyze_hype_cycle(results)
+
+    for stat in analysis.yearly_stats:
+        sentiments = [result.sentiment for result in results if result.year == stat['year']]
+        mean = sum(sentiments) / len(sentiments)
+        assert stat['mention_count'] == HYPE_COUNTS[stat['year']]
+        assert stat['sentiment_mean'] == pytest.approx(mean)
+        assert stat['sentiment_std'] == pytest.approx(
+            (sum((value - mean) ** 2 for value in sentiments) / len(sentiments)) ** 0.5 if len(sentiments) > 1 else 0.0
+        )
+    assert analysis.metrics['peak_mentions'] == 45
+    assert analysis.metrics['total_mentions'] == len(results)
+
+
+def test_yearly_totals_give_the_same_analysis(analyzer):
+    results = records(HYPE_COUNTS)
+    totals = {}
+    for result in results:
+        count, total, squares = totals.get(result.year, (0, 0.0, 0.0))
+        totals[result.year] = (count + 1, total + result.sentiment, squares + result.sentiment ** 2)
+
+    from_records = analyzer.analyze_hype_cycle(results)
+    from_totals = analyzer.analyze_yearly_totals(totals)
+
+    assert from_totals.phase == from_records.phase
+    assert from_totals.confidence == pytest.approx(from_records.confidence)
+    assert from_totals.inflection_points == from_records.inflection_points
+    for left, right in zip(from_totals.yearly_stats, from_records.yearly_stats):
+        assert left == pytest.approx(right)
+
+
+def test_year_over_year_changes(analyzer):
+    analysis = analyzer.analyze_hype_cycle(records({2020: 2, 2021: 4, 2022: 1}))
+
+    changes = [stat.get('mention_change') for stat in analysis.yearly_stats]
+    assert changes == [None, pytest.approx(1.0), pytest.approx(-0.75)]
+
+
+def test_too_few_results_are_not_analyzed(analyzer):
+    assert analyzer.analyze_hype_cycle(records({2020: 2})) is None
+    assert analyzer.analyze_yearly_totals({2020: (2, 0.0, 0.0)}) is None
@@ -0,0 +1,90 @@
+# backend/text_matcher.py
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Palabras, permitiendo abreviaturas con puntos como "u.s." o "u.k."
+TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+
+def tokenize(text_lower: str) -> List[str]:
+    """Divide un texto ya normalizado en palabras completas"""
+    return TOKEN_PATTERN.findall(text_lower)
+
+
+class PhraseMatcher:
+    """Automata Aho-Corasick sobre palabras para buscar muchas frases en una sola pasada.
+
+    Las frases se comparan palabra por palabra, así que solo hay coincidencias en
+    límites de palabra ("uk" no coincide con "duke", ni "cut" con "executive").
+    """
+
+    def __init__(self, phrases: Dict[str, Any]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, Any]]] = [[]]
+
+        for phrase, value in phrases.items():
+            self._add(tokenize(phrase.lower()), value)
+        self._build_failure_links()
+
+    def _add(self, words: List[str], value: Any) -> None:
+        if not words:
+            return
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][word] = next_state
+            state = next_state
+        self._output[state].append((len(words), value))
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(word, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, words: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+        """Recorre las palabras una vez y produce (posición inicial, valor) por coincidencia"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, value in output[state]:
+                yield position - length + 1, value
+
+    def find_values(self, words: Iterable[str]) -> set:
+        """Conjunto de valores de las frases presentes (misma pasada que iter_matches)"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        values = set()
+        state = 0
+        for word in words:
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if state:
+                for _, value in output[state]:
+                    values.add(value)
+        return values
+
+    def search(self, text: str) -> List[Tuple[int, Any]]:
+        return list(self.iter_matches(tokenize(text.lower())))
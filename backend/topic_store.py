@@ -0,0 +1,156 @@
+# backend/topic_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class TopicStore:
+    """Corpus persistente por tema: noticias deduplicadas y agregados anuales.
+
+    Los duplicados exactos (URL o título en minúsculas ya vistos) se descartan mediante
+    índices únicos. Las copias sindicadas que detecta NewsAnalyzer._fold_duplicates se
+    guardan como alias de su original (duplicate_of): no cuentan en los agregados,
+    suman a su syndication_count y, al volver en otro refresco, chocan con su propio alias.
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        with self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS topics (
+                    key TEXT PRIMARY KEY,
+                    request TEXT NOT NULL,
+                    watermark_year INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS topic_items (
+                    key TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    link TEXT NOT NULL,
+                    title_norm TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    sentiment REAL NOT NULL,
+                    data TEXT NOT NULL,
+                    duplicate_of INTEGER
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS topic_items_link ON topic_items (key, link);
+                CREATE UNIQUE INDEX IF NOT EXISTS topic_items_title ON topic_items (key, title_norm);
+                CREATE TABLE IF NOT EXISTS topic_yearly (
+                    key TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    mention_count INTEGER NOT NULL,
+                    sentiment_sum REAL NOT NULL,
+                    sentiment_sq_sum REAL NOT NULL,
+                    PRIMARY KEY (key, year)
+                );
+                """
+            )
+            # Bases creadas antes de los alias de copias sindicadas
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(topic_items)")}
+            if 'duplicate_of' not in columns:
+                self._db.execute("ALTER TABLE topic_items ADD COLUMN duplicate_of INTEGER")
+
+    @classmethod
+    def from_env(cls) -> "TopicStore":
+        return cls(os.getenv("HYPECYCLE_TOPICS_DB", "topics.sqlite3"))
+
+    def get_topic(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT request, watermark_year, updated_at FROM topics WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'request': json.loads(row[0]), 'watermark_year': row[1], 'updated_at': row[2]}
+
+    def merge(self, key: str, request: Dict[str, Any], items: List[Dict[str, Any]], watermark_year: int,
+              copies: Sequence[Tuple[str, Dict[str, Any]]] = ()) -> int:
+        """Añade las noticias nuevas y las copias (enlace de la original, copia), actualiza los
+        agregados y el watermark; devuelve cuántas noticias nuevas se añadieron.
+
+        Sin noticias ni copias no se toca nada: ni se crea el tema ni avanza su watermark.
+        """
+        if not items and not copies:
+            return 0
+        added = 0
+        with self._lock, self._db:
+            row = self._db.execute("SELECT COALESCE(MAX(seq), -1) FROM topic_items WHERE key = ?", (key,)).fetchone()
+            seq = row[0] + 1
+
+            for item in items:
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO topic_items (key, seq, link, title_norm, year, sentiment, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, seq, item['link'], item['title'].lower().strip(),
+                        item['year'], item['sentiment'], json.dumps(item)
+                    )
+                )
+                if cursor.rowcount:
+                    seq += 1
+                    added += 1
+                    sentiment = item['sentiment']
+                    self._db.execute(
+                        "INSERT INTO topic_yearly (key, year, mention_count, sentiment_sum, sentiment_sq_sum) "
+                        "VALUES (?, ?, 1, ?, ?) "
+                        "ON CONFLICT (key, year) DO UPDATE SET "
+                        "mention_count = mention_count + 1, "
+                        "sentiment_sum = sentiment_sum + excluded.sentiment_sum, "
+                        "sentiment_sq_sum = sentiment_sq_sum + excluded.sentiment_sq_sum",
+                        (key, item['year'], sentiment, sentiment * sentiment)
+                    )
+
+            for original_link, item in copies:
+                original = self._db.execute(
+                    "SELECT seq FROM topic_items WHERE key = ? AND link = ? AND duplicate_of IS NULL", (key, original_link)
+                ).fetchone()
+                if original is None:
+                    continue
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO topic_items (key, seq, link, title_norm, year, sentiment, data, duplicate_of) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, seq, item['link'], item['title'].lower().strip(),
+                        item['year'], item['sentiment'], json.dumps(item), original[0]
+                    )
+                )
+                # Una copia ya vista (re-consulta del año del watermark) no vuelve a sumar
+                if cursor.rowcount:
+                    seq += 1
+                    self._db.execute(
+                        "UPDATE topic_items SET data = json_set(data, '$.syndication_count', "
+                        "json_extract(data, '$.syndication_count') + ?) WHERE key = ? AND seq = ?",
+                        (item.get('syndication_count', 1), key, original[0])
+                    )
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO topics (key, request, watermark_year, updated_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(request), watermark_year, time.time())
+            )
+        return added
+
+    def yearly_totals(self, key: str) -> Dict[int, Tuple[int, float, float]]:
+        """Agregados por año: (menciones, suma de sentimiento, suma de cuadrados)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT year, mention_count, sentiment_sum, sentiment_sq_sum FROM topic_yearly WHERE key = ?", (key,)
+            ).fetchall()
+        return {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+    def load_items(self, key: str, since_year: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Noticias originales del tema (sin las copias), opcionalmente desde since_year"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM topic_items WHERE key = ? AND duplicate_of IS NULL AND year >= ? ORDER BY seq",
+                (key, since_year if since_year is not None else -1)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,5 +1,5 @@
 // frontend/src/components/analysis/NewsResultsTable.tsx
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect } from 'react';
 import { 
   Eye, 
   ExternalLink, 
@@ -15,19 +15,29 @@ import {
   Globe
 } from 'lucide-react';
 import { newsTableStyles } from '../../styles/analysisStyles';
+import { hypecycleService } from '../../services/hypecycleService';
 
 interface NewsResultsTableProps {
   newsResults: any[];
   isMobile: boolean;
+  // Cursor de la siguiente página en el servidor y total del análisis completo
+  nextCursor?: string | null;
+  totalResults?: number | null;
 }
 
 type SortField = 'date' | 'sentiment' | 'country';
 type SortOrder = 'asc' | 'desc';
 
 const NewsResultsTable: React.FC<NewsResultsTableProps> = ({ 
-  newsResults, 
-  isMobile 
+  newsResults: firstPage, 
+  isMobile,
+  nextCursor = null,
+  totalResults = null
 }) => {
+  const [newsResults, setNewsResults] = useState<any[]>(firstPage);
+  const [cursor, setCursor] = useState<string | null>(nextCursor);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [loadError, setLoadError] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [sortBy, setSortBy] = useState<SortField>('date');
   const [sortOrder, setSortOrder] = useState<SortOrder>('desc');
@@ -37,6 +47,29 @@ const NewsResultsTable: React.FC<NewsResultsTableProps> = ({
   const [expandedItem, setExpandedItem] = useState<number | null>(null);
   
   const itemsPerPage = isMobile ? 8 : 10;
+  const total = totalResults ?? newsResults.length;
+
+  // Un análisis nuevo reemplaza las páginas ya cargadas
+  useEffect(() => {
+    setNewsResults(firstPage);
+    setCursor(nextCursor);
+    setLoadError(null);
+  }, [firstPage, nextCursor]);
+
+  const loadMore = async () => {
+    if (!cursor || loadingMore) return;
+    setLoadingMore(true);
+    setLoadError(null);
+    try {
+      const page = await hypecycleService.getNewsResults(cursor);
+      setNewsResults(previous => [...previous, ...page.news_results]);
+      setCursor(page.next_cursor);
+    } catch (error) {
+      setLoadError(error instanceof Error ? error.message : 'No se pudieron cargar más artículos');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   // Get unique countries for filter
   const countries = useMemo(() => 
@@ -150,7 +183,7 @@ const NewsResultsTable: React.FC<NewsResultsTableProps> = ({
     <div style={newsTableStyles.container}>
       <h3 style={newsTableStyles.title}>
         <Eye size={20} />
-        Artículos Analizados ({newsResults.length})
+        Artículos Analizados ({total})
       </h3>
       
       {/* Filtros */}
@@ -470,9 +503,26 @@ const NewsResultsTable: React.FC<NewsResultsTableProps> = ({
       <div style={newsTableStyles.resultsSummary}>
         Mostrando {(currentPage - 1) * itemsPerPage + 1} - {Math.min(currentPage * itemsPerPage, filteredResults.length)} de {filteredResults.length} resultados
         {filteredResults.length !== newsResults.length && (
-          <span> (filtrado de {newsResults.length} total)</span>
+          <span> (filtrado de {newsResults.length} cargados)</span>
+        )}
+        {newsResults.length < total && (
+          <span> · {newsResults.length} de {total} artículos cargados</span>
         )}
       </div>
+
+      {/* Más artículos del servidor, solo cuando se piden */}
+      {cursor && (
+        <div style={newsTableStyles.paginationContainer}>
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            style={newsTableStyles.paginationButton(false, loadingMore)}
+          >
+            {loadingMore ? 'Cargando...' : 'Cargar más artículos'}
+          </button>
+          {loadError && <span style={{ color: '#ef4444' }}>{loadError}</span>}
+        </div>
+      )}
     </div>
   );
 };
@@ -138,7 +138,7 @@ const HypeCycleScreen: React.FC = () => {
       insights: results.insights,
       query: buildPreviewQuery(),
       timestamp: new Date().toISOString(),
-      news_count: results.news_results.length
+      news_count: results.total_results ?? results.news_results.length
     };
     
     const blob = new Blob([JSON.stringify(exportData, null, 2)], { type: 'application/json' });
@@ -420,7 +420,7 @@ const HypeCycleScreen: React.FC = () => {
                   
                   <div style={hypeCycleScreenStyles.statItem}>
                     <div style={hypeCycleScreenStyles.statValue('#1e293b', isMobile)}>
-                      {results.news_results.length}
+                      {(results.total_results ?? results.news_results.length).toLocaleString()}
                     </div>
                     <div style={hypeCycleScreenStyles.statLabel}>
                       Artículos Analizados
@@ -480,6 +480,8 @@ const HypeCycleScreen: React.FC = () => {
                 {activeTab === 'news' && (
                   <NewsResultsTable 
                     newsResults={results.news_results}
+                    nextCursor={results.next_cursor}
+                    totalResults={results.total_results}
                     isMobile={isMobile}
                   />
                 )}
@@ -20,6 +20,8 @@ export interface NewsResult {
   sentiment: number;
   country?: string;
   keywords: string[];
+  syndication_count?: number;
+  published_date?: string | null;
 }
 
 export interface InflectionPoint {
@@ -49,9 +51,33 @@ export interface HypeCycleAnalysis {
     years_analyzed: number;
     peak_mentions: number;
     avg_sentiment: number;
+    search?: SearchPlanMetrics;
+    pagination?: PaginationMetrics;
+    snapshot?: SnapshotMetrics;
   };
 }
 
+export interface SearchPlanMetrics {
+  planned_calls: number;
+  splits: number;
+  budget_exhausted: boolean;
+  from_history: boolean;
+  upstream_calls?: number;
+}
+
+export interface PaginationMetrics {
+  paginated_ranges: number;
+  extra_pages: number;
+  page_budget: number;
+  truncated_ranges: number;
+  complete_ranges: number;
+}
+
+export interface SnapshotMetrics {
+  results_id: string;
+  created_at: string;
+}
+
 export interface HypeCycleResponse {
   success: boolean;
   phase: string;
@@ -71,14 +97,103 @@ export interface HypeCycleResponse {
   };
   news_results: NewsResult[];
   analysis?: HypeCycleAnalysis;
+  results_id?: string | null;
+  total_results?: number | null;
+  next_cursor?: string | null;
+}
+
+export interface NewsResultsPage {
+  news_results: NewsResult[];
+  total_results: number;
+  next_cursor: string | null;
+}
+
+export type HypeCycleStreamEvent =
+  | {
+      type: 'range';
+      range: [number, number];
+      news_results: NewsResult[];
+      yearly_mentions: Record<string, number>;
+      total_mentions: number;
+      phase: string | null;
+      confidence: number | null;
+    }
+  | { type: 'final'; response: HypeCycleResponse }
+  | { type: 'error'; status_code: number; detail: string };
+
+export interface HypeCycleCompareRequest {
+  topics: HypeCycleRequest[];
+}
+
+export interface TopicComparison {
+  label: string;
+  success: boolean;
+  phase: string | null;
+  confidence: number | null;
+  total_mentions: number;
+  mention_counts: number[];
+  sentiment_means: (number | null)[];
+  error: string | null;
+}
+
+export interface HypeCycleCompareResponse {
+  success: boolean;
+  years: number[];
+  topics: TopicComparison[];
 }
 
+// Campos que usa la pantalla de análisis; results_id, total_results y next_cursor acompañan a news_results
+const ANALYZE_FIELDS = ['success', 'phase', 'confidence', 'total_mentions', 'insights', 'chart_data', 'news_results'];
+const RESULTS_PAGE_SIZE = 200;
+
 class HypeCycleService {
   private baseURL = 'http://127.0.0.1:8000';
 
   async analyzeHypeCycle(request: HypeCycleRequest): Promise<HypeCycleResponse> {
     try {
-      const response = await fetch(`${this.baseURL}/api/hypecycle/analyze`, {
+      // Solo los campos necesarios y la primera página de news_results
+      const params = new URLSearchParams({
+        fields: ANALYZE_FIELDS.join(','),
+        page_size: String(RESULTS_PAGE_SIZE),
+      });
+      const response = await fetch(`${this.baseURL}/api/hypecycle/analyze?${params}`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(request),
+      });
+
+      if (!response.ok) {
+        const error = await response.json();
+        throw new Error(error.detail || `Error ${response.status}: ${response.statusText}`);
+      }
+
+      // Solo la primera página: NewsResultsTable pide las siguientes con next_cursor cuando hacen falta
+      return await response.json();
+    } catch (error) {
+      if (error instanceof TypeError && error.message.includes('fetch')) {
+        throw new Error('No se puede conectar al servidor. Verifica que el backend esté ejecutándose.');
+      }
+      throw error;
+    }
+  }
+
+  async getNewsResults(cursor: string, limit = RESULTS_PAGE_SIZE): Promise<NewsResultsPage> {
+    const params = new URLSearchParams({ cursor, limit: String(limit) });
+    const response = await fetch(`${this.baseURL}/api/hypecycle/results?${params}`);
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || `Error ${response.status}: ${response.statusText}`);
+    }
+
+    return await response.json();
+  }
+
+  async compareHypeCycles(request: HypeCycleCompareRequest): Promise<HypeCycleCompareResponse> {
+    try {
+      const response = await fetch(`${this.baseURL}/api/hypecycle/compare`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -100,6 +215,64 @@ class HypeCycleService {
     }
   }
 
+  async analyzeHypeCycleStream(
+    request: HypeCycleRequest,
+    onEvent: (event: HypeCycleStreamEvent) => void
+  ): Promise<HypeCycleResponse> {
+    try {
+      const response = await fetch(`${this.baseURL}/api/hypecycle/analyze/stream`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(request),
+      });
+
+      if (!response.ok || !response.body) {
+        const error = await response.json();
+        throw new Error(error.detail || `Error ${response.status}: ${response.statusText}`);
+      }
+
+      // Cada línea NDJSON es un evento: rangos parciales y luego la respuesta final
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finalResponse: HypeCycleResponse | null = null;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value, { stream: !done });
+
+        const lines = buffer.split('\n');
+        buffer = done ? '' : lines.pop() ?? '';
+
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line) as HypeCycleStreamEvent;
+          if (event.type === 'error') {
+            throw new Error(event.detail);
+          }
+          if (event.type === 'final') {
+            finalResponse = event.response;
+          }
+          onEvent(event);
+        }
+
+        if (done) break;
+      }
+
+      if (!finalResponse) {
+        throw new Error('La respuesta terminó sin resultado final');
+      }
+      return finalResponse;
+    } catch (error) {
+      if (error instanceof TypeError && error.message.includes('fetch')) {
+        throw new Error('No se puede conectar al servidor. Verifica que el backend esté ejecutándose.');
+      }
+      throw error;
+    }
+  }
+
   async testAnalyze(): Promise<HypeCycleResponse> {
     try {
       const response = await fetch(`${this.baseURL}/api/test`);